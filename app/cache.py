@@ -0,0 +1,196 @@
+"""Shared cache of read-mostly lookups, in process and in Redis."""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+
+from flask import Flask, current_app, has_app_context
+from redis import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.queues import redis_queues
+
+CACHE_KEY_PREFIX = "lorelai:cache:"
+# Channel on which the invalidated keys are published, a JSON list
+INVALIDATION_CHANNEL = "lorelai:cache:invalidations"
+# Upper bound of the in process entries, the cache is cleared when it is exceeded
+MAX_LOCAL_ENTRIES = 10_000
+# Session.info key of the cache keys invalidated on commit
+_PENDING_INVALIDATIONS = "cache_invalidations"
+
+
+class SharedCache:
+    """Flask extension caching read-mostly lookups in process and in Redis.
+
+    A lookup is served from the in process cache for up to CACHE_LOCAL_TTL seconds, then from
+    Redis for up to CACHE_TTL seconds and only then from the database. Invalidating a key deletes
+    it from Redis and publishes it, a listener in every process drops it from its in process
+    cache. When the listener loses its Redis connection the in process cache is cleared, the
+    local TTL bounds how long a missed invalidation can be served.
+
+    Values must be JSON serializable, None is cached as well.
+
+    Example:
+        >>> prompt = shared_cache.get("config:openai_prompt_template", load_prompt)
+        >>> shared_cache.invalidate("config:openai_prompt_template")
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Create the in process cache of an app."""
+        app.extensions["shared_cache"] = {
+            "local": {},
+            "lock": threading.Lock(),
+            "listener_pid": None,
+        }
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["shared_cache"]
+
+    def get(self, key: str, loader: Callable, ttl: int | None = None):
+        """Get a cached value, loading and caching it on a miss.
+
+        Parameters
+        ----------
+        key : str
+            The cache key, e.g. "config:openai_prompt_template"
+        loader : Callable
+            Function loading the value from the database
+        ttl : int | None
+            The number of seconds to cache the value in Redis, defaults to CACHE_TTL
+
+        Returns
+        -------
+        Any
+            The cached or loaded value
+        """
+        state = self._state
+        local_ttl = current_app.config["CACHE_LOCAL_TTL"]
+        if local_ttl > 0:
+            with state["lock"]:
+                entry = state["local"].get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+
+        client = redis_queues.connection
+        try:
+            if local_ttl > 0:
+                self._start_listener(state, client)
+            cached = client.get(f"{CACHE_KEY_PREFIX}{key}")
+            if cached is not None:
+                value = json.loads(cached)["value"]
+                self._store_local(state, key, value, local_ttl)
+                return value
+        except RedisError as e:
+            logging.warning(f"Failed to read the cached {key}: {e}")
+
+        value = loader()
+        try:
+            client.set(
+                f"{CACHE_KEY_PREFIX}{key}",
+                json.dumps({"value": value}),
+                ex=ttl or current_app.config["CACHE_TTL"],
+            )
+        except RedisError as e:
+            logging.warning(f"Failed to cache {key}: {e}")
+        self._store_local(state, key, value, local_ttl)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop cached values in Redis and in the in process caches of all processes.
+
+        Failures are logged, the cached values then expire after their TTL.
+        """
+        if not keys:
+            return
+        self._drop_local(self._state, keys)
+        try:
+            client = redis_queues.connection
+            client.delete(*(f"{CACHE_KEY_PREFIX}{key}" for key in keys))
+            client.publish(INVALIDATION_CHANNEL, json.dumps(list(keys)))
+        except RedisError as e:
+            logging.error(f"Failed to invalidate the cached {', '.join(keys)}: {e}")
+
+    def _store_local(self, state: dict, key: str, value, local_ttl: int) -> None:
+        if local_ttl <= 0:
+            return
+        with state["lock"]:
+            if len(state["local"]) >= MAX_LOCAL_ENTRIES:
+                state["local"].clear()
+            state["local"][key] = (time.monotonic() + local_ttl, value)
+
+    def _drop_local(self, state: dict, keys) -> None:
+        with state["lock"]:
+            for key in keys:
+                state["local"].pop(key, None)
+
+    def _start_listener(self, state: dict, client: Redis) -> None:
+        """Start the invalidation listener of this process, once per (forked) process."""
+        pid = os.getpid()
+        if state["listener_pid"] == pid:
+            return
+        with state["lock"]:
+            if state["listener_pid"] == pid:
+                return
+            state["listener_pid"] = pid
+            # entries inherited from a parent process missed its invalidations
+            state["local"].clear()
+        threading.Thread(
+            target=self._listen, args=(state, client), name="cache-invalidations", daemon=True
+        ).start()
+
+    def _listen(self, state: dict, client: Redis) -> None:
+        while True:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._drop_local(state, json.loads(message["data"]))
+            except RedisError as e:
+                logging.warning(f"Cache invalidation listener disconnected: {e}")
+                # invalidations may have been missed while disconnected
+                with state["lock"]:
+                    state["local"].clear()
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+shared_cache = SharedCache()
+
+
+def invalidate_on_commit(session: Session | None, *keys: str) -> None:
+    """Invalidate cache keys when a session commits, e.g. from a mapper event.
+
+    Parameters
+    ----------
+    session : Session | None
+        The session of the changed object, nothing is invalidated without one
+    *keys : str
+        The cache keys
+    """
+    if session is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session) -> None:
+    keys = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if keys and has_app_context():
+        shared_cache.invalidate(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -10,7 +10,10 @@ from flask_restx import Api, fields
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
 
+from app.cache import shared_cache
+from app.helpers.users import get_cached_user, get_user_roles
 from app.models import User, db
+from app.queues import redis_queues
 from app.routes.api.v1.auth import auth_ns
 from app.routes.api.v1.chat import chat_ns
 from app.routes.api.v1.token import token_ns
@@ -54,6 +57,8 @@ def create_app(config=None):
     CORS(app)
     db.init_app(app)
     Migrate(app, db)
+    redis_queues.init_app(app)
+    shared_cache.init_app(app)
 
     # Register CLI commands
     from app.cli import init_db_command, seed_db_command
@@ -189,7 +194,7 @@ def create_app(config=None):
     @login_manager.user_loader
     def load_user(user_id):
         """Load user by ID."""
-        return User.query.get(int(user_id))
+        return get_cached_user(int(user_id))
 
     # Add template context processor
     @app.context_processor
@@ -399,7 +404,7 @@ def create_app(config=None):
         user = User.query.get(identity)
         if user:
             return {
-                "roles": [role.name for role in user.roles],
+                "roles": get_user_roles(user.id),
                 "org_id": user.org_id,
                 "org_name": user.organisation.name,
             }
@@ -414,6 +419,6 @@ def create_app(config=None):
     def user_lookup_callback(_jwt_header, jwt_data):
         """Look up user from JWT data."""
         identity = jwt_data["sub"]
-        return User.query.get(identity)
+        return get_cached_user(identity)
 
     return app
@@ -0,0 +1,207 @@
+"""ACL group related helper functions.
+
+Vectors in Pinecone carry the id of the ACL group they belong to, instead of a list of users.
+A group stands for one access set: the Google Drive files shared with the same principals, or a
+Slack channel. Which users may see a group's vectors is kept in MySQL, so granting or revoking
+access is a single database write instead of a metadata update on every affected vector.
+"""
+
+import hashlib
+import logging
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.database import db
+from app.models.acl_group import ACLGroup, ACLGroupMember
+from app.models.datasource import Datasource
+from app.models.organisation import Organisation
+
+# Separator between the ACL group id and the unique part of a vector id, this allows listing
+# all vectors of a group by prefix
+ACL_GROUP_VECTOR_ID_SEPARATOR = "#"
+# Upper bound of the ACL groups of a user in the metadata filter of a query, Pinecone limits the
+# number of $in values and the size of a filter
+MAX_FILTER_ACL_GROUPS = 1000
+
+
+def acl_group_vector_prefix(group_id: int | str) -> str:
+    """Return the vector id prefix shared by all vectors of an ACL group."""
+    return f"{group_id}{ACL_GROUP_VECTOR_ID_SEPARATOR}"
+
+
+def acl_group_vector_id(group_id: int | str, chunk_key: str | None = None) -> str:
+    """Return the vector id for a vector belonging to an ACL group.
+
+    Parameters
+    ----------
+    group_id : int | str
+        The ID of the ACL group
+    chunk_key : str | None
+        The stable key of the chunk (see lorelai.processor.chunk_key), re-indexing the same chunk
+        yields the same vector id. A new, unique id is returned if not given.
+    """
+    if chunk_key is None:
+        return f"{acl_group_vector_prefix(group_id)}{uuid.uuid4()}"
+    return f"{acl_group_vector_prefix(group_id)}{uuid.uuid5(uuid.NAMESPACE_URL, chunk_key)}"
+
+
+def principals_acl_key(principal_ids: Iterable[str]) -> str:
+    """Return the ACL key of the resources shared with exactly the given principals.
+
+    Parameters
+    ----------
+    principal_ids : Iterable[str]
+        The ids of the principals with access, e.g. the permission ids of a Google Drive file
+
+    Returns
+    -------
+    str
+        The ACL key, the same for every resource with the same principals
+    """
+    digest = hashlib.sha256("\n".join(sorted(set(principal_ids))).encode()).hexdigest()
+    return f"principals:{digest}"
+
+
+def get_or_create_acl_group(org_id: int, datasource_id: int, acl_key: str) -> ACLGroup:
+    """Get the ACL group for a shared resource, creating it if it doesn't exist yet.
+
+    Parameters
+    ----------
+    org_id : int
+        The ID of the organisation the resource belongs to
+    datasource_id : int
+        The ID of the datasource the resource comes from
+    acl_key : str
+        The natural key of the access set, e.g. a principals_acl_key or a Slack channel ID
+
+    Returns
+    -------
+    ACLGroup
+        The ACL group for the resource
+    """
+    group = ACLGroup.query.filter_by(
+        org_id=org_id, datasource_id=datasource_id, acl_key=acl_key
+    ).first()
+    if group:
+        return group
+
+    try:
+        group = ACLGroup(org_id=org_id, datasource_id=datasource_id, acl_key=acl_key)
+        db.session.add(group)
+        db.session.commit()
+        return group
+    except IntegrityError:
+        # another worker created the same group in the meantime
+        db.session.rollback()
+        return ACLGroup.query.filter_by(
+            org_id=org_id, datasource_id=datasource_id, acl_key=acl_key
+        ).one()
+
+
+def add_acl_group_members(group_id: int, user_emails: Iterable[str]) -> int:
+    """Add users to an ACL group, skipping users that are already a member.
+
+    Returns
+    -------
+    int
+        The number of memberships added
+    """
+    emails = set(user_emails)
+    existing = {
+        member.user_email
+        for member in ACLGroupMember.query.filter(
+            ACLGroupMember.group_id == group_id, ACLGroupMember.user_email.in_(emails)
+        ).all()
+    }
+    new_emails = emails - existing
+    if not new_emails:
+        return 0
+
+    try:
+        db.session.add_all(
+            [ACLGroupMember(group_id=group_id, user_email=email) for email in new_emails]
+        )
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to add members to ACL group {group_id}: {e}")
+        raise
+    return len(new_emails)
+
+
+def remove_acl_group_member(group_ids: Iterable[int], user_email: str) -> list[int]:
+    """Remove a user from ACL groups.
+
+    Groups which have no members left are deleted, their ids are returned so the caller can
+    delete the vectors belonging to them.
+
+    Returns
+    -------
+    list[int]
+        The ids of the deleted (now empty) ACL groups
+    """
+    group_ids = list(group_ids)
+    if not group_ids:
+        return []
+
+    try:
+        ACLGroupMember.query.filter(
+            ACLGroupMember.group_id.in_(group_ids), ACLGroupMember.user_email == user_email
+        ).delete(synchronize_session=False)
+
+        still_used = {
+            row.group_id
+            for row in db.session.query(ACLGroupMember.group_id)
+            .filter(ACLGroupMember.group_id.in_(group_ids))
+            .distinct()
+        }
+        empty_group_ids = [group_id for group_id in group_ids if group_id not in still_used]
+        if empty_group_ids:
+            ACLGroup.query.filter(ACLGroup.id.in_(empty_group_ids)).delete(
+                synchronize_session=False
+            )
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to remove {user_email} from ACL groups: {e}")
+        raise
+    return empty_group_ids
+
+
+def get_user_acl_groups(user_email: str, org_name: str, datasource_name: str) -> list[ACLGroup]:
+    """Get the ACL groups a user is a member of for an organisation's datasource."""
+    return (
+        ACLGroup.query.join(ACLGroupMember, ACLGroupMember.group_id == ACLGroup.id)
+        .join(Organisation, Organisation.id == ACLGroup.org_id)
+        .join(Datasource, Datasource.datasource_id == ACLGroup.datasource_id)
+        .filter(
+            ACLGroupMember.user_email == user_email,
+            Organisation.name == org_name,
+            Datasource.datasource_name == datasource_name,
+        )
+        .all()
+    )
+
+
+def get_user_acl_group_ids(user_email: str, org_name: str, datasource_name: str) -> list[str]:
+    """Get the ids, as stored in the vector metadata, of the ACL groups of a user.
+
+    At most MAX_FILTER_ACL_GROUPS + 1 ids are loaded, a user with more groups can't be
+    filtered on anyway (see PineconeHelper.get_acl_filter).
+    """
+    rows = (
+        db.session.query(ACLGroup.id)
+        .join(ACLGroupMember, ACLGroupMember.group_id == ACLGroup.id)
+        .join(Organisation, Organisation.id == ACLGroup.org_id)
+        .join(Datasource, Datasource.datasource_id == ACLGroup.datasource_id)
+        .filter(
+            ACLGroupMember.user_email == user_email,
+            Organisation.name == org_name,
+            Datasource.datasource_name == datasource_name,
+        )
+        .limit(MAX_FILTER_ACL_GROUPS + 1)
+        .all()
+    )
+    return [str(row.id) for row in rows]
@@ -3,12 +3,15 @@
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import func, desc
+from sqlalchemy import func
 from app.database import db
 from app.models.chat import ChatConversation, ChatMessage
 from app.models.plan import UserPlan, Plan
 from app.models.extra_messages import ExtraMessages
 from flask import current_app
+from redis.exceptions import RedisError
+
+from app.helpers.quota import get_message_usage, record_message
 
 
 def get_msg_count_last_24hr(user_id: int) -> int:
@@ -96,6 +99,7 @@ def insert_message(
     message_content: str,
     sources: str = None,
     classified_prompt: str = None,
+    user_id: int = None,
 ) -> bool:
     """
     Insert a new message into the chat_messages table.
@@ -106,6 +110,8 @@ def insert_message(
         message_content (str): The content of the message.
         sources (str, optional): Any sources associated with the message. Defaults to None.
         classified_prompt (str, optional): The classified prompt type. Defaults to None.
+        user_id (int, optional): The ID of the user owning the conversation, bot replies are
+            counted in the message quota of this user. Defaults to None.
 
     Returns
     -------
@@ -116,21 +122,37 @@ def insert_message(
         Exception: Propagates any exception that occurs during the database operation.
     """
     try:
+        created_at = datetime.utcnow()
         message = ChatMessage(
             conversation_id=conversation_id,
             sender=sender,
             message_content=message_content,
             sources=sources,
             classified_prompt=classified_prompt,
+            created_at=created_at,
         )
         db.session.add(message)
+        db.session.flush()
+        message_id = message.message_id
+
+        # keep the last activity of the conversation up to date for the sidebar
+        ChatConversation.query.filter_by(conversation_id=conversation_id).update(
+            {
+                ChatConversation.last_message_at: created_at,
+                ChatConversation.message_count: ChatConversation.message_count + 1,
+            },
+            synchronize_session=False,
+        )
         db.session.commit()
-        return True
     except Exception as e:
         db.session.rollback()
         logging.error(e)
         raise e
 
+    if sender == "bot" and user_id is not None:
+        record_message(user_id, message_id, created_at)
+    return True
+
 
 def list_all_user_conversations(user_id: int) -> list:
     """
@@ -158,45 +180,128 @@ def list_all_user_conversations(user_id: int) -> list:
         raise e
 
 
-def get_all_conversation_messages(conversation_id: str) -> list:
+def get_conversation_messages(
+    conversation_id: str,
+    limit: int,
+    before_id: int = None,
+    after_id: int = None,
+    since: datetime = None,
+) -> tuple[list, bool]:
     """
-    Retrieve all messages for a given conversation, ordered by creation time.
+    Retrieve a page of the messages of a conversation, oldest first.
+
+    Without after_id and since this is the latest page, or the page before before_id when paging
+    back through the history. With after_id or since it is the page of the messages after them,
+    e.g. the new messages after an answer arrived.
 
     Args:
         conversation_id (str): The ID of the conversation whose messages are to be retrieved.
+        limit (int): The maximum number of messages to retrieve.
+        before_id (int, optional): Only retrieve messages with a lower ID. Defaults to None.
+        after_id (int, optional): Only retrieve messages with a higher ID. Defaults to None.
+        since (datetime, optional): Only retrieve messages created after this (naive UTC) time.
+            Defaults to None.
 
     Returns
     -------
-        list: A list of messages associated with the conversation. Each message includes sender,
-        message_content, created_at, and sources. Returns an empty list if no messages are found.
+        tuple[list, bool]: The messages, each with message_id, sender, message_content,
+        created_at and sources, and whether there are more messages in the paging direction
+        (older ones for the latest page and before_id, newer ones for after_id and since).
 
     Raises
     ------
         Exception: If there is an error during the database query.
     """
     try:
-        messages = (
-            db.session.query(ChatMessage)
-            .join(
-                ChatConversation,
-                ChatMessage.conversation_id == ChatConversation.conversation_id,
-            )
-            .filter(
-                ChatMessage.conversation_id == conversation_id,
-                ChatConversation.marked_deleted == 0,
-            )
-            .order_by(ChatMessage.created_at.asc())
-            .all()
-        )
+        query = ChatMessage.query.filter(ChatMessage.conversation_id == conversation_id)
+        if before_id is not None:
+            query = query.filter(ChatMessage.message_id < before_id)
+        if after_id is not None:
+            query = query.filter(ChatMessage.message_id > after_id)
+        if since is not None:
+            query = query.filter(ChatMessage.created_at > since)
+
+        # the message IDs increase with the creation time, one message more than the limit
+        # tells whether there are more messages
+        forward = after_id is not None or since is not None
+        order = ChatMessage.message_id.asc() if forward else ChatMessage.message_id.desc()
+        messages = query.order_by(order).limit(limit + 1).all()
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if not forward:
+            messages.reverse()
+
         return [
             {
+                "message_id": message.message_id,
                 "sender": message.sender,
                 "message_content": message.message_content,
                 "created_at": message.created_at,
                 "sources": message.sources,
             }
             for message in messages
-        ]
+        ], has_more
+    except Exception as e:
+        logging.error(e)
+        raise e
+
+
+def get_latest_conversation_messages(
+    conversation_id: str, limit: int, after_message_id: int = None
+) -> list[ChatMessage]:
+    """
+    Retrieve the latest messages of a conversation, at most limit, oldest first.
+
+    Args:
+        conversation_id (str): The ID of the conversation whose messages are to be retrieved.
+        limit (int): The maximum number of messages to retrieve.
+        after_message_id (int, optional): Only retrieve messages with a higher ID, e.g. the
+            messages after the history summary. Defaults to None.
+
+    Returns
+    -------
+        list: The ChatMessage objects, ordered by creation.
+
+    Raises
+    ------
+        Exception: If there is an error during the database query.
+    """
+    try:
+        query = ChatMessage.query.filter(ChatMessage.conversation_id == conversation_id)
+        if after_message_id is not None:
+            query = query.filter(ChatMessage.message_id > after_message_id)
+        messages = query.order_by(ChatMessage.message_id.desc()).limit(limit).all()
+        return messages[::-1]
+    except Exception as e:
+        logging.error(e)
+        raise e
+
+
+def get_oldest_conversation_messages(
+    conversation_id: str, limit: int, after_message_id: int = None
+) -> list[ChatMessage]:
+    """
+    Retrieve the oldest messages of a conversation, at most limit, oldest first.
+
+    Args:
+        conversation_id (str): The ID of the conversation whose messages are to be retrieved.
+        limit (int): The maximum number of messages to retrieve.
+        after_message_id (int, optional): Only retrieve messages with a higher ID, e.g. the
+            messages after the history summary. Defaults to None.
+
+    Returns
+    -------
+        list: The ChatMessage objects, ordered by creation.
+
+    Raises
+    ------
+        Exception: If there is an error during the database query.
+    """
+    try:
+        query = ChatMessage.query.filter(ChatMessage.conversation_id == conversation_id)
+        if after_message_id is not None:
+            query = query.filter(ChatMessage.message_id > after_message_id)
+        return query.order_by(ChatMessage.message_id.asc()).limit(limit).all()
     except Exception as e:
         logging.error(e)
         raise e
@@ -206,6 +311,9 @@ def get_recent_conversations(user_id: int) -> list:
     """
     Retrieve the most recent conversations for a given user.
 
+    Uses the last_message_at column maintained by insert_message, a range scan of the
+    (user_id, marked_deleted, last_message_at) index.
+
     Args:
         user_id (int): The ID of the user whose recent conversations are to be retrieved.
 
@@ -225,24 +333,14 @@ def get_recent_conversations(user_id: int) -> list:
                 ChatConversation.conversation_id,
                 ChatConversation.conversation_name,
                 ChatConversation.created_at,
-                func.max(ChatMessage.created_at).label("last_messages_created_at"),
-            )
-            .join(
-                ChatMessage,
-                ChatConversation.conversation_id == ChatMessage.conversation_id,
-                isouter=True,
+                ChatConversation.last_message_at,
             )
             .filter(
                 ChatConversation.user_id == user_id,
                 ChatConversation.marked_deleted.is_(False),
-                ChatMessage.sender != "bot",
+                ChatConversation.last_message_at.is_not(None),
             )
-            .group_by(
-                ChatConversation.conversation_id,
-                ChatConversation.conversation_name,
-                ChatConversation.created_at,
-            )
-            .order_by(desc("last_messages_created_at"))
+            .order_by(ChatConversation.last_message_at.desc())
             .limit(10)
             .all()
         )
@@ -252,7 +350,7 @@ def get_recent_conversations(user_id: int) -> list:
                 "conversation_id": conversation.conversation_id,
                 "conversation_name": conversation.conversation_name,
                 "created_at": conversation.created_at,
-                "last_messages_created_at": conversation.last_messages_created_at,
+                "last_messages_created_at": conversation.last_message_at,
             }
             for conversation in recent_conversations
         ]
@@ -372,6 +470,9 @@ def can_send_message(user_id: int) -> bool:
     """
     Check if a user can send a message based on their daily limit and extra messages.
 
+    The usage and the limit come from the Redis message quota, falling back to MySQL if Redis is
+    unavailable.
+
     Args:
         user_id (int): The ID of the user.
 
@@ -379,9 +480,13 @@ def can_send_message(user_id: int) -> bool:
     -------
         bool: True if the user can send a message, otherwise False.
     """
-    daily_limit = get_daily_message_limit(user_id)
+    try:
+        message_usages, daily_limit = get_message_usage(user_id)
+    except RedisError as e:
+        logging.warning(f"Message quota unavailable for {user_id}, using MySQL: {e}")
+        daily_limit = get_daily_message_limit(user_id)
+        message_usages = get_msg_count_last_24hr(user_id)
     logging.info(f"Daily Message Limit for {user_id}: {daily_limit}")
-    message_usages = get_msg_count_last_24hr(user_id)
     logging.info(f"Daily Message Used for {user_id}: {message_usages}")
     if message_usages < daily_limit:
         return True
@@ -0,0 +1,127 @@
+"""Chunk text store related helper functions.
+
+Pinecone metadata is limited in size and returned with every query match, so the full text of a
+chunk is stored (compressed) in the database keyed by its vector id. The vector metadata only
+keeps a preview in its "text" field, which is what the reranker sees. Only the final, reranked
+context documents are hydrated with their full text.
+"""
+
+import logging
+import zlib
+from collections.abc import Iterable
+
+from flask import current_app
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.models.chunk_text import ChunkText
+
+
+def chunk_text_preview(text: str) -> str:
+    """Return the preview of a chunk text as stored in the vector metadata."""
+    return text[: current_app.config["EMBEDDINGS_TEXT_PREVIEW_CHARS"]]
+
+
+def store_chunk_texts(texts: dict[str, str]) -> None:
+    """Store the full text of chunks, replacing the stored text of existing vector ids.
+
+    Parameters
+    ----------
+    texts : dict[str, str]
+        Mapping of vector id to the full chunk text
+    """
+    if not texts:
+        return
+    try:
+        # vector ids are stable (derived from the chunk content), so replace the stored texts in
+        # one INSERT ... ON DUPLICATE KEY UPDATE for the whole batch
+        statement = insert(ChunkText).values(
+            [
+                {"vector_id": vector_id, "text_compressed": zlib.compress(text.encode("utf-8"))}
+                for vector_id, text in texts.items()
+            ]
+        )
+        db.session.execute(
+            statement.on_duplicate_key_update(text_compressed=statement.inserted.text_compressed)
+        )
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to store {len(texts)} chunk texts: {e}")
+        raise
+
+
+def offload_vector_texts(vectors: Iterable[dict]) -> None:
+    """Move the full text of Pinecone vectors to the chunk text store.
+
+    The "text" metadata of each vector is stored and replaced by its preview, in place, and
+    "text_ref" is set to the key of the stored text. Call this right before upserting the vectors.
+    """
+    texts = {}
+    for vector in vectors:
+        text = vector["metadata"].get("text")
+        if text:
+            texts[vector["id"]] = text
+            vector["metadata"]["text"] = chunk_text_preview(text)
+            vector["metadata"]["text_ref"] = vector["id"]
+    store_chunk_texts(texts)
+
+
+def get_chunk_texts(vector_ids: Iterable[str]) -> dict[str, str]:
+    """Get the full text of chunks.
+
+    Vectors without a stored text (indexed before the chunk text store existed, recognisable by
+    the missing "text_ref" metadata) are missing from the result, their metadata still holds the
+    full text.
+
+    Returns
+    -------
+    dict[str, str]
+        Mapping of vector id to the full chunk text
+    """
+    vector_ids = [vector_id for vector_id in vector_ids if vector_id]
+    if not vector_ids:
+        return {}
+    rows = ChunkText.query.filter(ChunkText.vector_id.in_(vector_ids)).all()
+    return {row.vector_id: zlib.decompress(row.text_compressed).decode("utf-8") for row in rows}
+
+
+def hydrate_context_documents(context_documents: Iterable) -> None:
+    """Replace the text preview of context documents with the full chunk text, in place.
+
+    Parameters
+    ----------
+    context_documents : Iterable[LorelaiContextDocument]
+        The final (reranked) context documents
+    """
+    context_documents = [
+        context_document
+        for context_document in context_documents
+        if context_document.raw_langchain_document.metadata.get("text_ref")
+    ]
+    texts = get_chunk_texts(
+        context_document.raw_langchain_document.metadata["text_ref"]
+        for context_document in context_documents
+    )
+    for context_document in context_documents:
+        text = texts.get(context_document.raw_langchain_document.metadata["text_ref"])
+        if text:
+            context_document.content = text
+            context_document.raw_langchain_document.page_content = text
+
+
+def delete_chunk_texts(vector_ids: Iterable[str]) -> None:
+    """Delete the stored text of chunks, to be called when their vectors are deleted."""
+    vector_ids = list(vector_ids)
+    if not vector_ids:
+        return
+    try:
+        ChunkText.query.filter(ChunkText.vector_id.in_(vector_ids)).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to delete {len(vector_ids)} chunk texts: {e}")
+        raise
@@ -7,6 +7,7 @@ import redis
 from sqlalchemy import text
 
 from app.models import db
+from app.queues import redis_queues
 from flask import current_app
 
 
@@ -30,12 +31,7 @@ def check_redis() -> tuple[bool, str]:
     """Check if the Redis server is up and running."""
     try:
         logging.debug(f"Connecting to Redis: {current_app.config['REDIS_URL']}")
-        r = redis.Redis.from_url(
-            current_app.config["REDIS_URL"],
-            socket_timeout=5,  # 5 seconds timeout for operations
-            socket_connect_timeout=5,  # 5 seconds timeout for connection
-        )
-        r.ping()
+        redis_queues.connection.ping()
         return True, "Redis is reachable."
     except (redis.ConnectionError, redis.TimeoutError) as e:
         logging.exception("Redis check failed")
@@ -1,5 +1,78 @@
 """Datasource related helper functions."""
 
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import ORMExecuteState, Session, object_session
+
+from app.cache import invalidate_on_commit, shared_cache
+from app.database import db
+from app.models.datasource import Datasource
+from app.models.user import User
+from app.models.user_auth import UserAuth
+
 # List of datasource names
 DATASOURCE_GOOGLE_DRIVE = "Google Drive"
 DATASOURCE_SLACK = "Slack"
+
+
+def get_user_datasource_names(email: str) -> list[str] | None:
+    """
+    Get the names of the datasources a user has authenticated, cached until their auths change.
+
+    Args:
+        email (str): The email of the user.
+
+    Returns
+    -------
+        list[str] | None: The names of the datasources, or None if there's no user with the email.
+    """
+
+    def load_names() -> list[str] | None:
+        user_id = db.session.query(User.id).filter_by(email=email).scalar()
+        if user_id is None:
+            return None
+        rows = (
+            db.session.query(Datasource.datasource_name)
+            .join(UserAuth, UserAuth.datasource_id == Datasource.datasource_id)
+            .filter(UserAuth.user_id == user_id)
+            .distinct()
+            .all()
+        )
+        return sorted(name for (name,) in rows)
+
+    return shared_cache.get(f"user-datasources:{email}", load_names)
+
+
+@event.listens_for(UserAuth, "after_insert")
+@event.listens_for(UserAuth, "after_update")
+@event.listens_for(UserAuth, "after_delete")
+def _user_auth_changed(mapper, connection, target) -> None:
+    email = connection.execute(select(User.email).where(User.id == target.user_id)).scalar()
+    if email is not None:
+        invalidate_on_commit(object_session(target), f"user-datasources:{email}")
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_email_changed(mapper, connection, target) -> None:
+    # the names are cached by email, a new user or email starts without auths
+    emails = {target.email, *inspect(target).attrs.email.history.deleted}
+    invalidate_on_commit(
+        object_session(target), *(f"user-datasources:{email}" for email in emails if email)
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _user_auths_bulk_changed(orm_execute_state: ORMExecuteState) -> None:
+    # bulk deletes and updates (Query.delete(), e.g. revoking a datasource) skip the mapper
+    # events, the users are selected with the criteria of the statement before it runs
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update):
+        return
+    if UserAuth.__mapper__ not in orm_execute_state.all_mappers:
+        return
+    query = select(User.email).join(UserAuth, UserAuth.user_id == User.id).distinct()
+    if orm_execute_state.statement.whereclause is not None:
+        query = query.where(orm_execute_state.statement.whereclause)
+    emails = orm_execute_state.session.execute(query).scalars().all()
+    invalidate_on_commit(
+        orm_execute_state.session, *(f"user-datasources:{email}" for email in emails)
+    )
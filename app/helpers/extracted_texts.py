@@ -0,0 +1,79 @@
+"""Extracted text store related helper functions.
+
+The text extracted from an indexed item is stored once per distinct text, zstd compressed and
+keyed by its sha256 (content addressed). Indexing run items only hold the hash, so re-indexing an
+unchanged file, or indexing it for another user, doesn't store its text again. The text is only
+loaded and decompressed when it is requested, see get_extracted_text.
+"""
+
+import hashlib
+import logging
+
+import zstandard
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.models.extracted_text import ExtractedText
+
+# zstd level 3 (the default) compresses text about as well as zlib at a fraction of the CPU time
+ZSTD_LEVEL = 3
+
+
+def extracted_text_hash(text: str) -> str:
+    """Return the key of an extracted text in the store."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str) -> bytes:
+    """Compress a text for the store."""
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress_text(text_compressed: bytes) -> str:
+    """Decompress a text from the store."""
+    return zstandard.ZstdDecompressor().decompress(text_compressed).decode("utf-8")
+
+
+def store_extracted_text(text: str) -> str:
+    """Store an extracted text, unless it is stored already.
+
+    The caller commits the session, e.g. together with the item referencing the text.
+
+    Parameters
+    ----------
+    text : str
+        The extracted text
+
+    Returns
+    -------
+    str
+        The sha256 of the text, its key in the store
+    """
+    sha256 = extracted_text_hash(text)
+    try:
+        exists = db.session.query(ExtractedText.sha256).filter_by(sha256=sha256).first()
+        if not exists:
+            # INSERT IGNORE, another worker may store the same text concurrently
+            db.session.execute(
+                insert(ExtractedText)
+                .prefix_with("IGNORE")
+                .values(
+                    sha256=sha256,
+                    text_compressed=compress_text(text),
+                    text_length=len(text),
+                )
+            )
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to store extracted text {sha256}: {e}")
+        raise
+    return sha256
+
+
+def get_extracted_text(sha256: str | None) -> str | None:
+    """Load and decompress an extracted text, None if it isn't stored."""
+    if not sha256:
+        return None
+    extracted_text = db.session.get(ExtractedText, sha256)
+    return decompress_text(extracted_text.text_compressed) if extracted_text else None
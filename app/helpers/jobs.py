@@ -0,0 +1,74 @@
+"""Helpers to wait for the completion of RQ jobs without polling.
+
+The RQ success and failure callbacks of a job push its final status to a per-job completion key.
+Waiters block on that key with BLPOP, so the answer is delivered the moment the job is done and
+a waiting request costs a single Redis round trip. Under the gevent gunicorn workers the blocking
+socket read only suspends the greenlet of the request.
+"""
+
+import logging
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+# Time the completion key is kept after the job finished, waiters arriving later see the job status
+JOB_DONE_TTL = 300
+JOB_DONE_KEY_PREFIX = "lorelai:job-done:"
+
+
+def job_done_key(job_id: str) -> str:
+    """Return the Redis key the completion of a job is pushed to."""
+    return f"{JOB_DONE_KEY_PREFIX}{job_id}"
+
+
+def _push_job_done(connection: Redis, job_id: str, status: str) -> None:
+    try:
+        key = job_done_key(job_id)
+        pipeline = connection.pipeline()
+        pipeline.rpush(key, status)
+        pipeline.expire(key, JOB_DONE_TTL)
+        pipeline.execute()
+    except RedisError as e:
+        # waiters fall back to the job status once their wait times out
+        logging.error(f"Failed to notify the completion of job {job_id}: {e}")
+
+
+def notify_job_done(job, connection: Redis, result, *args, **kwargs) -> None:
+    """Notify waiters that a job finished (RQ on_success callback)."""
+    _push_job_done(connection, job.id, "finished")
+
+
+def notify_job_failed(job, connection: Redis, exc_type, exc_value, traceback) -> None:
+    """Notify waiters that a job failed (RQ on_failure callback)."""
+    _push_job_done(connection, job.id, "failed")
+
+
+def wait_for_job(connection: Redis, job_id: str, timeout: int) -> bool:
+    """Block until a job is done or the timeout expires.
+
+    Parameters
+    ----------
+    connection : Redis
+        The Redis connection, its socket timeout (if any) must exceed the timeout. Use
+        redis_queues.wait_connection, which has a pool of its own for the blocking waits
+    job_id : str
+        The ID of the job
+    timeout : int
+        The maximum number of seconds to wait
+
+    Returns
+    -------
+    bool
+        True if the job is done, False if the wait timed out
+    """
+    key = job_done_key(job_id)
+    item = connection.blpop([key], timeout=timeout)
+    if item is None:
+        return False
+
+    # put the notification back for any other request waiting on the same job
+    pipeline = connection.pipeline()
+    pipeline.rpush(key, item[1])
+    pipeline.expire(key, JOB_DONE_TTL)
+    pipeline.execute()
+    return True
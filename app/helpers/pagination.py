@@ -0,0 +1,178 @@
+"""Keyset pagination, cached counts and cached filter values for the list APIs.
+
+Keyset (cursor) pagination continues after the sort value and ID of the last row of the previous
+page instead of skipping rows with an OFFSET, so every page costs the same however deep it is.
+The cursor is opaque to the client: the base64 encoded JSON of the sort value and the ID.
+"""
+
+import base64
+import json
+import logging
+from collections.abc import Callable
+from datetime import datetime
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from app.queues import redis_queues
+
+COUNT_KEY_PREFIX = "lorelai:count:"
+VALUES_KEY_PREFIX = "lorelai:values:"
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    """Encode the sort value and ID of the last row of a page as a cursor."""
+    if isinstance(sort_value, datetime):
+        sort_value = {"datetime": sort_value.isoformat()}
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into the sort value and ID of the last row of the previous page.
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value["datetime"])
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_paginate(
+    query: Query,
+    sort_column,
+    id_column,
+    descending: bool,
+    per_page: int,
+    cursor: str | None = None,
+) -> tuple[list, str | None]:
+    """Return a page of a query, ordered by a sort column with the ID as tie breaker.
+
+    Parameters
+    ----------
+    query : Query
+        The filtered query
+    sort_column
+        The column to sort by, not nullable
+    id_column
+        The primary key column, breaks ties between equal sort values
+    descending : bool
+        Whether to sort in descending order
+    per_page : int
+        The number of rows per page
+    cursor : str | None
+        The cursor of the page, None for the first page
+
+    Returns
+    -------
+    tuple[list, str | None]
+        The rows of the page and the cursor of the next page, None if this is the last page
+
+    Raises
+    ------
+    ValueError
+        If the cursor is malformed
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(
+                or_(
+                    sort_column < sort_value,
+                    and_(sort_column == sort_value, id_column < row_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    sort_column > sort_value,
+                    and_(sort_column == sort_value, id_column > row_id),
+                )
+            )
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # one row more than the page tells whether there is a next page
+    rows = query.limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def cached_count(key: str, query: Query, ttl: int) -> int:
+    """Count the rows of a query, caching the count in Redis.
+
+    Parameters
+    ----------
+    key : str
+        The cache key of the count, unique for the filters of the query
+    query : Query
+        The filtered query
+    ttl : int
+        The number of seconds to cache the count
+
+    Returns
+    -------
+    int
+        The (possibly up to ttl seconds old) number of rows
+    """
+    cache_key = f"{COUNT_KEY_PREFIX}{key}"
+    try:
+        count = redis_queues.connection.get(cache_key)
+        if count is not None:
+            return int(count)
+    except RedisError as e:
+        logging.warning(f"Failed to read the cached count {key}: {e}")
+
+    count = query.order_by(None).count()
+    try:
+        redis_queues.connection.set(cache_key, count, ex=ttl)
+    except RedisError as e:
+        logging.warning(f"Failed to cache the count {key}: {e}")
+    return count
+
+
+def cached_values(key: str, loader: Callable[[], dict | list], ttl: int) -> dict | list:
+    """Return JSON serializable values, e.g. the options of filters, caching them in Redis.
+
+    Parameters
+    ----------
+    key : str
+        The cache key of the values
+    loader : Callable[[], dict | list]
+        Function loading the values from the database
+    ttl : int
+        The number of seconds to cache the values
+
+    Returns
+    -------
+    dict | list
+        The (possibly up to ttl seconds old) values
+    """
+    cache_key = f"{VALUES_KEY_PREFIX}{key}"
+    try:
+        values = redis_queues.connection.get(cache_key)
+        if values is not None:
+            return json.loads(values)
+    except RedisError as e:
+        logging.warning(f"Failed to read the cached values {key}: {e}")
+
+    values = loader()
+    try:
+        redis_queues.connection.set(cache_key, json.dumps(values), ex=ttl)
+    except RedisError as e:
+        logging.warning(f"Failed to cache the values {key}: {e}")
+    return values
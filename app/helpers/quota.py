@@ -0,0 +1,205 @@
+"""Message quota of the users, kept in Redis.
+
+Each user has a sliding window of the bot replies of the last 24 hours in a Redis sorted set
+(scored by the time of the reply) and a cached daily message limit of their active plan. The
+admission check on the chat hot path reads both in a single script call. Every
+QUOTA_RECONCILE_INTERVAL seconds the window of a user is rebuilt from MySQL, which corrects any
+reply that wasn't recorded (e.g. while Redis was unavailable). The cached limits are invalidated
+when a plan or a user plan changes.
+"""
+
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from flask import has_app_context
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.database import db
+from app.models.chat import ChatConversation, ChatMessage
+from app.models.plan import Plan, UserPlan
+from app.queues import redis_queues
+
+QUOTA_WINDOW = 24 * 60 * 60
+# Seconds a cached daily message limit is kept, plans start and end by date
+QUOTA_LIMIT_TTL = 600
+# Seconds after which the window of a user is rebuilt from MySQL
+QUOTA_RECONCILE_INTERVAL = 300
+QUOTA_KEY_PREFIX = "lorelai:quota:"
+
+# Returns whether the window is reconciled, the cached limit (-1 if not cached) and the usage
+_ADMISSION_SCRIPT = """
+local reconciled = redis.call('EXISTS', KEYS[3])
+local limit = redis.call('GET', KEYS[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. ARGV[1])
+return {reconciled, limit or -1, redis.call('ZCARD', KEYS[1])}
+"""
+# Session.info key of the users (or ALL_USERS) whose limit changes on commit
+_PENDING_INVALIDATIONS = "quota_invalidations"
+ALL_USERS = "*"
+
+
+def _window_key(user_id: int) -> str:
+    return f"{QUOTA_KEY_PREFIX}window:{user_id}"
+
+
+def _limit_key(user_id: int) -> str:
+    return f"{QUOTA_KEY_PREFIX}limit:{user_id}"
+
+
+def _reconciled_key(user_id: int) -> str:
+    return f"{QUOTA_KEY_PREFIX}reconciled:{user_id}"
+
+
+def _timestamp(created_at: datetime) -> float:
+    # created_at is a naive UTC timestamp (datetime.utcnow)
+    return created_at.replace(tzinfo=UTC).timestamp()
+
+
+def reconcile_message_window(user_id: int) -> None:
+    """Rebuild the sliding window of a user from the bot replies in MySQL.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Raises
+    ------
+        RedisError: If Redis is unavailable.
+    """
+    since = datetime.utcnow() - timedelta(seconds=QUOTA_WINDOW)
+    replies = (
+        db.session.query(ChatMessage.message_id, ChatMessage.created_at)
+        .join(ChatConversation)
+        .filter(
+            ChatConversation.user_id == user_id,
+            ChatMessage.sender == "bot",
+            ChatMessage.created_at >= since,
+        )
+        .all()
+    )
+
+    window_key = _window_key(user_id)
+    pipeline = redis_queues.connection.pipeline()
+    pipeline.delete(window_key)
+    if replies:
+        pipeline.zadd(
+            window_key,
+            {str(message_id): _timestamp(created_at) for message_id, created_at in replies},
+        )
+        pipeline.expire(window_key, QUOTA_WINDOW)
+    pipeline.set(_reconciled_key(user_id), 1, ex=QUOTA_RECONCILE_INTERVAL)
+    pipeline.execute()
+
+
+def get_message_usage(user_id: int) -> tuple[int, int]:
+    """
+    Get the number of bot replies of the last 24 hours and the daily message limit of a user.
+
+    In the steady state this is a single Redis round trip. MySQL is queried when the limit isn't
+    cached or the window is due for reconciliation.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns
+    -------
+        tuple[int, int]: The number of messages used and the daily message limit.
+
+    Raises
+    ------
+        RedisError: If Redis is unavailable.
+    """
+    from app.helpers.chat import get_daily_message_limit
+
+    keys = [_window_key(user_id), _limit_key(user_id), _reconciled_key(user_id)]
+    window_start = time.time() - QUOTA_WINDOW
+    admission = redis_queues.connection.register_script(_ADMISSION_SCRIPT)
+
+    reconciled, limit, used = admission(keys=keys, args=[window_start])
+    limit = int(limit)
+    if limit < 0:
+        limit = get_daily_message_limit(user_id)
+        redis_queues.connection.set(_limit_key(user_id), limit, ex=QUOTA_LIMIT_TTL)
+    if not reconciled:
+        reconcile_message_window(user_id)
+        _, _, used = admission(keys=keys, args=[window_start])
+    return used, limit
+
+
+def record_message(user_id: int, message_id: int, created_at: datetime) -> None:
+    """
+    Record a bot reply in the sliding window of a user.
+
+    Failures are logged and ignored, the next reconciliation picks the reply up.
+
+    Args:
+        user_id (int): The ID of the user.
+        message_id (int): The ID of the message.
+        created_at (datetime): The (naive UTC) creation time of the message.
+    """
+    try:
+        window_key = _window_key(user_id)
+        pipeline = redis_queues.connection.pipeline()
+        pipeline.zadd(window_key, {str(message_id): _timestamp(created_at)})
+        pipeline.expire(window_key, QUOTA_WINDOW)
+        pipeline.execute()
+    except RedisError as e:
+        logging.warning(f"Failed to record message {message_id} in the quota of {user_id}: {e}")
+
+
+def invalidate_message_limits(user_ids: set) -> None:
+    """
+    Drop the cached daily message limits of users.
+
+    Args:
+        user_ids (set): The IDs of the users, or a set containing ALL_USERS.
+    """
+    try:
+        connection = redis_queues.connection
+        if ALL_USERS in user_ids:
+            keys = list(connection.scan_iter(match=_limit_key(ALL_USERS), count=1000))
+        else:
+            keys = [_limit_key(user_id) for user_id in user_ids]
+        if keys:
+            connection.delete(*keys)
+    except RedisError as e:
+        # the cached limits expire after QUOTA_LIMIT_TTL
+        logging.error(f"Failed to invalidate the cached message limits: {e}")
+
+
+def _pending_invalidations(target) -> set | None:
+    session = object_session(target)
+    if session is None:
+        return None
+    return session.info.setdefault(_PENDING_INVALIDATIONS, set())
+
+
+@event.listens_for(UserPlan, "after_insert")
+@event.listens_for(UserPlan, "after_update")
+@event.listens_for(UserPlan, "after_delete")
+def _user_plan_changed(mapper, connection, target) -> None:
+    pending = _pending_invalidations(target)
+    if pending is not None:
+        pending.add(target.user_id)
+
+
+@event.listens_for(Plan, "after_update")
+@event.listens_for(Plan, "after_delete")
+def _plan_changed(mapper, connection, target) -> None:
+    pending = _pending_invalidations(target)
+    if pending is not None:
+        pending.add(ALL_USERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session) -> None:
+    user_ids = session.info.pop(_PENDING_INVALIDATIONS, None)
+    if user_ids and has_app_context():
+        invalidate_message_limits(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
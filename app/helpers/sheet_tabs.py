@@ -0,0 +1,99 @@
+"""Google Sheets tab export hash related helper functions.
+
+The Google Drive indexer exports every tab of a spreadsheet as CSV. The hash of each export is
+stored per user once the tab is indexed, tabs with an unchanged export are skipped in the next
+indexing run. The hashes include the ACL group of the spreadsheet and are deleted whenever the
+user's vectors may be gone otherwise, so unchanged tabs are always embedded again when needed.
+"""
+
+import logging
+from collections.abc import Iterable
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.models.google_drive import GoogleDriveSheetTab
+
+
+def get_sheet_tab_hashes(user_id: int, google_drive_id: str) -> dict[int, str]:
+    """Get the export hashes of the indexed tabs of a spreadsheet.
+
+    Returns
+    -------
+    dict[int, str]
+        Mapping of sheet id to the hash of its last indexed export
+    """
+    tabs = GoogleDriveSheetTab.query.filter_by(user_id=user_id, google_drive_id=google_drive_id)
+    return {tab.sheet_id: tab.content_hash for tab in tabs}
+
+
+def save_sheet_tab_hashes(
+    user_id: int, google_drive_id: str, tab_hashes: dict[int, tuple[str, str]]
+) -> None:
+    """Store the export hashes of the indexed tabs of a spreadsheet.
+
+    Tabs which are no longer part of the spreadsheet are removed.
+
+    Parameters
+    ----------
+    user_id : int
+        The user the spreadsheet was indexed for
+    google_drive_id : str
+        The Google Drive ID of the spreadsheet
+    tab_hashes : dict[int, tuple[str, str]]
+        Mapping of sheet id to the name of the tab and the hash of its export
+    """
+    try:
+        tabs = {
+            tab.sheet_id: tab
+            for tab in GoogleDriveSheetTab.query.filter_by(
+                user_id=user_id, google_drive_id=google_drive_id
+            )
+        }
+        for sheet_id, (sheet_name, content_hash) in tab_hashes.items():
+            tab = tabs.pop(sheet_id, None)
+            if tab is None:
+                tab = GoogleDriveSheetTab(
+                    user_id=user_id, google_drive_id=google_drive_id, sheet_id=sheet_id
+                )
+                db.session.add(tab)
+            tab.sheet_name = sheet_name[:255]
+            tab.content_hash = content_hash
+        for tab in tabs.values():
+            db.session.delete(tab)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to store the sheet tab hashes of {google_drive_id}: {e}")
+        raise
+
+
+def delete_sheet_tab_hashes(user_id: int, google_drive_ids: Iterable[str] | None = None) -> int:
+    """Delete the export hashes of a user's indexed tabs, so the tabs are indexed again.
+
+    Parameters
+    ----------
+    user_id : int
+        The user the spreadsheets were indexed for
+    google_drive_ids : Iterable[str] | None
+        The Google Drive IDs of the spreadsheets, None for all spreadsheets of the user
+
+    Returns
+    -------
+    int
+        The number of deleted tab hashes
+    """
+    query = GoogleDriveSheetTab.query.filter_by(user_id=user_id)
+    if google_drive_ids is not None:
+        google_drive_ids = list(google_drive_ids)
+        if not google_drive_ids:
+            return 0
+        query = query.filter(GoogleDriveSheetTab.google_drive_id.in_(google_drive_ids))
+    try:
+        count = query.delete(synchronize_session=False)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logging.error(f"Failed to delete the sheet tab hashes of user {user_id}: {e}")
+        raise
+    return count
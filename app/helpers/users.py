@@ -6,7 +6,10 @@ from datetime import datetime, timedelta, date
 from functools import wraps
 
 from flask import redirect, session, url_for
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached, object_session
 
+from app.cache import invalidate_on_commit, shared_cache
 from app.database import db
 from app.models.user import User
 from app.models.organisation import Organisation
@@ -434,9 +437,55 @@ def update_user_profile(
 
 
 def get_user_roles(user_id: int) -> list[str]:
-    """Get a user's roles."""
-    user = User.query.get(user_id)
-    return [role.name for role in user.roles] if user else []
+    """Get a user's roles, cached until they change."""
+
+    def load_roles() -> list[str]:
+        rows = (
+            db.session.query(Role.name)
+            .join(UserRole, UserRole.role_id == Role.id)
+            .filter(UserRole.user_id == user_id)
+            .order_by(Role.name)
+            .all()
+        )
+        return [name for (name,) in rows]
+
+    return shared_cache.get(f"user-roles:{user_id}", load_roles)
+
+
+def get_cached_user(user_id: int) -> User | None:
+    """
+    Get a user by ID without a database query while the user is cached, e.g. for every request.
+
+    The cached columns of the user are merged into the session as a persistent object, so its
+    relationships (roles, organisation, ...) still load lazily when accessed.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns
+    -------
+        User | None: The user, or None if there's no user with the ID.
+    """
+
+    def load_columns() -> dict | None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        columns = {}
+        for attribute in inspect(User).column_attrs:
+            value = getattr(user, attribute.key)
+            columns[attribute.key] = value.isoformat() if isinstance(value, datetime) else value
+        return columns
+
+    columns = shared_cache.get(f"user:{user_id}", load_columns)
+    if columns is None:
+        return None
+    for attribute in inspect(User).column_attrs:
+        if isinstance(attribute.expression.type, db.DateTime) and columns[attribute.key]:
+            columns[attribute.key] = datetime.fromisoformat(columns[attribute.key])
+    user = User(**columns)
+    make_transient_to_detached(user)
+    return db.session.merge(user, load=False)
 
 
 def add_user_role(user_id: int, role_name: str) -> bool:
@@ -459,3 +508,22 @@ def remove_user_role(user_id: int, role_name: str) -> bool:
         db.session.commit()
         return True
     return False
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    invalidate_on_commit(object_session(target), f"user:{target.id}", f"user-roles:{target.id}")
+
+
+@event.listens_for(UserRole, "after_insert")
+@event.listens_for(UserRole, "after_delete")
+def _user_role_changed(mapper, connection, target) -> None:
+    invalidate_on_commit(object_session(target), f"user-roles:{target.user_id}")
+
+
+@event.listens_for(User.roles, "append")
+@event.listens_for(User.roles, "remove")
+def _user_roles_changed(target, value, initiator) -> None:
+    if target.id is not None:
+        invalidate_on_commit(object_session(target), f"user-roles:{target.id}")
@@ -10,13 +10,16 @@ from .profile import Profile
 from .plan import Plan, UserPlan
 from .chat import ChatMessage, ChatConversation
 from .datasource import Datasource
-from .google_drive import GoogleDriveItem
+from .google_drive import GoogleDriveItem, GoogleDriveSheetTab
 from .indexing import IndexingRun, IndexingRunItem
 from .notification import Notification
 from .extra_messages import ExtraMessages
 from .user_auth import UserAuth
 from .user_api_key import UserAPIKey
 from .user_login import UserLogin
+from .acl_group import ACLGroup, ACLGroupMember
+from .chunk_text import ChunkText
+from .extracted_text import ExtractedText
 
 # List all models for easy access
 __all__ = [
@@ -32,6 +35,7 @@ __all__ = [
     "ChatConversation",
     "Datasource",
     "GoogleDriveItem",
+    "GoogleDriveSheetTab",
     "IndexingRun",
     "IndexingRunItem",
     "Notification",
@@ -39,4 +43,8 @@ __all__ = [
     "UserAuth",
     "UserAPIKey",
     "UserLogin",
+    "ACLGroup",
+    "ACLGroupMember",
+    "ChunkText",
+    "ExtractedText",
 ]
@@ -0,0 +1,59 @@
+"""ACL group models."""
+
+from datetime import datetime
+
+from app.database import db
+
+
+class ACLGroup(db.Model):
+    """Model for an ACL group.
+
+    An ACL group stands for one access set of a datasource within an organisation, e.g. the Google
+    Drive files shared with the same principals or a Slack channel. Vectors in Pinecone carry the
+    (short) group id in their metadata instead of the list of users that can access them.
+    """
+
+    __tablename__ = "acl_groups"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "org_id", "datasource_id", "acl_key", name="uq_acl_groups_org_datasource_key"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    org_id = db.Column(db.Integer, db.ForeignKey("organisation.id"), nullable=False)
+    datasource_id = db.Column(db.Integer, db.ForeignKey("datasource.datasource_id"), nullable=False)
+    acl_key = db.Column(db.String(512), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    members = db.relationship(
+        "ACLGroupMember", back_populates="group", lazy=True, cascade="all, delete-orphan"
+    )
+
+    def __repr__(self):
+        """Return a string representation of the ACL group."""
+        return f"<ACLGroup {self.id} ({self.acl_key})>"
+
+
+class ACLGroupMember(db.Model):
+    """Model for the membership of a user (by email) in an ACL group.
+
+    Membership is keyed by email because not every member of a shared resource (e.g. a Slack
+    channel) is a Lorelai user.
+    """
+
+    __tablename__ = "acl_group_members"
+
+    group_id = db.Column(
+        db.Integer, db.ForeignKey("acl_groups.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_email = db.Column(db.String(255), primary_key=True, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    group = db.relationship("ACLGroup", back_populates="members")
+
+    def __repr__(self):
+        """Return a string representation of the ACL group member."""
+        return f"<ACLGroupMember {self.group_id} {self.user_email}>"
@@ -8,6 +8,15 @@ class ChatMessage(db.Model):
     """Model for the chat_messages table."""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        db.Index("ix_chat_messages_conversation_created", "conversation_id", "created_at"),
+        db.Index(
+            "ix_chat_messages_conversation_sender_created",
+            "conversation_id",
+            "sender",
+            "created_at",
+        ),
+    )
 
     message_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     conversation_id = db.Column(
@@ -32,12 +41,26 @@ class ChatConversation(db.Model):
     """Model for the chat_conversations table."""
 
     __tablename__ = "chat_conversations"
+    __table_args__ = (
+        db.Index(
+            "ix_chat_conversations_user_deleted_last_message",
+            "user_id",
+            "marked_deleted",
+            "last_message_at",
+        ),
+    )
 
     conversation_id = db.Column(db.String(50), primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
     created_at = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     conversation_name = db.Column(db.String(255), nullable=True)
     marked_deleted = db.Column(db.Boolean, default=False)
+    # Maintained by insert_message, the sidebar lists conversations by last_message_at
+    last_message_at = db.Column(db.TIMESTAMP, nullable=True)
+    message_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    # Rolling summary of the messages up to and including summarized_until (a message_id)
+    history_summary = db.Column(db.Text, nullable=True)
+    summarized_until = db.Column(db.Integer, nullable=True)
 
     # Relationships
     messages = db.relationship(
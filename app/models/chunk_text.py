@@ -0,0 +1,23 @@
+"""Chunk text model."""
+
+from datetime import datetime
+
+from app.database import db
+
+
+class ChunkText(db.Model):
+    """Model for the full text of a vector (chunk) stored in Pinecone.
+
+    The text is zlib compressed and keyed by the Pinecone vector id, the vector metadata only
+    holds a short preview.
+    """
+
+    __tablename__ = "chunk_texts"
+
+    vector_id = db.Column(db.String(255), primary_key=True)
+    text_compressed = db.Column(db.LargeBinary(length=16777215), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        """Return a string representation of the chunk text."""
+        return f"<ChunkText {self.vector_id}>"
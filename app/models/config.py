@@ -1,5 +1,9 @@
 """Configuration model for system settings."""
 
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+
+from app.cache import invalidate_on_commit, shared_cache
 from app.database import db
 
 
@@ -21,9 +25,13 @@ class Config(db.Model):
 
     @classmethod
     def get_value(cls, key: str, default: str = None) -> str:
-        """Get a configuration value by key."""
-        config = cls.query.filter_by(key=key).first()
-        return config.value if config else default
+        """Get a configuration value by key, cached until it changes."""
+
+        def load_value() -> str | None:
+            return db.session.query(cls.value).filter_by(key=key).scalar()
+
+        value = shared_cache.get(f"config:{key}", load_value)
+        return value if value is not None else default
 
     @classmethod
     def set_value(cls, key: str, value: str, description: str = None) -> None:
@@ -37,3 +45,11 @@ class Config(db.Model):
             config = cls(key=key, value=value, description=description)
             db.session.add(config)
         db.session.commit()
+
+
+@event.listens_for(Config, "after_insert")
+@event.listens_for(Config, "after_update")
+@event.listens_for(Config, "after_delete")
+def _config_changed(mapper, connection, target) -> None:
+    keys = {target.key, *inspect(target).attrs.key.history.deleted}
+    invalidate_on_commit(object_session(target), *(f"config:{key}" for key in keys))
@@ -0,0 +1,27 @@
+"""Extracted text model."""
+
+from datetime import datetime
+
+from sqlalchemy.dialects.mysql import LONGBLOB
+
+from app.database import db
+
+
+class ExtractedText(db.Model):
+    """Model for the text extracted from an indexed item.
+
+    The text is zstd compressed and keyed by the sha256 of the (uncompressed) text, so the same
+    text extracted in many indexing runs, for many users, is stored once. Indexing run items
+    reference the text by its hash.
+    """
+
+    __tablename__ = "extracted_texts"
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    text_compressed = db.Column(LONGBLOB, nullable=False)
+    text_length = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        """Return a string representation of the extracted text."""
+        return f"<ExtractedText {self.sha256} ({self.text_length} chars)>"
@@ -8,6 +8,7 @@ class GoogleDriveItem(db.Model):
     """Model for a Google Drive item."""
 
     __tablename__ = "google_drive_items"
+    __table_args__ = (db.Index("ix_google_drive_items_google_drive_id", "google_drive_id"),)
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
@@ -27,3 +28,30 @@ class GoogleDriveItem(db.Model):
     def __str__(self):
         """Return a string representation of the Google Drive item."""
         return f"{self.item_name} ({self.item_type})"
+
+
+class GoogleDriveSheetTab(db.Model):
+    """Model for the last indexed export of a Google Sheets tab.
+
+    The hash of the CSV export of each tab is stored per user, so the indexer can skip the tabs
+    which didn't change since the last indexing run.
+    """
+
+    __tablename__ = "google_drive_sheet_tabs"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "user_id", "google_drive_id", "sheet_id", name="uq_google_drive_sheet_tabs_user_sheet"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
+    google_drive_id = db.Column(db.String(255), nullable=False)
+    sheet_id = db.Column(db.Integer, nullable=False)
+    sheet_name = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    indexed_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        """Return a string representation of the Google Sheets tab."""
+        return f"<GoogleDriveSheetTab {self.google_drive_id}#{self.sheet_id} ({self.sheet_name})>"
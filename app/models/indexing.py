@@ -1,14 +1,20 @@
 """Indexing model."""
 
 from datetime import datetime
+
+from sqlalchemy.orm import deferred
+
 from app.database import db
-from sqlalchemy.dialects.mysql import LONGTEXT
 
 
 class IndexingRun(db.Model):
     """Model for an indexing run."""
 
     __tablename__ = "indexing_runs"
+    __table_args__ = (
+        db.Index("ix_indexing_runs_created_at", "created_at"),
+        db.Index("ix_indexing_runs_status_created_at", "status", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     rq_job_id = db.Column(db.String(255), nullable=False)
@@ -16,6 +22,8 @@ class IndexingRun(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     status = db.Column(db.String(255), nullable=False)
     error = db.Column(db.Text, nullable=True)
+    # Counters of the indexing pipeline, see lorelai.processor.PipelineStats
+    progress = db.Column(db.JSON, nullable=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
     organisation_id = db.Column(db.Integer, db.ForeignKey("organisation.id"), nullable=False)
     datasource_id = db.Column(db.Integer, db.ForeignKey("datasource.datasource_id"), nullable=False)
@@ -41,6 +49,10 @@ class IndexingRunItem(db.Model):
     """Model for an indexing run item."""
 
     __tablename__ = "indexing_run_items"
+    __table_args__ = (
+        db.Index("ix_indexing_run_items_run_status", "indexing_run_id", "item_status"),
+        db.Index("ix_indexing_run_items_run_created", "indexing_run_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     indexing_run_id = db.Column(db.Integer, db.ForeignKey("indexing_runs.id"), nullable=False)
@@ -50,11 +62,15 @@ class IndexingRunItem(db.Model):
     item_url = db.Column(db.String(255), nullable=False)
     item_status = db.Column(db.String(255), nullable=False)
     item_error = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     parent_item_id = db.Column(db.Integer, db.ForeignKey("indexing_run_items.id"), nullable=True)
-    item_extractedtext = db.Column(LONGTEXT, nullable=True)
-    item_log = db.Column(db.Text, nullable=True)
+    # The extracted text is in the content addressed store, see app.helpers.extracted_texts
+    item_extractedtext_sha256 = db.Column(
+        db.String(64), db.ForeignKey("extracted_texts.sha256"), nullable=True
+    )
+    # Only loaded when accessed, the list views never show the log
+    item_log = deferred(db.Column(db.Text, nullable=True))
 
     # Relationships
     indexing_run = db.relationship("IndexingRun", back_populates="items")
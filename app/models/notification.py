@@ -8,6 +8,15 @@ class Notification(db.Model):
     """Model for a notification."""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        db.Index(
+            "ix_notifications_user_read_dismissed_created",
+            "user_id",
+            "read",
+            "dismissed",
+            "created_at",
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.user_id"), nullable=False)
@@ -0,0 +1,89 @@
+"""Redis connection pool and RQ queue registry of the web tier."""
+
+from flask import Flask, current_app
+from redis import BlockingConnectionPool, Redis
+from rq import Queue
+
+
+class RedisQueues:
+    """Flask extension holding the shared Redis client and the RQ queues.
+
+    The client uses a bounded, blocking connection pool: requests wait up to REDIS_POOL_TIMEOUT
+    seconds for a free connection instead of opening new ones. Idle connections are health
+    checked before use. Under the gevent gunicorn workers the pool's locks and sockets are
+    monkey patched, so waiting only suspends the greenlet of the request.
+
+    Requests waiting for a job (long-polls blocking in BLPOP) use a client of their own with a
+    pool of REDIS_WAIT_MAX_CONNECTIONS, so they can't take all connections of the shared pool.
+    That pool doesn't block: when it is exhausted, getting a connection fails right away.
+
+    Example:
+        >>> queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_QUESTION"])
+        >>> job = queue.fetch_job(job_id)
+    """
+
+    def __init__(self, app: Flask | None = None) -> None:
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Create the connection pool and the client of an app."""
+        pool = BlockingConnectionPool.from_url(
+            app.config["REDIS_URL"],
+            max_connections=app.config["REDIS_MAX_CONNECTIONS"],
+            timeout=app.config["REDIS_POOL_TIMEOUT"],
+            health_check_interval=app.config["REDIS_HEALTH_CHECK_INTERVAL"],
+            socket_connect_timeout=5,
+            socket_timeout=app.config["REDIS_SOCKET_TIMEOUT"],
+            socket_keepalive=True,
+        )
+        wait_pool = BlockingConnectionPool.from_url(
+            app.config["REDIS_URL"],
+            max_connections=app.config["REDIS_WAIT_MAX_CONNECTIONS"],
+            timeout=0,
+            health_check_interval=app.config["REDIS_HEALTH_CHECK_INTERVAL"],
+            socket_connect_timeout=5,
+            # must exceed the blocking reads, e.g. waiting for a chat job
+            socket_timeout=app.config["REDIS_SOCKET_TIMEOUT"],
+            socket_keepalive=True,
+        )
+        app.extensions["redis_queues"] = {
+            "client": Redis(connection_pool=pool),
+            "wait_client": Redis(connection_pool=wait_pool),
+            "queues": {},
+        }
+
+    @property
+    def _state(self) -> dict:
+        return current_app.extensions["redis_queues"]
+
+    @property
+    def connection(self) -> Redis:
+        """The Redis client of the current app."""
+        return self._state["client"]
+
+    @property
+    def wait_connection(self) -> Redis:
+        """The Redis client of the current app for blocking waits, see wait_for_job."""
+        return self._state["wait_client"]
+
+    def get_queue(self, name: str) -> Queue:
+        """Get the RQ queue with a name, sharing the connection pool of the current app.
+
+        Parameters
+        ----------
+        name : str
+            The name of the queue, e.g. REDIS_QUEUE_QUESTION from the config
+
+        Returns
+        -------
+        Queue
+            The queue
+        """
+        queues = self._state["queues"]
+        if name not in queues:
+            queues[name] = Queue(name, connection=self.connection)
+        return queues[name]
+
+
+redis_queues = RedisQueues()
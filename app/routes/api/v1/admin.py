@@ -12,6 +12,7 @@ from app.database import db
 from app.models.user import User, VALID_ROLES
 from app.models.organisation import Organisation
 from app.models.user_auth import UserAuth
+from app.queues import redis_queues
 from app.schemas import UserSchema, OrganisationSchema, UserAuthSchema
 from app.helpers.users import (
     create_user,
@@ -21,8 +22,6 @@ from app.helpers.users import (
     role_required,
 )
 
-from redis import Redis
-from rq import Queue
 from datetime import datetime
 import logging
 
@@ -106,8 +105,7 @@ class JobStatus(Resource):
     @jwt_required(locations=["headers", "cookies"])
     def get(self, job_id):
         """Get the status of an indexing job."""
-        redis_conn = Redis.from_url(current_app.config["REDIS_URL"])
-        queue = Queue(current_app.config["REDIS_QUEUE_INDEXER"], connection=redis_conn)
+        queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_INDEXER"])
         job = queue.fetch_job(job_id)
 
         if job is None:
@@ -143,8 +141,7 @@ class StartIndexing(Resource):
                 return {"error": "Invalid type"}, 400
 
             try:
-                redis_conn = Redis.from_url(current_app.config["REDIS_URL"])
-                queue = Queue(current_app.config["REDIS_QUEUE_INDEXER"], connection=redis_conn)
+                queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_INDEXER"])
 
                 user_id = session["user.id"]
                 org_id = session.get("user.org_id")
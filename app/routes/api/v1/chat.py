@@ -3,8 +3,9 @@
 from flask import current_app, request, session
 from pydantic import ValidationError
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from redis import Redis
-from rq import Queue
+from rq import Callback
+from redis.exceptions import RedisError
+from rq.job import Job
 from sentry_sdk import start_transaction
 
 from app.swagger import authorizations
@@ -18,6 +19,8 @@ from flask_restx import Namespace, Resource, fields
 from app.models.user import User
 from app.tasks import get_answer_from_rag
 from app.helpers.chat import can_send_message
+from app.queues import redis_queues
+from app.helpers.jobs import notify_job_done, notify_job_failed, wait_for_job
 
 chat_ns = Namespace("chat", description="Chat operations", authorizations=authorizations)
 
@@ -91,8 +94,7 @@ class ChatResource(Resource):
                 if not can_send_message(user_id=user_id):
                     return {"status": "ERROR", "message": "Message limit exceeded"}, 429
 
-                redis_conn = Redis.from_url(current_app.config["REDIS_URL"])
-                queue = Queue(current_app.config["REDIS_QUEUE_QUESTION"], connection=redis_conn)
+                queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_QUESTION"])
 
                 # Create or retrieve chat conversation
                 conversation_id = session.get("conversation_id") or str(uuid.uuid4())
@@ -106,6 +108,8 @@ class ChatResource(Resource):
                     current_user.email,
                     current_user.organisation.name,
                     model_type="OpenAILlm",
+                    on_success=Callback(notify_job_done),
+                    on_failure=Callback(notify_job_failed),
                 )
                 logging.info(
                     "Enqueued job for chat, message %s, conversation %s",
@@ -153,26 +157,92 @@ class ChatResource(Resource):
 
         logging.debug("Fetching job result for job ID: %s", job_id)
 
-        redis_conn = Redis.from_url(current_app.config["REDIS_URL"])
-        queue = Queue(current_app.config["REDIS_QUEUE_QUESTION"], connection=redis_conn)
+        queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_QUESTION"])
         job = queue.fetch_job(job_id)
 
-        logging.debug("Job status: %s", job.get_status())
-        if job is None:
-            return {"status": "ERROR", "message": "Job not found"}, 404
-        elif job.is_failed:
-            return {"status": "FAILED", "error": str(job.exc_info)}, 500
-        elif job.is_finished:
-            logging.info("Job result: %s", job.result)
-            if job.result["status"] == "Failed":
-                return {"status": "FAILED", "error": job.result}, 500
-            if job.result["status"] == "No Relevant Source":
-                return {"status": "NO_RELEVANT_SOURCE", "result": job.result}, 500
-            return {
-                "status": "SUCCESS",
-                "result": job.result,
-                "conversation_id": conversation_id,
-            }
-        else:
-            # Job is either queued or started but not yet finished
-            return {"status": "IN PROGRESS"}, 202
+        return job_response(job, conversation_id)
+
+
+@chat_ns.route("/wait")
+class ChatWaitResource(Resource):
+    """Resource to wait for the result of a chat processing job."""
+
+    @chat_ns.doc(
+        params={
+            "job_id": "ID of the processing job to wait for",
+            "conversation_id": "ID of the conversation",
+            "timeout": "Maximum number of seconds to wait, capped by LORELAI_CHAT_WAIT_TIMEOUT",
+        }
+    )
+    @chat_ns.response(200, "Success", result_response)
+    @chat_ns.response(202, "Processing In Progress")
+    @chat_ns.response(400, "Missing Job ID")
+    @chat_ns.response(404, "Job Not Found")
+    @chat_ns.response(500, "Processing Failed")
+    @chat_ns.doc(security="Bearer Auth")
+    @jwt_required(locations=["headers", "cookies"])
+    def get(self):
+        """
+        Wait for the result of a chat processing job.
+
+        Blocks until the job is done or the timeout expires, and then responds like the GET on
+        /chat. The UI issues the next wait as soon as a 202 comes in.
+
+        Requires job_id query parameter.
+        """
+        job_id = request.args.get("job_id")
+        conversation_id = request.args.get("conversation_id")
+        max_timeout = current_app.config["LORELAI_CHAT_WAIT_TIMEOUT"]
+        timeout = min(request.args.get("timeout", max_timeout, type=int), max_timeout)
+
+        if not job_id:
+            return {"status": "ERROR", "message": "Job ID is required"}, 400
+
+        queue = redis_queues.get_queue(current_app.config["REDIS_QUEUE_QUESTION"])
+        job = queue.fetch_job(job_id)
+        if job is not None and not (job.is_finished or job.is_failed) and timeout > 0:
+            logging.debug("Waiting up to %ss for job ID: %s", timeout, job_id)
+            try:
+                if wait_for_job(redis_queues.wait_connection, job_id, timeout):
+                    job = queue.fetch_job(job_id)
+            except RedisError as e:
+                # e.g. all wait connections in use, the UI waits again on the 202
+                logging.warning(f"Failed to wait for job {job_id}: {e}")
+        return job_response(job, conversation_id)
+
+
+def job_response(job: Job | None, conversation_id: str | None) -> tuple[dict, int]:
+    """Return the response for the status or result of a chat processing job.
+
+    Parameters
+    ----------
+    job : Job | None
+        The job, None if it doesn't exist (anymore)
+    conversation_id : str | None
+        The ID of the conversation
+
+    Returns
+    -------
+    tuple[dict, int]
+        The response body and the HTTP status code
+    """
+    if job is None:
+        return {"status": "ERROR", "message": "Job not found"}, 404
+
+    logging.debug("Job status: %s", job.get_status())
+    if job.is_failed:
+        return {"status": "FAILED", "error": str(job.exc_info)}, 500
+    elif job.is_finished:
+        logging.info("Job result: %s", job.result)
+        if job.result["status"] == "Failed":
+            return {"status": "FAILED", "error": job.result}, 500
+        if job.result["status"] == "No Relevant Source":
+            return {"status": "NO_RELEVANT_SOURCE", "result": job.result}, 500
+        return {
+            "status": "SUCCESS",
+            "result": job.result,
+            "conversation_id": conversation_id,
+        }, 200
+    else:
+        # Job is either queued or started but not yet finished
+        return {"status": "IN PROGRESS"}, 202
@@ -1,10 +1,15 @@
 """API routes for conversation operations."""
 
-from flask_restx import Namespace, Resource, fields
+from datetime import UTC
+
+from flask_restx import Namespace, Resource, fields, inputs
 from flask_jwt_extended import jwt_required
-from flask import abort
+from flask import Response, abort, request
+from werkzeug.http import quote_etag
 
-from app.helpers.chat import delete_conversation, get_all_conversation_messages
+from app.database import db
+from app.helpers.chat import delete_conversation, get_conversation_messages
+from app.models.chat import ChatConversation
 
 conversation_ns = Namespace(
     "conversation", description="Operations related to chat conversations and their messages"
@@ -14,6 +19,7 @@ conversation_ns = Namespace(
 message_model = conversation_ns.model(
     "Message",
     {
+        "message_id": fields.Integer(required=True, description="ID of the message, the cursor"),
         "sender": fields.String(required=True, description="Message sender (user or assistant)"),
         "message_content": fields.String(required=True, description="Content of the message"),
         "created_at": fields.DateTime(required=True, description="Timestamp of message creation"),
@@ -21,6 +27,39 @@ message_model = conversation_ns.model(
     },
 )
 
+message_page_model = conversation_ns.model(
+    "MessagePage",
+    {
+        "messages": fields.List(
+            fields.Nested(message_model), required=True, description="Messages, oldest first"
+        ),
+        "has_more": fields.Boolean(
+            required=True,
+            description="Whether there are more messages, older ones for the latest page and "
+            "before, newer ones for after and since",
+        ),
+    },
+)
+
+MAX_MESSAGES_PER_PAGE = 200
+
+messages_parser = conversation_ns.parser()
+messages_parser.add_argument(
+    "limit", type=int, location="args", default=50, help="Maximum number of messages"
+)
+messages_parser.add_argument(
+    "before", type=int, location="args", help="Only messages before this message ID"
+)
+messages_parser.add_argument(
+    "after", type=int, location="args", help="Only messages after this message ID"
+)
+messages_parser.add_argument(
+    "since",
+    type=inputs.datetime_from_iso8601,
+    location="args",
+    help="Only messages created after this ISO 8601 time (UTC if without offset)",
+)
+
 
 # route to delete a conversation and all its messages
 @conversation_ns.route("/<conversation_id>/delete")
@@ -46,26 +85,55 @@ class DeleteConversationResource(Resource):
             abort(404, str(e))
 
 
-# get all messages for a given conversation
+# get the messages of a given conversation, page by page
 @conversation_ns.route("/<conversation_id>")
 @conversation_ns.param("conversation_id", "The conversation identifier")
 class GetConversationResource(Resource):
-    """Resource to get all messages for a given conversation."""
+    """Resource to get the messages of a given conversation."""
 
     @conversation_ns.doc(
         security="Bearer Auth",
         responses={
-            200: "Messages retrieved successfully",
+            200: ("Messages retrieved successfully", message_page_model),
+            304: "The messages didn't change since the ETag in If-None-Match",
+            400: "Invalid parameters",
             404: "Conversation not found",
             401: "Unauthorized access",
         },
     )
-    @conversation_ns.marshal_with(message_model, as_list=True)
+    @conversation_ns.expect(messages_parser)
     @jwt_required(locations=["headers", "cookies"])
     def get(self, conversation_id):
-        """Get all messages for a given conversation."""
-        try:
-            messages = get_all_conversation_messages(conversation_id)
-            return messages, 200
-        except ValueError as e:
-            abort(404, str(e))
+        """Get the latest messages of a conversation, the messages before or the new messages.
+
+        The response has a weak ETag of the number of messages and the time of the last
+        message, an unchanged conversation returns 304 for a matching If-None-Match.
+        """
+        args = messages_parser.parse_args()
+        limit = max(1, min(args["limit"], MAX_MESSAGES_PER_PAGE))
+        if args["before"] is not None and (args["after"] is not None or args["since"]):
+            abort(400, "before can't be combined with after or since")
+        since = args["since"]
+        if since is not None and since.tzinfo is not None:
+            # created_at is a naive UTC timestamp
+            since = since.astimezone(UTC).replace(tzinfo=None)
+
+        conversation = db.session.get(ChatConversation, conversation_id)
+        if conversation is None or conversation.marked_deleted:
+            abort(404, f"Conversation {conversation_id} not found")
+
+        last_message_at = (
+            conversation.last_message_at.strftime("%Y%m%d%H%M%S%f")
+            if conversation.last_message_at
+            else ""
+        )
+        etag = f"{conversation.message_count}-{last_message_at}"
+        headers = {"ETag": quote_etag(etag, weak=True), "Cache-Control": "private, no-cache"}
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+
+        messages, has_more = get_conversation_messages(
+            conversation_id, limit, before_id=args["before"], after_id=args["after"], since=since
+        )
+        page = {"messages": messages, "has_more": has_more}
+        return conversation_ns.marshal(page, message_page_model), 200, headers
@@ -8,7 +8,7 @@ import logging
 from app.database import db
 from app.models.user_auth import UserAuth
 from app.models.datasource import Datasource
-from app.models.google_drive import GoogleDriveItem
+from app.models.google_drive import GoogleDriveItem, GoogleDriveSheetTab
 from app.models.user import User
 from app.helpers.datasources import DATASOURCE_GOOGLE_DRIVE
 from flask_jwt_extended import jwt_required
@@ -60,6 +60,7 @@ class RevokeAccess(Resource):
                 user_id=user_id, datasource_id=datasource.datasource_id
             ).delete()
             GoogleDriveItem.query.filter_by(user_id=user_id).delete()
+            GoogleDriveSheetTab.query.filter_by(user_id=user_id).delete()
 
             # Delete vectors from Pinecone
             delete_user_datasource_vectors(
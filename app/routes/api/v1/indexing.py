@@ -1,11 +1,22 @@
 """API routes for indexing operations."""
 
-from flask_restx import Namespace, Resource, fields
+from datetime import timedelta
+
+from flask_restx import Namespace, Resource, fields, inputs
 from flask_jwt_extended import jwt_required
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import load_only
 import logging
 
-from app.models.indexing import IndexingRunItem
+from app.database import db
+from app.helpers.extracted_texts import get_extracted_text
+from app.helpers.pagination import cached_count, cached_values, keyset_paginate
+from app.models.datasource import Datasource
+from app.models.extracted_text import ExtractedText
+from app.models.indexing import IndexingRun, IndexingRunItem
+from app.models.organisation import Organisation
+from app.models.user import User
 from app.helpers.users import role_required
 from flask_login import current_user
 
@@ -28,14 +39,65 @@ error_model = indexing_ns.model(
 pagination_model = indexing_ns.model(
     "PaginationMetadata",
     {
-        "page": fields.Integer(description="Current page number"),
         "per_page": fields.Integer(description="Items per page"),
-        "total_items": fields.Integer(description="Total number of items"),
-        "total_pages": fields.Integer(description="Total number of pages"),
+        "next_cursor": fields.String(description="Cursor of the next page, null on the last page"),
+        "total_items": fields.Integer(
+            description="Total number of items, cached for up to a minute while a run is active"
+        ),
     },
 )
 
 # Models for request/response documentation
+run_model = indexing_ns.model(
+    "IndexingRun",
+    {
+        "id": fields.Integer(required=True, description="Run ID"),
+        "created_at": fields.String(required=True, description="Creation timestamp"),
+        "status": fields.String(required=True, description="Status of the run"),
+        "progress": fields.Raw(required=False, description="Counters of the indexing pipeline"),
+        "user_id": fields.Integer(required=True, description="ID of the user"),
+        "user_email": fields.String(required=True, description="Email of the user"),
+        "organisation_id": fields.Integer(required=True, description="ID of the organisation"),
+        "organisation_name": fields.String(required=True, description="Name of the organisation"),
+        "datasource_id": fields.Integer(required=True, description="ID of the datasource"),
+        "datasource_name": fields.String(required=True, description="Name of the datasource"),
+        "item_count": fields.Integer(required=True, description="Number of items of the run"),
+        "item_counts": fields.Raw(required=True, description="Number of items per item status"),
+    },
+)
+
+run_list_model = indexing_ns.model(
+    "IndexingRunList",
+    {
+        "runs": fields.List(fields.Nested(run_model), required=True, description="Indexing runs"),
+        "metadata": fields.Nested(
+            pagination_model, required=True, description="Pagination metadata"
+        ),
+    },
+)
+
+filter_option_model = indexing_ns.model(
+    "IndexingRunFilterOption",
+    {
+        "id": fields.Integer(required=True, description="Value of the option"),
+        "name": fields.String(required=True, description="Label of the option"),
+    },
+)
+
+run_filters_model = indexing_ns.model(
+    "IndexingRunFilters",
+    {
+        "users": fields.List(fields.Nested(filter_option_model), description="Users with runs"),
+        "organisations": fields.List(
+            fields.Nested(filter_option_model), description="Organisations with runs"
+        ),
+        "datasources": fields.List(
+            fields.Nested(filter_option_model), description="Datasources with runs"
+        ),
+        "statuses": fields.List(fields.String, description="Statuses of the runs"),
+    },
+)
+
 item_model = indexing_ns.model(
     "IndexingRunItem",
     {
@@ -70,15 +132,41 @@ item_list_model = indexing_ns.model(
 item_details_model = indexing_ns.model(
     "IndexingRunItemDetails",
     {
-        "item_extractedtext": fields.String(required=False, description="Extracted text content"),
+        "item_extractedtext_sha256": fields.String(
+            required=False, description="Key of the extracted text, load it from extracted_text"
+        ),
+        "item_extractedtext_length": fields.Integer(
+            required=False, description="Number of characters of the extracted text"
+        ),
         "item_log": fields.String(required=False, description="Processing log"),
         "item_error": fields.String(required=False, description="Error message if any"),
     },
 )
 
+item_extracted_text_model = indexing_ns.model(
+    "IndexingRunItemExtractedText",
+    {
+        "item_extractedtext": fields.String(required=False, description="Extracted text content"),
+    },
+)
+
+# Seconds the run counts and filter values are cached, new runs show up in the list right away
+RUN_COUNT_TTL = 60
+RUN_FILTERS_TTL = 5 * 60
+
+# Columns the items can be sorted by, all NOT NULL as the keyset pagination compares them.
+# The default sort (created_at) is a range scan of ix_indexing_run_items_run_created.
+ITEM_SORT_FIELDS = ("created_at", "id", "item_name", "item_status", "item_type")
+# Seconds the item counts of a run are cached, finished runs don't change anymore
+ACTIVE_RUN_COUNT_TTL = 60
+FINISHED_RUN_COUNT_TTL = 24 * 60 * 60
+FINISHED_RUN_STATUSES = ("completed", "completed_with_errors", "failed")
+
 # Request parsers
 list_parser = indexing_ns.parser()
-list_parser.add_argument("page", type=int, location="args", default=1, help="Page number")
+list_parser.add_argument(
+    "cursor", type=str, location="args", help="Cursor of the page, from next_cursor"
+)
 list_parser.add_argument("per_page", type=int, location="args", default=20, help="Items per page")
 list_parser.add_argument("status", type=str, location="args", help="Filter by status")
 list_parser.add_argument("type", type=str, location="args", help="Filter by item type")
@@ -87,10 +175,218 @@ list_parser.add_argument(
     type=str,
     location="args",
     default="-created_at",
-    help="Sort field (prefix with - for descending)",
+    help=f"Sort field (prefix with - for descending), one of {', '.join(ITEM_SORT_FIELDS)}",
+)
+
+run_list_parser = indexing_ns.parser()
+run_list_parser.add_argument(
+    "cursor", type=str, location="args", help="Cursor of the page, from next_cursor"
+)
+run_list_parser.add_argument(
+    "per_page", type=int, location="args", default=25, help="Runs per page"
+)
+run_list_parser.add_argument("user_id", type=int, location="args", help="Filter by user")
+run_list_parser.add_argument(
+    "organisation_id", type=int, location="args", help="Filter by organisation"
+)
+run_list_parser.add_argument(
+    "datasource_id", type=int, location="args", help="Filter by datasource"
+)
+run_list_parser.add_argument("status", type=str, location="args", help="Filter by status")
+run_list_parser.add_argument(
+    "start_date", type=inputs.date, location="args", help="Created on or after (YYYY-MM-DD)"
+)
+run_list_parser.add_argument(
+    "end_date", type=inputs.date, location="args", help="Created on or before (YYYY-MM-DD)"
 )
 
 
+def get_run_item_counts(run_ids: list[int]) -> dict[int, dict[str, int]]:
+    """Count the items of indexing runs per item status.
+
+    Parameters
+    ----------
+    run_ids : list[int]
+        The IDs of the runs
+
+    Returns
+    -------
+    dict[int, dict[str, int]]
+        The number of items per item status of each run with items
+    """
+    if not run_ids:
+        return {}
+    counts = {}
+    rows = (
+        db.session.query(IndexingRunItem.indexing_run_id, IndexingRunItem.item_status, func.count())
+        .filter(IndexingRunItem.indexing_run_id.in_(run_ids))
+        .group_by(IndexingRunItem.indexing_run_id, IndexingRunItem.item_status)
+        .all()
+    )
+    for run_id, item_status, count in rows:
+        counts.setdefault(run_id, {})[item_status] = count
+    return counts
+
+
+def get_run_filter_values() -> dict[str, list]:
+    """Return the users, organisations, datasources and statuses occurring in indexing runs."""
+
+    def options(id_column, name_column, run_column) -> list[dict]:
+        rows = (
+            db.session.query(id_column, name_column)
+            .filter(id_column.in_(db.session.query(run_column).distinct()))
+            .order_by(name_column)
+            .all()
+        )
+        return [{"id": row[0], "name": row[1]} for row in rows]
+
+    return {
+        "users": options(User.id, User.email, IndexingRun.user_id),
+        "organisations": options(Organisation.id, Organisation.name, IndexingRun.organisation_id),
+        "datasources": options(
+            Datasource.datasource_id, Datasource.datasource_name, IndexingRun.datasource_id
+        ),
+        "statuses": sorted(
+            status for (status,) in db.session.query(IndexingRun.status).distinct().all()
+        ),
+    }
+
+
+@indexing_ns.route("/runs")
+class IndexingRuns(Resource):
+    """Resource for the indexing runs."""
+
+    @indexing_ns.doc(description="Get the indexing runs, newest first, with their item counts")
+    @indexing_ns.expect(run_list_parser)
+    @indexing_ns.response(200, "Success", run_list_model)
+    @indexing_ns.response(400, "Invalid parameters", error_model)
+    @indexing_ns.response(401, "Unauthorized", error_model)
+    @indexing_ns.response(403, "Forbidden", error_model)
+    @indexing_ns.response(500, "Internal server error", error_model)
+    @jwt_required(locations=["headers", "cookies"])
+    @role_required(["super_admin"])
+    def get(self):
+        """Return the indexing runs with keyset pagination and filtering."""
+        try:
+            args = run_list_parser.parse_args()
+            per_page = max(1, min(args["per_page"], 100))  # Limit maximum runs per page
+
+            query = (
+                db.session.query(
+                    IndexingRun.id,
+                    IndexingRun.created_at,
+                    IndexingRun.status,
+                    IndexingRun.progress,
+                    IndexingRun.user_id,
+                    User.email.label("user_email"),
+                    IndexingRun.organisation_id,
+                    Organisation.name.label("organisation_name"),
+                    IndexingRun.datasource_id,
+                    Datasource.datasource_name,
+                )
+                .join(User, IndexingRun.user_id == User.id)
+                .join(Organisation, IndexingRun.organisation_id == Organisation.id)
+                .join(Datasource, IndexingRun.datasource_id == Datasource.datasource_id)
+            )
+
+            # Apply filters
+            filters = []
+            for name, column in (
+                ("user_id", IndexingRun.user_id),
+                ("organisation_id", IndexingRun.organisation_id),
+                ("datasource_id", IndexingRun.datasource_id),
+                ("status", IndexingRun.status),
+            ):
+                if args[name] is not None:
+                    filters.append(column == args[name])
+            if args["start_date"]:
+                filters.append(IndexingRun.created_at >= args["start_date"])
+            if args["end_date"]:
+                filters.append(IndexingRun.created_at < args["end_date"] + timedelta(days=1))
+            query = query.filter(*filters)
+
+            try:
+                runs, next_cursor = keyset_paginate(
+                    query, IndexingRun.created_at, IndexingRun.id, True, per_page, args["cursor"]
+                )
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            item_counts = get_run_item_counts([run.id for run in runs])
+            runs_data = [
+                {
+                    "id": run.id,
+                    "created_at": run.created_at.strftime("%Y-%m-%d %H:%M:%S")
+                    if run.created_at
+                    else None,
+                    "status": run.status,
+                    "progress": run.progress,
+                    "user_id": run.user_id,
+                    "user_email": run.user_email,
+                    "organisation_id": run.organisation_id,
+                    "organisation_name": run.organisation_name,
+                    "datasource_id": run.datasource_id,
+                    "datasource_name": run.datasource_name,
+                    "item_count": sum(item_counts.get(run.id, {}).values()),
+                    "item_counts": item_counts.get(run.id, {}),
+                }
+                for run in runs
+            ]
+
+            filter_key = ":".join(
+                str(args[name] or "")
+                for name in (
+                    "user_id",
+                    "organisation_id",
+                    "datasource_id",
+                    "status",
+                    "start_date",
+                    "end_date",
+                )
+            )
+            total_items = cached_count(
+                f"indexing_runs:{filter_key}",
+                IndexingRun.query.filter(*filters),
+                RUN_COUNT_TTL,
+            )
+
+            return {
+                "runs": runs_data,
+                "metadata": {
+                    "per_page": per_page,
+                    "next_cursor": next_cursor,
+                    "total_items": total_items,
+                },
+            }
+
+        except SQLAlchemyError as e:
+            logging.error(f"Database error: {e}")
+            return {"error": "Failed to retrieve indexing runs", "details": str(e)}, 500
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            return {"error": "An unexpected error occurred"}, 500
+
+
+@indexing_ns.route("/runs/filters")
+class IndexingRunFilters(Resource):
+    """Resource for the filter values of the indexing runs."""
+
+    @indexing_ns.doc(description="Get the values of the indexing run filters")
+    @indexing_ns.response(200, "Success", run_filters_model)
+    @indexing_ns.response(401, "Unauthorized", error_model)
+    @indexing_ns.response(403, "Forbidden", error_model)
+    @indexing_ns.response(500, "Internal server error", error_model)
+    @jwt_required(locations=["headers", "cookies"])
+    @role_required(["super_admin"])
+    def get(self):
+        """Return the users, organisations, datasources and statuses of the indexing runs."""
+        try:
+            return cached_values("indexing_run_filters", get_run_filter_values, RUN_FILTERS_TTL)
+        except SQLAlchemyError as e:
+            logging.error(f"Database error: {e}")
+            return {"error": "Failed to retrieve the filters", "details": str(e)}, 500
+
+
 @indexing_ns.route("/runs/<int:run_id>/items")
 @indexing_ns.param("run_id", "The indexing run identifier")
 class IndexingRunItems(Resource):
@@ -106,15 +402,28 @@ class IndexingRunItems(Resource):
     @jwt_required(locations=["headers", "cookies"])
     @role_required(["super_admin"])
     def get(self, run_id):
-        """Return the items for a specific indexing run with pagination and filtering."""
+        """Return the items for a specific indexing run with keyset pagination and filtering."""
         try:
             # Parse request arguments
             args = list_parser.parse_args()
-            page = args["page"]
-            per_page = min(args["per_page"], 100)  # Limit maximum items per page
+            per_page = max(1, min(args["per_page"], 100))  # Limit maximum items per page
+            sort_field = args["sort"].lstrip("-")
+            sort_desc = args["sort"].startswith("-")
+            if sort_field not in ITEM_SORT_FIELDS:
+                return {"error": f"Invalid sort field: {sort_field}"}, 400
 
-            # Build query
-            query = IndexingRunItem.query.filter_by(indexing_run_id=run_id)
+            # Build query, loading only the columns of the list
+            query = IndexingRunItem.query.filter_by(indexing_run_id=run_id).options(
+                load_only(
+                    IndexingRunItem.id,
+                    IndexingRunItem.item_name,
+                    IndexingRunItem.item_type,
+                    IndexingRunItem.item_status,
+                    IndexingRunItem.created_at,
+                    IndexingRunItem.item_url,
+                    IndexingRunItem.item_error,
+                )
+            )
 
             # Apply filters
             if args["status"]:
@@ -122,19 +431,17 @@ class IndexingRunItems(Resource):
             if args["type"]:
                 query = query.filter_by(item_type=args["type"])
 
-            # Apply sorting
-            sort_field = args["sort"].lstrip("-")
-            sort_desc = args["sort"].startswith("-")
-            if hasattr(IndexingRunItem, sort_field):
-                order_by = (
-                    getattr(IndexingRunItem, sort_field).desc()
-                    if sort_desc
-                    else getattr(IndexingRunItem, sort_field)
+            try:
+                items, next_cursor = keyset_paginate(
+                    query,
+                    getattr(IndexingRunItem, sort_field),
+                    IndexingRunItem.id,
+                    sort_desc,
+                    per_page,
+                    args["cursor"],
                 )
-                query = query.order_by(order_by)
-
-            # Paginate results
-            pagination = query.paginate(page=page, per_page=per_page)
+            except ValueError as e:
+                return {"error": str(e)}, 400
 
             # Format response
             items_data = [
@@ -149,16 +456,24 @@ class IndexingRunItems(Resource):
                     "item_url": item.item_url,
                     "item_error": item.item_error,
                 }
-                for item in pagination.items
+                for item in items
             ]
 
+            run_status = db.session.query(IndexingRun.status).filter_by(id=run_id).scalar()
+            total_items = cached_count(
+                f"indexing_run_items:{run_id}:{args['status'] or ''}:{args['type'] or ''}",
+                query,
+                FINISHED_RUN_COUNT_TTL
+                if run_status in FINISHED_RUN_STATUSES
+                else ACTIVE_RUN_COUNT_TTL,
+            )
+
             return {
                 "items": items_data,
                 "metadata": {
-                    "page": page,
                     "per_page": per_page,
-                    "total_items": pagination.total,
-                    "total_pages": pagination.pages,
+                    "next_cursor": next_cursor,
+                    "total_items": total_items,
                 },
             }
 
@@ -194,8 +509,18 @@ class IndexingRunItemDetails(Resource):
                 if not indexing_run or indexing_run.user_id != current_user.id:
                     return {"error": "You do not have permission to access this item"}, 403
 
+            # only the length, the text itself is loaded by the extracted_text endpoint
+            text_length = None
+            if item.item_extractedtext_sha256:
+                text_length = (
+                    db.session.query(ExtractedText.text_length)
+                    .filter_by(sha256=item.item_extractedtext_sha256)
+                    .scalar()
+                )
+
             return {
-                "item_extractedtext": item.item_extractedtext,
+                "item_extractedtext_sha256": item.item_extractedtext_sha256,
+                "item_extractedtext_length": text_length,
                 "item_log": item.item_log,
                 "item_error": item.item_error,
             }
@@ -205,3 +530,35 @@ class IndexingRunItemDetails(Resource):
         except Exception as e:
             logging.error(f"Unexpected error: {e}")
             return {"error": "An unexpected error occurred"}, 500
+
+
+@indexing_ns.route("/items/<int:item_id>/extracted_text")
+@indexing_ns.param("item_id", "The indexing item identifier")
+class IndexingRunItemExtractedText(Resource):
+    """Resource for the extracted text of an indexing run item."""
+
+    @indexing_ns.doc(description="Get the text extracted from a specific indexing item")
+    @indexing_ns.response(200, "Success", item_extracted_text_model)
+    @indexing_ns.response(401, "Unauthorized", error_model)
+    @indexing_ns.response(403, "Forbidden", error_model)
+    @indexing_ns.response(404, "Item not found", error_model)
+    @indexing_ns.response(500, "Internal server error", error_model)
+    @jwt_required(locations=["headers", "cookies"])
+    def get(self, item_id):
+        """Return the extracted text of a specific indexing run item."""
+        try:
+            item = IndexingRunItem.query.get_or_404(item_id)
+
+            # Check if the user has access to this item
+            if not current_user.is_super_admin():
+                indexing_run = item.indexing_run
+                if not indexing_run or indexing_run.user_id != current_user.id:
+                    return {"error": "You do not have permission to access this item"}, 403
+
+            return {"item_extractedtext": get_extracted_text(item.item_extractedtext_sha256)}
+        except SQLAlchemyError as e:
+            logging.error(f"Database error: {e}")
+            return {"error": "Failed to retrieve extracted text", "details": str(e)}, 500
+        except Exception as e:
+            logging.error(f"Unexpected error: {e}")
+            return {"error": "An unexpected error occurred"}, 500
@@ -39,6 +39,7 @@ class IndexingRunSchema(BaseModel):
     organisation_id: int
     datasource_id: int
     error: str | None = None
+    progress: dict | None = None
     items: list[IndexingRunItemSchema] = []
     user: UserSchema
     organisation: OrganisationSchema
@@ -67,7 +67,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // Add this line at the beginning of the DOMContentLoaded event listener
     const username = document.body.dataset.username;
 
-    function addMessage(content, isUser = true, isHTML = false, isSources = false, timestamp = null) {
+    function addMessage(content, isUser = true, isHTML = false, isSources = false, timestamp = null, prepend = false) {
         // Convert markdown content to HTML
         content = marked.parse(content);
 
@@ -97,11 +97,122 @@ document.addEventListener('DOMContentLoaded', function() {
             messageContentDiv.innerHTML = `<strong>Lorelai</strong>${timestampSection}${content}`;
         }
         messageContainerDiv.appendChild(messageContentDiv);
-        messagesDiv.appendChild(messageContainerDiv); // Append the message to messagesDiv
-        messagesDiv.scrollTop = messagesDiv.scrollHeight; // Scroll to the bottom of the chat
+        if (prepend) {
+            // Insert an earlier message above the loaded ones, keeping the scroll position
+            const earlierButton = document.getElementById('loadEarlierMessages');
+            messagesDiv.insertBefore(messageContainerDiv, earlierButton ? earlierButton.nextSibling : messagesDiv.firstChild);
+        } else {
+            messagesDiv.appendChild(messageContainerDiv); // Append the message to messagesDiv
+            messagesDiv.scrollTop = messagesDiv.scrollHeight; // Scroll to the bottom of the chat
+        }
+    }
+
+    // IDs of the oldest and the newest loaded message of the conversation, the paging cursors
+    let oldestMessageId = null;
+    let newestMessageId = null;
+
+    /**
+     * Fetches a page of the messages of a conversation.
+     *
+     * @param {string} conversationId The ID of the conversation.
+     * @param {Object} params The paging parameters, before or after a message ID.
+     * @returns {Promise<Object|null>} The messages and has_more, null if the conversation wasn't found.
+     */
+    async function fetchMessages(conversationId, params = {}) {
+        const query = new URLSearchParams(params);
+        const response = await makeAuthenticatedRequest(
+            `/api/v1/conversation/${conversationId}?${query}`,
+            'GET'
+        );
+        if (response.status === 404) {
+            return null;
+        }
+        if (!response.ok) {
+            throw new Error(`Failed to fetch messages: ${response.status}`);
+        }
+
+        const data = await response.json();
+        if (data.messages.length > 0) {
+            if (!params.after) {
+                oldestMessageId = data.messages[0].message_id;
+            }
+            if (!params.before) {
+                newestMessageId = data.messages[data.messages.length - 1].message_id;
+            }
+        }
+        return data;
+    }
+
+    function renderMessages(messages, prepend = false) {
+        // Prepended messages are inserted one by one right below the button, newest first
+        const ordered = prepend ? [...messages].reverse() : messages;
+        for (const message of ordered) {
+            addMessage(
+                content=message.message_content,
+                isUser=(message.sender === "user"),
+                isHTML=true,
+                isSources=false,
+                timestamp=message.created_at,
+                prepend=prepend
+            );
+        }
+    }
+
+    function updateEarlierMessagesButton(conversationId, hasMore) {
+        let button = document.getElementById('loadEarlierMessages');
+        if (!hasMore) {
+            if (button) {
+                button.remove();
+            }
+            return;
+        }
+        if (!button) {
+            button = document.createElement('button');
+            button.id = 'loadEarlierMessages';
+            button.className = 'btn btn-link btn-sm d-block mx-auto';
+            button.textContent = 'Load earlier messages';
+            button.addEventListener('click', async function() {
+                button.disabled = true;
+                try {
+                    const data = await fetchMessages(conversationId, { before: oldestMessageId });
+                    if (data) {
+                        renderMessages(data.messages, true);
+                        updateEarlierMessagesButton(conversationId, data.has_more);
+                    }
+                } catch (error) {
+                    console.error('Error fetching earlier messages:', error);
+                } finally {
+                    button.disabled = false;
+                }
+            });
+            messagesDiv.insertBefore(button, messagesDiv.firstChild);
+        }
+    }
+
+    /**
+     * Renders the messages after the newest loaded one, e.g. the answer once it arrived.
+     * The user's own messages are already shown when they're sent.
+     *
+     * @param {string} conversationId The ID of the conversation.
+     * @returns {Promise<boolean>} Whether any answer was rendered.
+     */
+    async function renderNewMessages(conversationId) {
+        let rendered = false;
+        let hasMore = true;
+        while (hasMore) {
+            const data = await fetchMessages(conversationId, { after: newestMessageId || 0 });
+            if (!data) {
+                break;
+            }
+            const answers = data.messages.filter(message => message.sender !== 'user');
+            renderMessages(answers);
+            rendered = rendered || answers.length > 0;
+            hasMore = data.has_more;
+        }
+        return rendered;
     }
     /**
-     * Calculates the delay before making the next poll based on the attempt number.
+     * Calculates the delay before retrying after a failed request, based on the attempt number.
      *
      * @param {number} attempt The current attempt number.
      * @returns {number} The delay in milliseconds.
@@ -113,36 +224,36 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     /**
-     * Fetches the result of a chat operation from the server using a provided task ID.
-     * It checks the operation status and handles the response accordingly.
+     * Waits for the result of a chat operation on the server using a provided job ID.
+     * The server holds each request until the job is done or its wait times out (202), in
+     * which case the next wait is issued right away.
      *
-     * @param {string} taskId The ID of the task for which to fetch the result.
+     * @param {string} job_id The ID of the job for which to fetch the result.
+     * @param {string} conversation_id The ID of the conversation.
      * @param {number} attempt The current attempt number.
+     * @param {number} errors The number of failed requests so far.
      */
-    async function pollForResponse(job_id, conversation_id, attempt = 1) {
-        console.log(`Polling for response: ${job_id}, Attempt: ${attempt}`);
-        const delay = calculateDelay(attempt);
+    async function pollForResponse(job_id, conversation_id, attempt = 1, errors = 0) {
+        console.log(`Waiting for response: ${job_id}, Attempt: ${attempt}`);
 
         try {
-            await new Promise(resolve => setTimeout(resolve, delay));
-
             const response = await makeAuthenticatedRequest(
-                `/api/v1/chat?job_id=${job_id}`,
+                `/api/v1/chat/wait?job_id=${job_id}&conversation_id=${conversation_id}`,
                 'GET'
             );
 
             const data = await response.json();
             console.log('Response:', data);
 
-            conversation_id = data.conversation_id;
-            if (conversation_id) {
+            if (data.conversation_id) {
+                conversation_id = data.conversation_id;
                 //push the new url to the browser
                 history.pushState(null, '', `/conversation/${conversation_id}`);
             }
 
             if (data.status === 'SUCCESS') {
                 console.log('Operation completed successfully.');
-                displaySuccessMessage(data.result);
+                await displaySuccessMessage(data.result, conversation_id);
             } else if (data.status === 'FAILED') {
                 console.error('Operation failed:', data.error);
                 if (data.error.error == 'Index not found. Please index something first.') {
@@ -157,16 +268,17 @@ document.addEventListener('DOMContentLoaded', function() {
                 displayErrorMessage('No relevant source found for the question. Please try again \
                     with a different question or ask the question directly to LLM.');
             } else if (attempt < 40) {
-                console.log('Operation still in progress. Retrying...');
-                pollForResponse(job_id, conversation_id, attempt + 1);
+                console.log('Operation still in progress. Waiting again...');
+                pollForResponse(job_id, conversation_id, attempt + 1, errors);
             } else {
                 console.error('Error: No successful response after multiple attempts.');
                 displayErrorMessage('Error: No successful response after multiple attempts.');
             }
         } catch (error) {
             console.error('Fetch error:', error);
-            if (attempt < 20) {
-                pollForResponse(job_id, conversation_id, attempt + 1);
+            if (errors < 20) {
+                await new Promise(resolve => setTimeout(resolve, calculateDelay(errors + 1)));
+                pollForResponse(job_id, conversation_id, attempt + 1, errors + 1);
             } else {
                 displayErrorMessage('Error: Unable to retrieve response.');
             }
@@ -175,17 +287,28 @@ document.addEventListener('DOMContentLoaded', function() {
 
     /**
      * Displays the success message and any sources if available.
+     * Fetches only the messages after the newest loaded one, falling back to the answer of the
+     * job result.
      *
      * @param {Object} result The result object from the server.
+     * @param {string} conversation_id The ID of the conversation.
      */
-    function displaySuccessMessage(result) {
-        hideLoadingIndicator();
+    async function displaySuccessMessage(result, conversation_id) {
         console.log('Result:', result);
 
-        content = result.answer
+        let rendered = false;
+        try {
+            rendered = await renderNewMessages(conversation_id);
+        } catch (error) {
+            console.error('Error fetching new messages:', error);
+        }
+        hideLoadingIndicator();
 
-        addMessage(content=content, isUser=false, false); // Display the answer
+        if (!rendered) {
+            content = result.answer
 
+            addMessage(content=content, isUser=false, false); // Display the answer
+        }
     }
 
     /**
@@ -261,27 +384,16 @@ document.addEventListener('DOMContentLoaded', function() {
 
     async function get_conversation(conversationId) {
         try {
-            const response = await makeAuthenticatedRequest(
-                `/api/v1/conversation/${conversationId}`,
-                'GET'
-            );
-
-            const data = await response.json();
-            if (!data || data.length === 0) {
+            // Only the latest page, the earlier messages are loaded on demand
+            const data = await fetchMessages(conversationId);
+            if (!data || data.messages.length === 0) {
                 console.warn('No messages found for this conversation.');
                 window.location.href = '/';
                 return;
             }
 
-            for (const message of data) {
-                addMessage(
-                    content=message.message_content,
-                    isUser=(message.sender === "user"),
-                    isHTML=true,
-                    isSources=false,
-                    timestamp = message.created_at
-                );
-            }
+            renderMessages(data.messages);
+            updateEarlierMessagesButton(conversationId, data.has_more);
         } catch (error) {
             console.error('Error fetching conversation:', error);
             window.location.href = '/';
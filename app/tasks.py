@@ -10,12 +10,13 @@ from sentry_sdk import capture_exception, capture_message, set_tag, start_transa
 from app.helpers.chat import (
     insert_conversation_ignore,
     insert_message,
-    get_all_conversation_messages,
 )
 from app.helpers.notifications import add_notification
+from app.queues import redis_queues
 from app.schemas import OrganisationSchema, UserAuthSchema, UserSchema
 
 # import the indexer
+from lorelai.conversation_memory import ConversationMemory
 from lorelai.indexer import Indexer
 from lorelai.indexers.googledriveindexer import GoogleDriveIndexer
 from lorelai.indexers.slackindexer import SlackIndexer
@@ -84,21 +85,16 @@ def get_answer_from_rag(
                 set_tag("conversation_insertion_time", conversation_time_taken)
                 logging.info(f"Conversation insertion took {conversation_time_taken:.2f} seconds.")
 
-                # Get conversation history
+                # Get conversation history: the rolling summary and the most recent messages
                 history_start_time = time.time()
-                conversation_history = get_all_conversation_messages(conversation_id)
+                memory = ConversationMemory(
+                    conversation_id, token_budget=app.config["LORELAI_CHAT_HISTORY_TOKENS"]
+                )
+                history_context = memory.get_context()
                 history_time_taken = time.time() - history_start_time
                 set_tag("history_retrieval_time", history_time_taken)
                 logging.info(f"History retrieval took {history_time_taken:.2f} seconds.")
 
-                # Format conversation history
-                history_context = ""
-                if conversation_history:
-                    history_context = "Previous conversation:\n"
-                    for msg in conversation_history:
-                        role = "User" if msg["sender"] == "user" else "Assistant"
-                        history_context += f"{role}: {msg['message_content']}\n"
-
                 # Measure time for inserting message
                 message_start_time = time.time()
                 # Create the classifier instance here - HRISTO
@@ -126,7 +122,9 @@ def get_answer_from_rag(
                 get_answer_time_start = time.time()
                 # Include conversation history in the question
                 response = llm.get_answer(
-                    question=chat_message, conversation_history=history_context
+                    question=chat_message,
+                    conversation_history=history_context,
+                    partial_results=True,
                 )
                 status = "success"
 
@@ -140,7 +138,10 @@ def get_answer_from_rag(
                 # Measure time for inserting the bot's response message
                 insert_response_start_time = time.time()
                 insert_message(
-                    conversation_id=str(conversation_id), sender="bot", message_content=response
+                    conversation_id=str(conversation_id),
+                    sender="bot",
+                    message_content=response,
+                    user_id=user_id,
                 )
 
                 insert_response_time_taken = time.time() - insert_response_start_time
@@ -149,10 +150,17 @@ def get_answer_from_rag(
                     f"Inserting bot response took {insert_response_time_taken:.2f} seconds."
                 )
 
+                # Fold the oldest messages into the summary outside of the answer's critical path
+                if memory.needs_summary:
+                    redis_queues.get_queue(app.config["REDIS_QUEUE_DEFAULT"]).enqueue(
+                        summarize_conversation, conversation_id
+                    )
+
                 json_data = {
                     "answer": response,
                     "status": status,
                     "conversation_id": conversation_id,
+                    "timed_out_sources": llm.timed_out_datasources,
                 }
 
             except Exception as e:
@@ -175,6 +183,23 @@ def get_answer_from_rag(
         return json_data
 
 
+def summarize_conversation(conversation_id: str) -> None:
+    """Fold the oldest messages of a conversation into its rolling summary."""
+    from app.factory import create_app
+
+    app = create_app()
+    with app.app_context():
+        with start_transaction(name="summarize_conversation", op="rq.task"):
+            try:
+                memory = ConversationMemory(
+                    conversation_id, token_budget=app.config["LORELAI_CHAT_HISTORY_TOKENS"]
+                )
+                memory.summarize()
+            except Exception as e:
+                capture_exception(e)
+                logging.error(f"Error in summarize_conversation: {str(e)}", exc_info=True)
+
+
 def run_indexer(
     organisation: OrganisationSchema,
     users: list[UserSchema],
@@ -69,6 +69,16 @@ class Config:
     REDIS_QUEUE_INDEXER = os.environ.get("REDIS_QUEUE_INDEXER", "indexer_queue")
     REDIS_QUEUE_QUESTION = os.environ.get("REDIS_QUEUE_QUESTION", "question_queue")
     REDIS_QUEUE_DEFAULT = os.environ.get("REDIS_QUEUE_DEFAULT", "default")
+    # Connection pool of the web tier, per process. Waiting chat requests hold a connection.
+    REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 200))
+    # Connections for requests waiting for a job, kept apart from the pool above
+    REDIS_WAIT_MAX_CONNECTIONS = int(os.environ.get("REDIS_WAIT_MAX_CONNECTIONS", 50))
+    REDIS_POOL_TIMEOUT = float(os.environ.get("REDIS_POOL_TIMEOUT", 5))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", 30))
+    REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 60))
+    # Seconds the read-mostly lookups (config, roles, users) are cached in Redis and in process
+    CACHE_TTL = int(os.environ.get("CACHE_TTL", 300))
+    CACHE_LOCAL_TTL = int(os.environ.get("CACHE_LOCAL_TTL", 30))
 
     # Lorelai settings
     LORELAI_ENVIRONMENT = os.environ.get("LORELAI_ENVIRONMENT")
@@ -76,14 +86,39 @@ class Config:
     LORELAI_REDIRECT_URI = os.environ.get("LORELAI_REDIRECT_URI")
     LORELAI_MODEL_TYPE = os.environ.get("LORELAI_MODEL_TYPE")
     LORELAI_CHAT_TASK_TIMEOUT = int(os.environ.get("LORELAI_CHAT_TASK_TIMEOUT"))
+    # Maximum number of seconds a request waits for a chat job, below the gunicorn timeout
+    LORELAI_CHAT_WAIT_TIMEOUT = int(os.environ.get("LORELAI_CHAT_WAIT_TIMEOUT", 25))
+    # Token budget of the recent messages in the chat prompt, older messages are summarized
+    LORELAI_CHAT_HISTORY_TOKENS = int(os.environ.get("LORELAI_CHAT_HISTORY_TOKENS", 2000))
     LORELAI_SUPPORT_PORTAL = os.environ.get("LORELAI_SUPPORT_PORTAL")
     LORELAI_SUPPORT_EMAIL = os.environ.get("LORELAI_SUPPORT_EMAIL")
     LORELAI_RERANKER = os.environ.get("LORELAI_RERANKER")
 
+    # Retrieval settings (seconds). The per-datasource budgets fall back to the generic one.
+    LORELAI_RETRIEVAL_TIMEOUT = float(os.environ.get("LORELAI_RETRIEVAL_TIMEOUT", 15))
+    LORELAI_RETRIEVAL_TIMEOUT_SLACK = float(
+        os.environ.get("LORELAI_RETRIEVAL_TIMEOUT_SLACK", LORELAI_RETRIEVAL_TIMEOUT)
+    )
+    LORELAI_RETRIEVAL_TIMEOUT_GOOGLE_DRIVE = float(
+        os.environ.get("LORELAI_RETRIEVAL_TIMEOUT_GOOGLE_DRIVE", LORELAI_RETRIEVAL_TIMEOUT)
+    )
+    # Upper bound of the retrieval of a question, including the time waiting for a worker
+    LORELAI_RETRIEVAL_TOTAL_TIMEOUT = float(
+        os.environ.get("LORELAI_RETRIEVAL_TOTAL_TIMEOUT", 2 * LORELAI_RETRIEVAL_TIMEOUT)
+    )
+    LORELAI_RETRIEVAL_MAX_WORKERS = int(os.environ.get("LORELAI_RETRIEVAL_MAX_WORKERS", 8))
+
     # Embeddings settings
     EMBEDDINGS_MODEL = os.environ.get("EMBEDDINGS_MODEL")
     EMBEDDINGS_CHUNK_SIZE = int(os.environ.get("EMBEDDINGS_CHUNK_SIZE"))
+    # Used by the document processors and the indexing pipeline alike, documents are chunked once
+    EMBEDDINGS_CHUNK_OVERLAP = int(os.environ.get("EMBEDDINGS_CHUNK_OVERLAP", 200))
+    # Number of chunks embedded, deduplicated and upserted together while indexing
+    EMBEDDINGS_BATCH_SIZE = int(os.environ.get("EMBEDDINGS_BATCH_SIZE", 100))
     EMBEDDINGS_DIMENSION = get_embedding_dimension(EMBEDDINGS_MODEL)
+    # The full chunk text is kept in the chunk text store, Pinecone only gets a preview which is
+    # used for reranking (the reranker truncates long passages anyway).
+    EMBEDDINGS_TEXT_PREVIEW_CHARS = int(os.environ.get("EMBEDDINGS_TEXT_PREVIEW_CHARS", 1000))
 
     # SendGrid settings
     SENDGRID_API_KEY = os.environ.get("SENDGRID_API_KEY")
@@ -10,6 +10,8 @@ from langchain.schema import Document
 
 from lorelai.pinecone import PineconeHelper
 
+from app.helpers.acl_groups import get_user_acl_group_ids
+
 import importlib
 import logging
 
@@ -32,6 +34,7 @@ class LorelaiContextRetrievalResponse(BaseModel):
 
     datasource_name: str
     context: list[LorelaiContextDocument]
+    timed_out: bool = False
 
 
 class ContextRetriever:
@@ -45,6 +48,7 @@ class ContextRetriever:
     """
 
     _allowed = False  # Flag to control constructor access
+    datasource_name: str = ""  # Human readable datasource name, set by the derived classes
 
     def __init__(
         self, org_name: str, user_email: str, environment: str, environment_slug: str, reranker: str
@@ -72,6 +76,17 @@ class ContextRetriever:
         self.environment_slug: str = environment_slug
         self.reranker: str = reranker
 
+        # The ACL groups the user is a member of, resolved once so retrieve_context (which may
+        # run in a worker thread) doesn't need the database
+        self.acl_group_ids: list[str] = []
+        if self.datasource_name:
+            self.acl_group_ids = get_user_acl_group_ids(
+                user_email=user_email, org_name=org_name, datasource_name=self.datasource_name
+            )
+
+        # Latency budget in seconds for retrieve_context, None means wait indefinitely
+        self.retrieval_timeout: float | None = None
+
     @staticmethod
     def create(
         retriever_type: str,
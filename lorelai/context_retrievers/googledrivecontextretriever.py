@@ -28,6 +28,8 @@ from app.helpers.datasources import DATASOURCE_GOOGLE_DRIVE
 class GoogleDriveContextRetriever(ContextRetriever):
     """Context retriever which retrieves context ie vectors stored in Google drive index."""
 
+    datasource_name = DATASOURCE_GOOGLE_DRIVE
+
     def __init__(
         self, org_name: str, user_email: str, environment: str, environment_slug: str, reranker: str
     ):
@@ -87,7 +89,10 @@ class GoogleDriveContextRetriever(ContextRetriever):
 
         retriever = vec_store.as_retriever(
             search_type="similarity",
-            search_kwargs={"k": 10, "filter": {"users": {"$eq": self.user_email}}},
+            search_kwargs={
+                "k": 10,
+                "filter": PineconeHelper.get_acl_filter(self.user_email, self.acl_group_ids),
+            },
         )
 
         # Reranker takes the result from base retriever than reranks those retrieved.
@@ -29,6 +29,8 @@ from lorelai.pinecone import PineconeHelper
 class SlackContextRetriever(ContextRetriever):
     """Context retriever which retrieves context ie vectors stored in Slack index."""
 
+    datasource_name = DATASOURCE_SLACK
+
     def __init__(
         self, org_name: str, user_email: str, environment: str, environment_slug: str, reranker: str
     ):
@@ -86,7 +88,10 @@ class SlackContextRetriever(ContextRetriever):
 
         retriever = vec_store.as_retriever(
             search_type="similarity",
-            search_kwargs={"k": 10, "filter": {"users": {"$eq": self.user_email}}},
+            search_kwargs={
+                "k": 10,
+                "filter": PineconeHelper.get_acl_filter(self.user_email, self.acl_group_ids),
+            },
         )
 
         ranker = Reranker(model_name=self.reranker, model_type="flashrank", verbose=1)
@@ -0,0 +1,192 @@
+"""Conversation memory for the chat prompts.
+
+The prompt gets the rolling summary of the earlier conversation, stored on the ChatConversation,
+and a window of the most recent messages within a token budget. Only the messages after the
+summary are fetched, at most MAX_FETCHED_MESSAGES, so the history costs the same whatever the
+length of the conversation.
+
+When the messages after the summary exceed the budget, the oldest of them are folded into the
+summary (in a background job, see summarize_conversation in app/tasks.py) until the remaining
+messages take up half of the budget. The summary is therefore updated every few turns, and each
+update only reads the previous summary and the messages being folded. When more than
+MAX_FETCHED_MESSAGES messages are waiting, the oldest MAX_FETCHED_MESSAGES are folded at a time, so
+no message is left out of the summary.
+"""
+
+import logging
+from collections.abc import Callable
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.database import db
+from app.helpers.chat import get_latest_conversation_messages, get_oldest_conversation_messages
+from app.models.chat import ChatConversation, ChatMessage
+
+DEFAULT_HISTORY_TOKEN_BUDGET = 2000
+# Upper bound of the messages read per turn and folded into the summary at once, the prompt leaves
+# out older unsummarized messages until they are folded
+MAX_FETCHED_MESSAGES = 50
+# Rough token estimate, the history budget doesn't need the exact tokenizer of the model
+CHARS_PER_TOKEN = 4
+
+_SUMMARY_PROMPT = """Update the summary of a conversation between a user and Lorelai, an AI
+assistant answering questions about the user's documents. Keep the facts, names, decisions and
+open questions the rest of the conversation may refer to. Answer with the updated summary only,
+in at most {max_words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Return an estimate of the number of tokens of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def format_message(message: ChatMessage) -> str:
+    """Format a message as a line of the conversation history."""
+    role = "User" if message.sender == "user" else "Assistant"
+    return f"{role}: {message.message_content}\n"
+
+
+class ConversationMemory:
+    """The history of a conversation to include in a prompt.
+
+    Parameters
+    ----------
+    conversation_id : str
+        The ID of the conversation
+    token_budget : int
+        The maximum number of tokens of the recent messages in the prompt, the summary takes at
+        most half of this on top
+    """
+
+    def __init__(
+        self, conversation_id: str, token_budget: int = DEFAULT_HISTORY_TOKEN_BUDGET
+    ) -> None:
+        self.conversation_id = conversation_id
+        self.token_budget = token_budget
+        self.needs_summary = False
+
+    def _load(self) -> tuple[ChatConversation | None, list[ChatMessage]]:
+        conversation = db.session.get(ChatConversation, self.conversation_id)
+        if conversation is None:
+            return None, []
+        messages = get_latest_conversation_messages(
+            self.conversation_id, MAX_FETCHED_MESSAGES, conversation.summarized_until
+        )
+        return conversation, messages
+
+    def _split(self, messages: list[ChatMessage], budget: int) -> int:
+        """Return the index of the oldest message of the newest messages fitting the budget."""
+        tokens = 0
+        for index in range(len(messages) - 1, -1, -1):
+            tokens += estimate_tokens(format_message(messages[index]))
+            if tokens > budget:
+                return index + 1
+        return 0
+
+    def get_context(self) -> str:
+        """Return the conversation history for the prompt.
+
+        Also sets needs_summary, whether older messages should be folded into the summary.
+
+        Returns
+        -------
+        str
+            The summary and the recent messages, empty for a new conversation
+        """
+        conversation, messages = self._load()
+        if conversation is None:
+            return ""
+
+        start = self._split(messages, self.token_budget)
+        window = [format_message(message) for message in messages[start:]]
+        if not window and messages:
+            # always include the last message, truncated if it doesn't fit on its own
+            window = [format_message(messages[-1])[-self.token_budget * CHARS_PER_TOKEN :]]
+        self.needs_summary = start > 0 or len(messages) >= MAX_FETCHED_MESSAGES
+
+        history_context = ""
+        if conversation.history_summary:
+            history_context += (
+                f"Summary of the earlier conversation:\n{conversation.history_summary}\n\n"
+            )
+        if window:
+            history_context += "Previous conversation:\n" + "".join(window)
+        return history_context
+
+    def summarize(self, summarizer: Callable[[str], str] | None = None) -> bool:
+        """Fold the messages which don't fit half of the budget into the rolling summary.
+
+        When more than MAX_FETCHED_MESSAGES messages follow the summary, the oldest
+        MAX_FETCHED_MESSAGES of them are folded, the next summary folds the following ones.
+
+        Parameters
+        ----------
+        summarizer : Callable[[str], str] | None
+            Function returning the completion of a prompt, defaults to the OpenAI model of the
+            app
+
+        Returns
+        -------
+        bool
+            True if the summary was updated
+        """
+        conversation = db.session.get(ChatConversation, self.conversation_id)
+        if conversation is None:
+            return False
+        # one message more than the limit tells whether there are newer messages
+        messages = get_oldest_conversation_messages(
+            self.conversation_id, MAX_FETCHED_MESSAGES + 1, conversation.summarized_until
+        )
+        if len(messages) > MAX_FETCHED_MESSAGES:
+            folded = messages[:MAX_FETCHED_MESSAGES]
+        else:
+            folded = messages[: self._split(messages, self.token_budget // 2)]
+        if not folded:
+            return False
+
+        summarizer = summarizer or _openai_summarizer
+        max_words = self.token_budget * 3 // 8
+        summary = summarizer(
+            _SUMMARY_PROMPT.format(
+                max_words=max_words,
+                summary=conversation.history_summary or "(none)",
+                messages="".join(format_message(message) for message in folded),
+            )
+        ).strip()
+        # the summary never takes more than half of the budget
+        summary = summary[: self.token_budget // 2 * CHARS_PER_TOKEN]
+
+        try:
+            # only update if no other job updated the summary in the meantime
+            updated = ChatConversation.query.filter_by(
+                conversation_id=self.conversation_id,
+                summarized_until=conversation.summarized_until,
+            ).update(
+                {"history_summary": summary, "summarized_until": folded[-1].message_id},
+                synchronize_session=False,
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Error updating the summary of {self.conversation_id}: {e}")
+            raise
+        logging.info(
+            f"Folded {len(folded)} messages into the summary of {self.conversation_id}: "
+            f"{bool(updated)}"
+        )
+        return bool(updated)
+
+
+def _openai_summarizer(prompt: str) -> str:
+    from langchain_openai import ChatOpenAI
+
+    model = ChatOpenAI(model=current_app.config["OPENAI_MODEL"])
+    return model.invoke(prompt).content
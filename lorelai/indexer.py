@@ -1,8 +1,11 @@
 """Abstract class for an indexer that indexes data into Pinecone."""
 
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from rq import job
 import importlib
+from sqlalchemy.exc import SQLAlchemyError
 from app.schemas.organisation import OrganisationSchema
 from app.schemas.user import UserSchema
 from app.schemas.user_auth import UserAuthSchema
@@ -10,6 +13,7 @@ from app.schemas.indexing import IndexingRunSchema
 from app.models.indexing import IndexingRun, IndexingRunItem
 from app.models.datasource import Datasource
 from app.database import db
+from lorelai.logging import capture_logs
 
 # The scopes needed to read documents in Google Drive
 # (see: https://developers.google.com/drive/api/guides/api-specific-auth)
@@ -57,6 +61,32 @@ class Indexer:
         """Get the datasource for this indexer. Must be implemented by derived classes."""
         raise NotImplementedError
 
+    @contextmanager
+    def capture_item_log(self, indexing_run_item_id: int) -> Iterator[None]:
+        """Capture the logs of processing an indexing run item into its item_log.
+
+        The log lines of the current thread are kept in a bounded ring buffer while the block
+        runs, and written to the item when it completes (also when it raises).
+
+        Arguments
+        ---------
+        indexing_run_item_id: int
+            The id of the indexing run item to store the logs in.
+        """
+        with capture_logs() as handler:
+            try:
+                yield
+            finally:
+                item_log = handler.getvalue()
+                try:
+                    indexing_run_item = db.session.get(IndexingRunItem, indexing_run_item_id)
+                    if indexing_run_item and item_log:
+                        indexing_run_item.item_log = item_log
+                        db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    logging.error(f"Failed to store the log of item {indexing_run_item_id}: {e}")
+
     def index_org(
         self,
         organisation: OrganisationSchema,
@@ -0,0 +1,317 @@
+"""Native Google Drive export engine.
+
+Downloads Google Drive files through the Drive API directly (files.export for Google Docs, Sheets
+and Slides, files.get with alt=media for other files) and feeds the content into the
+lorelai.processors registry. One authorized HTTP session is kept per user, so every file costs
+one metadata call plus the raw download instead of a freshly built GoogleDriveLoader.
+
+Classes:
+    GoogleDriveExportEngine: Exports Google Drive files and converts them into Langchain documents.
+"""
+
+import hashlib
+import io
+import logging
+import tempfile
+from typing import IO, Any
+
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2 import credentials
+from googleapiclient.discovery import build
+from langchain_core.documents import Document
+
+from lorelai.processors import UNCHANGED_CONTENT, ProcessorConfig, ProcessorStatus, process_file
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+SHEET_TAB_EXPORT_URL = "https://docs.google.com/spreadsheets/d/{file_id}/export"
+
+# Export targets for the native Google formats, handled by the TextProcessor and (Sheets, one
+# export per tab) the SpreadsheetProcessor
+EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.document": "text/markdown",
+    "application/vnd.google-apps.presentation": "text/plain",
+    "application/vnd.google-apps.spreadsheet": "text/csv",
+}
+
+FILE_METADATA_FIELDS = "id,name,mimeType,createdTime,modifiedTime,owners"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024
+
+
+class GoogleDriveExportEngine:
+    """Export Google Drive files and convert them into Langchain documents.
+
+    Parameters
+    ----------
+    service : Any
+        The Google Drive service instance, used for file metadata
+    credentials_object : credentials.Credentials
+        The credentials of the user, used for the authorized download session
+    config : ProcessorConfig | None
+        The processor configuration used for text extraction and chunking
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        credentials_object: credentials.Credentials,
+        config: ProcessorConfig | None = None,
+    ) -> None:
+        self.service = service
+        self.credentials_object = credentials_object
+        self.config = config or ProcessorConfig(chunk_size=2000, overlap=200)
+        self.session = AuthorizedSession(credentials_object)
+        self._sheets_service = None
+
+    def get_file_metadata(self, file_id: str) -> dict:
+        """Get the metadata of a file."""
+        return (
+            self.service.files()
+            .get(fileId=file_id, fields=FILE_METADATA_FIELDS, supportsAllDrives=True)
+            .execute()
+        )
+
+    def download_to(
+        self,
+        url: str,
+        fileobj: IO[bytes],
+        params: dict | None = None,
+        max_size: int = MAX_DOWNLOAD_SIZE,
+        digest: Any = None,
+    ) -> int:
+        """Stream a download over the authorized session into a file object.
+
+        The content is fed to digest (a hashlib hash object) as well, if given.
+
+        Returns
+        -------
+        int
+            The number of bytes written
+
+        Raises
+        ------
+        ValueError
+            If the file is not found, not accessible or larger than max_size
+        """
+        written = 0
+        with self.session.get(url, params=params, stream=True) as response:
+            if response.status_code == 404:
+                raise ValueError(f"File not found: {url}")
+            if response.status_code == 403:
+                raise ValueError(f"Insufficient permissions to download {url}")
+            response.raise_for_status()
+
+            for block in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                written += len(block)
+                if written > max_size:
+                    raise ValueError(f"File exceeds the maximum size of {max_size} bytes")
+                fileobj.write(block)
+                if digest is not None:
+                    digest.update(block)
+        return written
+
+    def download(self, url: str, params: dict | None = None) -> bytes:
+        """Stream a download over the authorized session into memory.
+
+        Raises
+        ------
+        ValueError
+            If the file is not found, not accessible or larger than MAX_DOWNLOAD_SIZE
+        """
+        buffer = io.BytesIO()
+        self.download_to(url, buffer, params=params)
+        return buffer.getvalue()
+
+    def export(self, file_id: str, mime_type: str) -> bytes:
+        """Export a Google Docs, Sheets or Slides file (files.export)."""
+        return self.download(f"{DRIVE_FILES_URL}/{file_id}/export", params={"mimeType": mime_type})
+
+    def get_media(self, file_id: str) -> bytes:
+        """Download the content of a non Google native file (files.get with alt=media)."""
+        return self.download(
+            f"{DRIVE_FILES_URL}/{file_id}", params={"alt": "media", "supportsAllDrives": "true"}
+        )
+
+    def get_media_to(self, file_id: str, fileobj: IO[bytes], max_size: int) -> int:
+        """Stream the content of a non Google native file into a file object."""
+        return self.download_to(
+            f"{DRIVE_FILES_URL}/{file_id}",
+            fileobj,
+            params={"alt": "media", "supportsAllDrives": "true"},
+            max_size=max_size,
+        )
+
+    def list_sheet_tabs(self, file_id: str) -> list[dict]:
+        """List the tabs of a spreadsheet.
+
+        Returns
+        -------
+        list[dict]
+            The properties (sheetId, title) of each tab
+        """
+        if self._sheets_service is None:
+            self._sheets_service = build("sheets", "v4", credentials=self.credentials_object)
+        spreadsheet = (
+            self._sheets_service.spreadsheets()
+            .get(spreadsheetId=file_id, fields="sheets.properties(sheetId,title)")
+            .execute()
+        )
+        return [sheet["properties"] for sheet in spreadsheet.get("sheets", [])]
+
+    def export_sheet_tab_to(
+        self, file_id: str, sheet_id: int, fileobj: IO[bytes], hash_salt: str = ""
+    ) -> str | None:
+        """Export a single spreadsheet tab as CSV into a file object.
+
+        files.export only exports the first tab, so the tab is exported through the Sheets export
+        URL instead.
+
+        Returns
+        -------
+        str | None
+            The sha256 hash of hash_salt and the export, None if the tab is empty
+        """
+        digest = hashlib.sha256(hash_salt.encode())
+        written = self.download_to(
+            SHEET_TAB_EXPORT_URL.format(file_id=file_id),
+            fileobj,
+            params={"format": "csv", "gid": sheet_id},
+            digest=digest,
+        )
+        return digest.hexdigest() if written else None
+
+    def load_spreadsheet(
+        self,
+        file_id: str,
+        metadata: dict,
+        tab_hashes: dict[int, str] | None = None,
+        hash_salt: str = "",
+    ) -> tuple[list[Document], dict[int, tuple[str, str]]]:
+        """Export the tabs of a spreadsheet and convert them into Langchain documents.
+
+        Every tab is exported to a temporary CSV file, the SpreadsheetProcessor streams its rows
+        from there. Tabs with the same export hash as in tab_hashes are not processed, they
+        result in a single placeholder document (marked with UNCHANGED_CONTENT) instead.
+
+        Parameters
+        ----------
+        file_id : str
+            The Google Drive file ID of the spreadsheet
+        metadata : dict
+            The metadata of the documents, see document_metadata
+        tab_hashes : dict[int, str] | None
+            The export hash per sheet id of the tabs indexed before
+        hash_salt : str
+            Hashed along with the exports, e.g. the ACL group the tabs are indexed for
+
+        Returns
+        -------
+        tuple[list[Document], dict[int, tuple[str, str]]]
+            The documents and, per sheet id, the name and export hash of the tabs which were
+            processed or unchanged
+        """
+        tab_hashes = tab_hashes or {}
+        documents = []
+        export_hashes = {}
+        for tab in self.list_sheet_tabs(file_id):
+            sheet_id = tab["sheetId"]
+            tab_metadata = {**metadata, "sheet_name": tab["title"]}
+            with tempfile.NamedTemporaryFile(suffix=".csv") as export_file:
+                content_hash = self.export_sheet_tab_to(file_id, sheet_id, export_file, hash_salt)
+                export_file.flush()
+                if content_hash is None:
+                    continue
+                if tab_hashes.get(sheet_id) == content_hash:
+                    logging.info(f"Skipping unchanged tab {tab['title']} of {metadata['title']}")
+                    documents.append(
+                        Document(
+                            page_content="", metadata={**tab_metadata, UNCHANGED_CONTENT: True}
+                        )
+                    )
+                    export_hashes[sheet_id] = (tab["title"], content_hash)
+                    continue
+
+                try:
+                    documents.extend(
+                        self.process(None, "text/csv", tab_metadata, file_path=export_file.name)
+                    )
+                except ValueError as e:
+                    # e.g. a tab with only a header row, the other tabs are still indexed
+                    logging.warning(f"Skipping tab {tab['title']} of {metadata['title']}: {e}")
+                    continue
+                export_hashes[sheet_id] = (tab["title"], content_hash)
+        return documents, export_hashes
+
+    def document_metadata(self, file_metadata: dict) -> dict:
+        """Return the metadata of the documents of a file, based on its Drive metadata."""
+        return {
+            "title": file_metadata.get("name", "Untitled Document"),
+            "google_drive_id": file_metadata["id"],
+            "mime_type": file_metadata.get("mimeType", ""),
+            "modifiedTime": file_metadata.get("modifiedTime", "Unknown"),
+            "google_drive_created": file_metadata.get("createdTime", "Unknown"),
+            "google_drive_owner": file_metadata.get("owners", [{"emailAddress": "Unknown"}])[0].get(
+                "emailAddress", "Unknown"
+            ),
+            "source_system": "google_drive",
+        }
+
+    def process(
+        self,
+        content: bytes | None,
+        mime_type: str,
+        metadata: dict,
+        file_path: str | None = None,
+    ) -> list[Document]:
+        """Run content through the processors registry and add the metadata to the documents.
+
+        The content is either given as bytes or as the path of a (temporary) file.
+
+        Raises
+        ------
+        ValueError
+            If no processor supports the MIME type or no text could be extracted
+        """
+        if not content and not file_path:
+            return []
+
+        result = process_file(
+            file_path=file_path, file_bytes=content, mime_type=mime_type, config=self.config
+        )
+        for log_message in result.extraction_log:
+            logging.debug(f"Export processing: {log_message}")
+        if result.status == ProcessorStatus.ERROR:
+            raise ValueError(f"Failed to extract text from {metadata['title']}: {result.message}")
+
+        for document in result.documents:
+            document.metadata.update(metadata)
+        return result.documents
+
+    def load(self, file_id: str) -> list[Document]:
+        """Export a file and convert it into Langchain documents.
+
+        Google Docs are exported as markdown, Slides as plain text and Sheets as CSV (one export
+        per tab). Other files are downloaded as is and processed based on their MIME type.
+
+        Parameters
+        ----------
+        file_id : str
+            The Google Drive file ID
+
+        Returns
+        -------
+        list[Document]
+            The documents (chunks) extracted from the file
+        """
+        file_metadata = self.get_file_metadata(file_id)
+        mime_type = file_metadata.get("mimeType", "")
+        metadata = self.document_metadata(file_metadata)
+
+        if mime_type == "application/vnd.google-apps.spreadsheet":
+            return self.load_spreadsheet(file_id, metadata)[0]
+
+        if mime_type in EXPORT_MIME_TYPES:
+            export_mime_type = EXPORT_MIME_TYPES[mime_type]
+            return self.process(self.export(file_id, export_mime_type), export_mime_type, metadata)
+
+        return self.process(self.get_media(file_id), mime_type, metadata)
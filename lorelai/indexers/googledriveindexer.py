@@ -7,8 +7,9 @@ Classes:
     GoogleDriveIndexer: Handles Google Drive document indexing using Pinecone and OpenAI.
 """
 
-import io
 import logging
+import tempfile
+from collections.abc import Iterator
 from typing import Any
 from datetime import datetime
 
@@ -20,8 +21,15 @@ from langchain_core.documents import Document
 from langchain_googledrive.document_loaders import GoogleDriveLoader
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.helpers.acl_groups import (
+    add_acl_group_members,
+    get_or_create_acl_group,
+    principals_acl_key,
+)
 from app.helpers.datasources import DATASOURCE_GOOGLE_DRIVE
+from app.helpers.extracted_texts import store_extracted_text
 from app.helpers.googledrive import get_token_details
+from app.helpers.sheet_tabs import get_sheet_tab_hashes, save_sheet_tab_hashes
 from app.models import db
 from app.models.datasource import Datasource
 from app.models.google_drive import GoogleDriveItem
@@ -33,11 +41,21 @@ from app.schemas import (
     UserAuthSchema,
 )
 from lorelai.indexer import Indexer
+from lorelai.indexers.googledriveexport import GoogleDriveExportEngine
 from lorelai.processor import Processor
-from lorelai.processors import process_file, ProcessorConfig, ProcessorStatus
+from lorelai.processors import (
+    ArchiveMember,
+    ArchiveProcessor,
+    process_file,
+    ProcessorConfig,
+    ProcessorStatus,
+)
 from lorelai.processors.errors import ProcessorError, ProcessorErrorCode
 
 ALLOWED_ITEM_TYPES = ["document", "folder", "file"]
+# Archives are downloaded into memory up to this size, larger archives spill to disk
+ARCHIVE_SPOOL_SIZE = 16 * 1024 * 1024
+ARCHIVE_MAX_DOWNLOAD_SIZE = 1024 * 1024 * 1024
 
 
 class GoogleDriveIndexer(Indexer):
@@ -49,35 +67,17 @@ class GoogleDriveIndexer(Indexer):
 
     def __init__(self) -> None:
         """Initialize the Google Drive indexer."""
-        # Create string IO to capture log messages
-        self.log_capture = io.StringIO()
-
         # Initialize service as None
         self._service = None
-
-        # Create custom handler that writes to our string buffer
-        string_handler = logging.StreamHandler(self.log_capture)
-        string_handler.setLevel(logging.INFO)  # Changed to INFO to capture all logs
-        # formatter = logging.Formatter('%(levelname)s - %(asctime)s - %(message)s')
-        # string_handler.setFormatter(formatter)
-
-        # Capture all logs
-        self.logger = logging.getLogger()
-        self.logger.addHandler(string_handler)
-        self.logger.setLevel(logging.INFO)
+        self._service_credentials = None
+        self._export_engine = None
+        # Export hashes of the loaded spreadsheet tabs, stored once the documents are indexed
+        self._sheet_tab_hashes: dict[str, dict[int, tuple[str, str]]] = {}
 
         logging.debug("GoogleDriveIndexer initialized")
         super().__init__()
         self.datasource = self._get_datasource()
 
-    def get_captured_logs(self) -> str:
-        """Get captured logs and clear the buffer."""
-        logs = self.log_capture.getvalue()
-        # Clear the buffer
-        self.log_capture.truncate(0)
-        self.log_capture.seek(0)
-        return logs
-
     def __validate_input(self, indexing_run: IndexingRunSchema) -> IndexingRun:
         """Validate input parameters and get the database model.
 
@@ -225,13 +225,13 @@ class GoogleDriveIndexer(Indexer):
             f"Processing {len(documents)} Google documents for user: {indexing_run.user.email}"
         )
 
-        # Convert documents to Langchain format and add metadata
+        # Convert documents to Langchain format and add metadata, one file at a time while they
+        # are stored
         langchain_docs = self.google_docs_to_langchain_docs(
             documents=documents,
             credentials_object=credentials_object,
             indexing_run=indexing_run,
         )
-        self.add_user_to_docs_metadata(langchain_docs, indexing_run)
 
         # Store in Pinecone
         pinecone_processor = Processor()
@@ -294,33 +294,57 @@ class GoogleDriveIndexer(Indexer):
 
             return
 
-    def add_user_to_docs_metadata(
-        self: None, langchain_docs: list[Document], indexing_run: IndexingRunSchema
-    ) -> None:
-        """Add the user to the documents.
-
-        :param langchain_docs: the list of langchain documents to add the users to
-        :param indexing_run: the indexing run to add the users to
-        """
-        if not isinstance(indexing_run, IndexingRunSchema):
-            raise TypeError(f"Expected IndexingRunSchema but got {type(indexing_run)}")
+    def get_acl_group_id(
+        self,
+        doc_google_drive_id: str,
+        credentials_object: credentials.Credentials,
+        indexing_run: IndexingRunSchema,
+        acl_groups: dict[str, str],
+    ) -> str:
+        """Get the ACL group of a Google Drive file and make the user a member of it.
 
-        # go through all docs. For each doc, see if the user is already in the metadata. If not,
-        # add the user to the metadata
-        for loaded_doc in langchain_docs:
-            logging.info(f"Checking metadata users for Google doc: {loaded_doc.metadata['title']}")
+        Files shared with the same principals (users, groups, domains or anyone with the link)
+        share an ACL group, so a user is a member of one group per distinct sharing instead of
+        one per file. The principals are the permission ids of the file, which every user with
+        access to the file can read.
 
-            # check if the user key is in the metadata
-            if "users" not in loaded_doc.metadata:
-                loaded_doc.metadata["users"] = []
+        Parameters
+        ----------
+        doc_google_drive_id : str
+            The Google Drive ID of the file
+        credentials_object : credentials.Credentials
+            The credentials object to use for Google Drive API
+        indexing_run : IndexingRunSchema
+            The indexing run of the user that has access to the file
+        acl_groups : dict[str, str]
+            The ACL group ids resolved in this run per ACL key, updated in place
 
-            # check if the user is in the metadata
-            if indexing_run.user.email not in loaded_doc.metadata["users"]:
-                logging.info(
-                    f"Adding user {indexing_run.user.email} to metadata.users for \
-{loaded_doc.metadata['title']}"
-                )
-                loaded_doc.metadata["users"].append(indexing_run.user.email)
+        Returns
+        -------
+        str
+            The ACL group id, as stored in the vector metadata
+        """
+        file_metadata = (
+            self._get_service(credentials_object)
+            .files()
+            .get(fileId=doc_google_drive_id, fields="permissionIds", supportsAllDrives=True)
+            .execute()
+        )
+        permission_ids = file_metadata.get("permissionIds")
+        if not permission_ids:
+            # falling back to another key would move the vectors between groups on every run
+            raise ValueError(f"No permissions found for Google Drive file {doc_google_drive_id}")
+
+        acl_key = principals_acl_key(permission_ids)
+        if acl_key not in acl_groups:
+            acl_group = get_or_create_acl_group(
+                org_id=indexing_run.organisation_id,
+                datasource_id=indexing_run.datasource_id,
+                acl_key=acl_key,
+            )
+            add_acl_group_members(acl_group.id, [indexing_run.user.email])
+            acl_groups[acl_key] = str(acl_group.id)
+        return acl_groups[acl_key]
 
     def _handle_google_drive_error(
         self,
@@ -378,8 +402,9 @@ class GoogleDriveIndexer(Indexer):
         :return: the list of documents loaded from Google Drive
         """
         logging.info(f"Loading generic file from Google Drive, ID: {doc_google_drive_id}")
-        loader = GoogleDriveLoader(file_ids=[doc_google_drive_id], credentials=credentials_object)
-        langchain_docs = loader.load()
+        langchain_docs = self._get_export_engine(credentials_object).load(doc_google_drive_id)
+        for doc in langchain_docs:
+            doc.metadata["source"] = f"https://drive.google.com/file/d/{doc_google_drive_id}/view"
         logging.info(f"Converted Google Drive file into {len(langchain_docs)} Langchain documents")
         return langchain_docs
 
@@ -389,13 +414,10 @@ class GoogleDriveIndexer(Indexer):
         credentials_object: credentials.Credentials,
         indexing_run: IndexingRunSchema,
     ) -> list[Document]:
-        """Load a Google Drive document from a document ID."""
+        """Load a Google Drive document from a document ID, exported as markdown."""
         logging.info(f"Loading Google Doc (document) from Drive, ID: {doc_google_drive_id}")
         try:
-            loader = GoogleDriveLoader(
-                document_ids=[doc_google_drive_id], credentials=credentials_object
-            )
-            langchain_docs = loader.load()
+            langchain_docs = self._get_export_engine(credentials_object).load(doc_google_drive_id)
             # Update source URLs
             for doc in langchain_docs:
                 doc.metadata["source"] = (
@@ -414,13 +436,10 @@ class GoogleDriveIndexer(Indexer):
         credentials_object: credentials.Credentials,
         indexing_run: IndexingRunSchema,
     ) -> list[Document]:
-        """Load a Google Slides presentation from Drive."""
+        """Load a Google Slides presentation from Drive, exported as plain text."""
         logging.info(f"Loading Google Slides presentation from Drive, ID: {doc_google_drive_id}")
         try:
-            loader = GoogleDriveLoader(
-                file_ids=[doc_google_drive_id], credentials=credentials_object
-            )
-            langchain_docs = loader.load_slides_from_id(doc_google_drive_id)
+            langchain_docs = self._get_export_engine(credentials_object).load(doc_google_drive_id)
             # Update source URLs
             for doc in langchain_docs:
                 doc.metadata["source"] = (
@@ -428,7 +447,7 @@ class GoogleDriveIndexer(Indexer):
                 )
             logging.info(
                 f"Converted Google Slides presentation into {len(langchain_docs)} Langchain \
-documents (one per slide)"
+documents"
             )
             return langchain_docs
         except Exception as e:
@@ -443,14 +462,27 @@ documents (one per slide)"
         doc_google_drive_id: str,
         credentials_object: credentials.Credentials,
         indexing_run: IndexingRunSchema,
+        acl_group: str = "",
     ) -> list[Document]:
-        """Load a Google Sheets spreadsheet from Drive."""
+        """Load a Google Sheets spreadsheet from Drive, exported as CSV per tab.
+
+        Tabs whose export didn't change since they were last indexed for the user are not
+        processed again, they result in a placeholder document without content. The export
+        hashes are stored once the documents are indexed, see update_last_indexed_for_docs.
+        The hashes include the ACL group of the spreadsheet, the tabs are indexed again when
+        its sharing changed and its vectors move to another group.
+        """
         logging.info(f"Loading Google Sheets spreadsheet from Drive, ID: {doc_google_drive_id}")
         try:
-            loader = GoogleDriveLoader(
-                file_ids=[doc_google_drive_id], credentials=credentials_object
+            engine = self._get_export_engine(credentials_object)
+            metadata = engine.document_metadata(engine.get_file_metadata(doc_google_drive_id))
+            langchain_docs, tab_hashes = engine.load_spreadsheet(
+                doc_google_drive_id,
+                metadata,
+                get_sheet_tab_hashes(indexing_run.user_id, doc_google_drive_id),
+                hash_salt=acl_group,
             )
-            langchain_docs = loader.load_sheets_from_id(doc_google_drive_id)
+            self._sheet_tab_hashes[doc_google_drive_id] = tab_hashes
             # Update source URLs
             for doc in langchain_docs:
                 doc.metadata["source"] = (
@@ -458,7 +490,7 @@ documents (one per slide)"
                 )
             logging.info(
                 f"Converted Google Sheets spreadsheet into {len(langchain_docs)} Langchain \
-documents (one per sheet)"
+documents"
             )
             return langchain_docs
         except Exception as e:
@@ -558,8 +590,8 @@ user has lost access"
             # Create processor configuration for text extraction and chunking
             logging.info("Creating processor configuration")
             config = ProcessorConfig(
-                chunk_size=2000,  # Characters per chunk
-                overlap=200,  # Character overlap between chunks
+                chunk_size=current_app.config["EMBEDDINGS_CHUNK_SIZE"],  # Characters per chunk
+                overlap=current_app.config["EMBEDDINGS_CHUNK_OVERLAP"],  # Overlap between chunks
                 custom_settings={
                     "start_page": 1,  # First PDF page to process
                     "end_page": None,  # Process all PDF pages
@@ -714,10 +746,11 @@ user has lost access"
         """
         logging.info(f"Loading Google Drive text file ID: {doc_google_drive_id}")
         try:
-            loader = GoogleDriveLoader(
-                file_ids=[doc_google_drive_id], credentials=credentials_object
-            )
-            docs_loaded = loader.load()
+            docs_loaded = self._get_export_engine(credentials_object).load(doc_google_drive_id)
+            for doc in docs_loaded:
+                doc.metadata["source"] = (
+                    f"https://drive.google.com/file/d/{doc_google_drive_id}/view"
+                )
             logging.info(f"Loaded text content from file: {doc_google_drive_id}")
             return docs_loaded
         except Exception as e:
@@ -733,6 +766,9 @@ user has lost access"
     ) -> list[Document]:
         """Load Microsoft Office files from Google Drive.
 
+        These still go through the GoogleDriveLoader: Drive can only export native Google formats
+        and there is no Office processor in lorelai.processors yet.
+
         Parameters
         ----------
         doc_google_drive_id : str
@@ -837,8 +873,13 @@ user has lost access"
         doc_google_drive_id: str,
         credentials_object: credentials.Credentials,
         indexing_run: IndexingRunSchema,
+        indexing_run_item_id: int | None = None,
     ) -> list[Document]:
-        """Load archive files (zip, rar, tar, gz) from Google Drive.
+        """Load archive files (zip, tar, gz) from Google Drive.
+
+        The archive is streamed into a spooled temporary file, which only goes to disk for large
+        archives, and its members are processed in parallel by the ArchiveProcessor. Each member
+        gets its own indexing run item, a child of the item of the archive.
 
         Parameters
         ----------
@@ -848,143 +889,238 @@ user has lost access"
             The credentials object to use for Google Drive API
         indexing_run : IndexingRunSchema
             The indexing run to add the users to
+        indexing_run_item_id : int | None
+            The ID of the indexing run item of the archive, the parent of the member items
 
         Returns
         -------
         list[Document]
-            List of documents loaded from Google Drive
+            List of documents loaded from the members of the archive
         """
         logging.info(f"Loading Google Drive archive file ID: {doc_google_drive_id}")
         try:
-            loader = GoogleDriveLoader(
-                file_ids=[doc_google_drive_id], credentials=credentials_object
+            engine = self._get_export_engine(credentials_object)
+            file_metadata = engine.get_file_metadata(doc_google_drive_id)
+            archive_name = file_metadata.get("name", doc_google_drive_id)
+            metadata = engine.document_metadata(file_metadata)
+
+            docs_loaded = []
+            extraction_log: list[str] = []
+            with tempfile.SpooledTemporaryFile(max_size=ARCHIVE_SPOOL_SIZE) as spool:
+                size = engine.get_media_to(doc_google_drive_id, spool, ARCHIVE_MAX_DOWNLOAD_SIZE)
+                logging.info(f"Downloaded archive {archive_name}: {size:,} bytes")
+
+                for member in ArchiveProcessor().process_members(
+                    spool, archive_name, engine.config, extraction_log
+                ):
+                    source = f"https://drive.google.com/file/d/{doc_google_drive_id}/view"
+                    member_docs = member.result.documents if member.result else []
+                    for doc in member_docs:
+                        doc.metadata.update(metadata)
+                        doc.metadata["title"] = f"{archive_name}/{member.name}"
+                        doc.metadata["source"] = source
+                        doc.metadata["archive_member"] = member.name
+                    docs_loaded.extend(member_docs)
+                    self.__create_archive_member_item(
+                        indexing_run, indexing_run_item_id, doc_google_drive_id, member, source
+                    )
+
+            for message in extraction_log:
+                logging.debug(f"Archive {archive_name}: {message}")
+            logging.info(
+                f"Loaded {len(docs_loaded)} documents from archive file: {doc_google_drive_id}"
             )
-            docs_loaded = loader.load()
-            logging.info(f"Loaded content from archive file: {doc_google_drive_id}")
             return docs_loaded
         except Exception as e:
             if self._handle_google_drive_error(e, doc_google_drive_id, indexing_run, "archive"):
                 return []
             raise
 
+    def __create_archive_member_item(
+        self,
+        indexing_run: IndexingRunSchema,
+        parent_item_id: int | None,
+        doc_google_drive_id: str,
+        member: ArchiveMember,
+        item_url: str,
+    ) -> None:
+        """Record the outcome of an archive member as a child indexing run item."""
+        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
+        extracted_text = member.result.extracted_text if member.result else None
+        try:
+            db.session.add(
+                IndexingRunItem(
+                    indexing_run_id=indexing_run.id,
+                    item_id=f"{doc_google_drive_id}/{member.name}"[:255],
+                    item_type="archive_member",
+                    item_name=member.name[:255],
+                    item_url=item_url,
+                    item_status=member.status,
+                    item_error=f"[{timestamp}] {member.message or member.status}",
+                    parent_item_id=parent_item_id,
+                    item_extractedtext_sha256=store_extracted_text(extracted_text)
+                    if extracted_text
+                    else None,
+                )
+            )
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.error(f"Error creating indexing run item for archive member {member.name}: {e}")
+
     def google_docs_to_langchain_docs(
         self: None,
         documents: list[dict[str, any]],
         credentials_object: credentials.Credentials,
         indexing_run: IndexingRunSchema,
-    ) -> list[Document]:
+    ) -> Iterator[Document]:
         """Convert Google Drive files into Langchain documents for processing.
 
         Takes Google Drive files and converts them into Langchain Document objects
         that can be processed and stored in Pinecone. Each file may result in
         multiple Langchain documents depending on its type and content length.
+        The documents are yielded file by file, so only the documents of the file
+        being stored are held in memory. They are tagged with the ACL group of their
+        file, see get_acl_group_id.
         """
-        langchain_docs: list[Document] = []
+        acl_groups: dict[str, str] = {}
         for doc in documents:
             doc_google_drive_id = doc["google_drive_id"]
             doc_item_type = doc["item_type"]
             doc_mime_type = doc["mime_type"]
             indexing_run_item_id = doc["indexing_run_item_id"]
+            file_langchain_docs = []  # documents created from this specific file
 
-            try:
-                if doc_item_type not in ALLOWED_ITEM_TYPES:
-                    error_msg = f"Invalid item type: {doc_item_type}"
-                    logging.error(f"{error_msg} for Google Drive file ID: {doc_google_drive_id}")
-                    self._update_indexing_run_item(indexing_run_item_id, "failed", error_msg)
-                    continue
-
-                # Match on mime type categories
-                file_langchain_docs = []  # documents created from this specific file
-                match doc_mime_type:
-                    case "application/pdf":
-                        file_langchain_docs = self.load_google_doc_from_pdf_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case "application/vnd.google-apps.document":
-                        file_langchain_docs = self.load_google_doc_from_document_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case "application/vnd.google-apps.spreadsheet":
-                        file_langchain_docs = self.load_google_doc_from_sheets_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case "application/vnd.google-apps.presentation":
-                        file_langchain_docs = self.load_google_doc_from_slides_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case mime if mime.startswith("text/"):
-                        file_langchain_docs = self.load_google_doc_from_text_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case mime if mime in [
-                        "application/msword",
-                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        "application/vnd.ms-excel",
-                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        "application/vnd.ms-powerpoint",
-                        "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                    ]:
-                        file_langchain_docs = self.load_google_doc_from_ms_office_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case mime if mime.startswith("image/"):
-                        file_langchain_docs = self.load_google_doc_from_image_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case mime if mime.startswith("video/") or mime.startswith("audio/"):
-                        file_langchain_docs = self.load_google_doc_from_media_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case mime if mime in [
-                        "application/zip",
-                        "application/x-rar-compressed",
-                        "application/x-tar",
-                        "application/gzip",
-                    ]:
-                        file_langchain_docs = self.load_google_doc_from_archive_id(
-                            doc_google_drive_id, credentials_object, indexing_run
-                        )
-                    case _:
-                        error_msg = f"Unsupported MIME type: {doc_mime_type}"
+            # the logs of processing the document are stored in the item_log of its item
+            with self.capture_item_log(indexing_run_item_id):
+                try:
+                    if doc_item_type not in ALLOWED_ITEM_TYPES:
+                        error_msg = f"Invalid item type: {doc_item_type}"
                         logging.error(
                             f"{error_msg} for Google Drive file ID: {doc_google_drive_id}"
                         )
                         self._update_indexing_run_item(indexing_run_item_id, "failed", error_msg)
                         continue
 
-                if file_langchain_docs:
-                    langchain_docs.extend(file_langchain_docs)
-                    # Update status to completed after successful processing
-                    titles = list(
-                        set([doc.metadata.get("title", "Untitled") for doc in file_langchain_docs])
+                    acl_group = self.get_acl_group_id(
+                        doc_google_drive_id, credentials_object, indexing_run, acl_groups
                     )
-                    # limit the titles to 20
-                    if len(titles) > 20:
-                        text = "First 20 titles: " + ", ".join(titles[:20]) + "..."
+
+                    # Match on mime type categories
+                    match doc_mime_type:
+                        case "application/pdf":
+                            file_langchain_docs = self.load_google_doc_from_pdf_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case "application/vnd.google-apps.document":
+                            file_langchain_docs = self.load_google_doc_from_document_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case "application/vnd.google-apps.spreadsheet":
+                            file_langchain_docs = self.load_google_doc_from_sheets_id(
+                                doc_google_drive_id, credentials_object, indexing_run, acl_group
+                            )
+                        case "application/vnd.google-apps.presentation":
+                            file_langchain_docs = self.load_google_doc_from_slides_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case mime if mime.startswith("text/"):
+                            file_langchain_docs = self.load_google_doc_from_text_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case mime if mime in [
+                            "application/msword",
+                            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                            "application/vnd.ms-excel",
+                            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            "application/vnd.ms-powerpoint",
+                            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                        ]:
+                            file_langchain_docs = self.load_google_doc_from_ms_office_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case mime if mime.startswith("image/"):
+                            file_langchain_docs = self.load_google_doc_from_image_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case mime if mime.startswith("video/") or mime.startswith("audio/"):
+                            file_langchain_docs = self.load_google_doc_from_media_id(
+                                doc_google_drive_id, credentials_object, indexing_run
+                            )
+                        case mime if mime in [
+                            "application/zip",
+                            "application/x-rar-compressed",
+                            "application/x-tar",
+                            "application/gzip",
+                            "application/x-gzip",
+                            "application/x-bzip2",
+                            "application/x-xz",
+                        ]:
+                            file_langchain_docs = self.load_google_doc_from_archive_id(
+                                doc_google_drive_id,
+                                credentials_object,
+                                indexing_run,
+                                indexing_run_item_id,
+                            )
+                        case _:
+                            error_msg = f"Unsupported MIME type: {doc_mime_type}"
+                            logging.error(
+                                f"{error_msg} for Google Drive file ID: {doc_google_drive_id}"
+                            )
+                            self._update_indexing_run_item(
+                                indexing_run_item_id, "failed", error_msg
+                            )
+                            continue
+
+                    if file_langchain_docs:
+                        for file_doc in file_langchain_docs:
+                            file_doc.metadata["acl_group"] = acl_group
+                        # Update status to completed after successful processing
+                        titles = list(
+                            set(
+                                [
+                                    doc.metadata.get("title", "Untitled")
+                                    for doc in file_langchain_docs
+                                ]
+                            )
+                        )
+                        # limit the titles to 20
+                        if len(titles) > 20:
+                            text = "First 20 titles: " + ", ".join(titles[:20]) + "..."
+                        else:
+                            text = ", ".join(titles)
+
+                        success_msg = (
+                            "Successfully converted Google Drive file into "
+                            f"{len(file_langchain_docs)} Langchain documents from {len(titles)} "
+                            f"files; {text}"
+                        )
+                        self._update_indexing_run_item(
+                            indexing_run_item_id,
+                            "completed",
+                            success_msg,
+                            extracted_text="\n\n".join(
+                                doc.page_content for doc in file_langchain_docs
+                            ),
+                        )
                     else:
-                        text = ", ".join(titles)
-
-                    success_msg = f"Successfully converted Google Drive file into \
-{len(file_langchain_docs)} Langchain documents from {len(titles)} files; {text}"
-                    self._update_indexing_run_item(
-                        indexing_run_item_id,
-                        "completed",
-                        success_msg,
-                        extracted_text="\n\n".join(doc.page_content for doc in file_langchain_docs),
+                        error_msg = (
+                            f"No content could be extracted from Google Drive {doc_item_type}"
+                        )
+                        logging.error(f"{error_msg} with ID: {doc_google_drive_id}")
+                        self._update_indexing_run_item(indexing_run_item_id, "failed", error_msg)
+
+                except Exception as e:
+                    error_msg = str(e)
+                    logging.error(
+                        f"Error processing document {doc_google_drive_id}: {error_msg}",
+                        exc_info=True,
                     )
-                else:
-                    error_msg = f"No content could be extracted from Google Drive {doc_item_type}"
-                    logging.error(f"{error_msg} with ID: {doc_google_drive_id}")
                     self._update_indexing_run_item(indexing_run_item_id, "failed", error_msg)
+                    file_langchain_docs = []
 
-            except Exception as e:
-                error_msg = str(e)
-                logging.error(
-                    f"Error processing document {doc_google_drive_id}: {error_msg}", exc_info=True
-                )
-                self._update_indexing_run_item(indexing_run_item_id, "failed", error_msg)
-
-        return langchain_docs
+            # yielded outside of the item log, the documents are stored while the generator waits
+            yield from file_langchain_docs
 
     def _update_indexing_run_item(
         self, item_id: int, status: str, message: str, extracted_text: str | None = None
@@ -1010,7 +1146,9 @@ user has lost access"
                 timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
                 indexing_run_item.item_error = f"[{timestamp}] {message}"
                 if extracted_text:
-                    indexing_run_item.item_extractedtext = extracted_text
+                    indexing_run_item.item_extractedtext_sha256 = store_extracted_text(
+                        extracted_text
+                    )
                     char_count = len(extracted_text)
                     logging.info(
                         f"Storing {char_count:,} characters of extracted text for item {item_id}"
@@ -1030,6 +1168,10 @@ user has lost access"
             logging.info(f"Updating last indexed timestamp for document: {doc_id}")
 
             try:
+                if doc_id in self._sheet_tab_hashes:
+                    save_sheet_tab_hashes(
+                        indexing_run.user_id, doc_id, self._sheet_tab_hashes.pop(doc_id)
+                    )
                 google_drive_item = GoogleDriveItem.query.filter_by(google_drive_id=doc_id).first()
                 if google_drive_item:
                     google_drive_item.last_indexed_at = db.func.now()
@@ -1057,11 +1199,42 @@ user has lost access"
         Any
             The Google Drive service instance
         """
-        if self._service is None:
+        # the indexer handles one user after the other, rebuild the service for new credentials
+        if self._service is None or self._service_credentials is not credentials_object:
             logging.debug("Creating new Google Drive service instance")
             self._service = build("drive", "v3", credentials=credentials_object)
+            self._service_credentials = credentials_object
+            self._export_engine = None
         return self._service
 
+    def _get_export_engine(
+        self, credentials_object: credentials.Credentials
+    ) -> GoogleDriveExportEngine:
+        """Get or create the export engine, which keeps one authorized HTTP session per user.
+
+        Parameters
+        ----------
+        credentials_object : credentials.Credentials
+            The credentials object to use for Google Drive API
+
+        Returns
+        -------
+        GoogleDriveExportEngine
+            The export engine for the user of the credentials
+        """
+        service = self._get_service(credentials_object)
+        if self._export_engine is None:
+            logging.debug("Creating new Google Drive export engine")
+            self._export_engine = GoogleDriveExportEngine(
+                service,
+                credentials_object,
+                ProcessorConfig(
+                    chunk_size=current_app.config["EMBEDDINGS_CHUNK_SIZE"],
+                    overlap=current_app.config["EMBEDDINGS_CHUNK_OVERLAP"],
+                ),
+            )
+        return self._export_engine
+
     def __list_files_in_folder(
         self,
         folder_id: str,
@@ -22,6 +22,14 @@ from app.schemas import (
     UserAuthSchema,
 )
 
+from app.helpers.acl_groups import (
+    acl_group_vector_id,
+    add_acl_group_members,
+    get_or_create_acl_group,
+    get_user_acl_groups,
+    remove_acl_group_member,
+)
+from app.helpers.chunk_texts import offload_vector_texts
 from app.helpers.datasources import DATASOURCE_SLACK
 from app.helpers.slack import SlackHelper
 from app.models import db
@@ -119,10 +127,53 @@ class SlackIndexer(Indexer):
             create_if_not_exists=True,
         )
 
+        offload_vector_texts(complete_chat_history)
         index.upsert(vectors=complete_chat_history)
 
         return len(complete_chat_history)
 
+    def remove_lost_channel_access(self, indexing_run: IndexingRunSchema, channel_ids: set) -> int:
+        """
+        Remove the user from the ACL groups of the channels it is no longer a member of.
+
+        The vectors of channels left without members are deleted.
+
+        Args:
+            indexing_run (IndexingRunSchema): The indexing run of the user.
+            channel_ids (set): The IDs of the channels the user currently has access to.
+
+        Returns
+        -------
+            int: The number of vectors deleted.
+        """
+        lost_acl_groups = [
+            group.id
+            for group in get_user_acl_groups(
+                user_email=indexing_run.user.email,
+                org_name=indexing_run.organisation.name,
+                datasource_name=DATASOURCE_SLACK,
+            )
+            if group.acl_key not in channel_ids
+        ]
+        empty_acl_groups = remove_acl_group_member(lost_acl_groups, indexing_run.user.email)
+        if not empty_acl_groups:
+            return 0
+
+        index, _ = self.pinecone_helper.get_index(
+            org_name=indexing_run.organisation.name,
+            datasource=DATASOURCE_SLACK,
+            environment=current_app.config["LORELAI_ENVIRONMENT"],
+            environment_slug=current_app.config["LORELAI_ENVIRONMENT_SLUG"],
+            version="v1",
+            create_if_not_exists=True,
+        )
+        count_deleted = self.pinecone_helper.delete_acl_group_vectors(index, empty_acl_groups)
+        logging.info(
+            f"{indexing_run.user.email} lost access to {len(lost_acl_groups)} Slack channels, "
+            f"deleted {count_deleted} vectors of {len(empty_acl_groups)} channels without members"
+        )
+        return count_deleted
+
     def index_user(
         self,
         indexing_run: IndexingRunSchema,
@@ -193,7 +244,22 @@ class SlackIndexer(Indexer):
                     channel_name=channel_info["name"],
                 )
 
-                # 3. Process in Batch to adhere to pinecone and OpenAI api size limit
+                # 3. record the user's channel access in the channel's ACL group, vectors carry
+                # the group id. The other members keep their access, they are only removed by
+                # their own runs (see remove_lost_channel_access)
+                acl_group = get_or_create_acl_group(
+                    org_id=indexing_run.organisation_id,
+                    datasource_id=indexing_run.datasource_id,
+                    acl_key=channel_id,
+                )
+                for message in messages:
+                    message["metadata"].pop("users", None)
+                add_acl_group_members(acl_group.id, [indexing_run.user.email])
+                for message in messages:
+                    message["id"] = acl_group_vector_id(acl_group.id)
+                    message["metadata"]["acl_group"] = str(acl_group.id)
+
+                # 4. Process in Batch to adhere to pinecone and OpenAI api size limit
                 total_items = len(messages)
                 batch_size = 1
                 logging.info(
@@ -238,6 +304,11 @@ batch_size: {batch_size}, total messages: {total_items}"
                     db.session.commit()
                 continue  # Continue with next channel instead of raising
 
+        try:
+            self.remove_lost_channel_access(indexing_run, set(channels_dict))
+        except Exception as e:
+            logging.error(f"Failed to remove lost Slack channel access: {e}")
+
         logging.info(
             f"Slack Indexer ran successfully for org {indexing_run.organisation.name}, by user \
 {indexing_run.user.email}"
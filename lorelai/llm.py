@@ -1,20 +1,65 @@
 """Module to handle interaction with different language model APIs."""
 
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 
 from flask import current_app
 
-from app.models import Datasource, User, UserAuth
+from app.helpers.chunk_texts import hydrate_context_documents
+from app.helpers.datasources import get_user_datasource_names
 from lorelai.context_retriever import ContextRetriever, LorelaiContextRetrievalResponse
 
 
+# Executor shared by all Llm instances in this process, so a question doesn't pay for spinning up
+# a new thread pool. Stragglers that blow their budget keep running here and are abandoned, once
+# they take up half of the workers the executor is retired and later questions get a new one.
+_retrieval_executor: ThreadPoolExecutor | None = None
+_retrieval_executor_lock = threading.Lock()
+# The abandoned retrievals still running on the current executor
+_abandoned_retrievals: set[Future] = set()
+
+
+def get_retrieval_executor() -> ThreadPoolExecutor:
+    """Return the process wide executor used for context retrieval, creating it if needed."""
+    global _retrieval_executor, _abandoned_retrievals
+    with _retrieval_executor_lock:
+        max_workers = int(current_app.config.get("LORELAI_RETRIEVAL_MAX_WORKERS", 8))
+        if _retrieval_executor is not None and len(_abandoned_retrievals) * 2 >= max_workers:
+            logging.warning(
+                f"{len(_abandoned_retrievals)} abandoned context retrievals are still running, "
+                "retiring the retrieval executor"
+            )
+            # the stragglers finish on the threads of the retired executor, which then exit
+            _retrieval_executor.shutdown(wait=False)
+            _retrieval_executor = None
+        if _retrieval_executor is None:
+            _retrieval_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="lorelai-retrieval"
+            )
+            _abandoned_retrievals = set()
+        return _retrieval_executor
+
+
+def abandon_retrieval(future: Future) -> None:
+    """Count a running retrieval that missed its budget against the executor until it finishes."""
+    abandoned = _abandoned_retrievals
+    with _retrieval_executor_lock:
+        abandoned.add(future)
+
+    def _finished(future: Future) -> None:
+        with _retrieval_executor_lock:
+            abandoned.discard(future)
+
+    future.add_done_callback(_finished)
+
+
 class Llm(ABC):
     """Base class for LLM interactions."""
 
-    datasources: list[LorelaiContextRetrievalResponse] = []
+    datasources: list[ContextRetriever] = []
     _prompt_template = """
         Answer the following question based on the provided context alone. In the answer, refer to
         the sources to provide evidence for the answer. Use numbered references [1], [2], [3] etc.
@@ -46,27 +91,18 @@ class Llm(ABC):
         self.user_email = user_email
         self.organisation = organisation
         self.datasources = []
+        self.timed_out_datasources: list[str] = []
         self.prompt_template = None
         self._initialize_datasources()
 
     def _initialize_datasources(self) -> None:
         """Initialize the datasources for this LLM instance."""
-        # Get user's authenticated datasources from the database
-        user = User.query.filter_by(email=self.user_email).first()
-        if not user:
+        # Get the names of the user's authenticated datasources, cached until their auths change
+        datasource_names = get_user_datasource_names(self.user_email)
+        if datasource_names is None:
             logging.error(f"User not found: {self.user_email}")
             return
-
-        # Get user's authenticated datasources
-        user_auths = (
-            UserAuth.query.join(Datasource, UserAuth.datasource_id == Datasource.datasource_id)
-            .filter(UserAuth.user_id == user.id)
-            .with_entities(Datasource.datasource_name)
-            .all()
-        )
-
-        # Get authenticated datasource names
-        authenticated_datasources = {auth[0] for auth in user_auths}
+        authenticated_datasources = set(datasource_names)
 
         # Check Slack feature flag and authentication
         if int(current_app.config["FEATURE_SLACK"]) == 1 and "Slack" in authenticated_datasources:
@@ -81,6 +117,9 @@ class Llm(ABC):
                         reranker=current_app.config["LORELAI_RERANKER"],
                     )
                 )
+                self.datasources[-1].retrieval_timeout = current_app.config.get(
+                    "LORELAI_RETRIEVAL_TIMEOUT_SLACK"
+                )
                 logging.info("Created SlackContextRetriever for authenticated user")
             except ValueError as e:
                 logging.error(f"Failed to create SlackContextRetriever: {e}")
@@ -101,12 +140,19 @@ class Llm(ABC):
                         reranker=current_app.config["LORELAI_RERANKER"],
                     )
                 )
+                self.datasources[-1].retrieval_timeout = current_app.config.get(
+                    "LORELAI_RETRIEVAL_TIMEOUT_GOOGLE_DRIVE"
+                )
                 logging.info("Created GoogleDriveContextRetriever for authenticated user")
             except ValueError as e:
                 logging.error(f"Failed to create GoogleDriveContextRetriever: {e}")
 
-
-    def get_answer(self, question: str, conversation_history: str | None = None) -> str:
+    def get_answer(
+        self,
+        question: str,
+        conversation_history: str | None = None,
+        partial_results: bool = False,
+    ) -> str:
         """Retrieve an answer to a given question based on provided context.
 
         This method is in the baseclass as it doesn't need to know which LLM is being used.
@@ -116,12 +162,17 @@ class Llm(ABC):
         Args:
             question: The question to answer
             conversation_history: Optional string containing the conversation history
+            partial_results: If True, every datasource gets its own latency budget
+                (retrieval_timeout). Datasources that miss their budget are abandoned, annotated
+                as timed out, and the answer is generated from the contexts that did arrive.
         """
-        context_list = []
         retrieve_context_time = time.time()
+        # when each retrieval started running, the budgets don't include the time spent queued
+        started_at: dict[ContextRetriever, float] = {}
 
         def retrieve_context_wrapper(datasource):
             """Wrap datasource context retrieval."""
+            started_at[datasource] = time.monotonic()
             try:
                 return datasource.retrieve_context(question=question)
             except Exception as e:
@@ -129,12 +180,15 @@ class Llm(ABC):
                 logging.error("Traceback:", exc_info=True)
                 return None
 
-        # Use ThreadPoolExecutor for multithreading
-        with ThreadPoolExecutor() as executor:
-            future_to_datasource = {
-                executor.submit(retrieve_context_wrapper, ds): ds for ds in self.datasources
-            }  # noqa: E501
+        executor = get_retrieval_executor()
+        future_to_datasource = {
+            executor.submit(retrieve_context_wrapper, ds): ds for ds in self.datasources
+        }
 
+        if partial_results:
+            context_list = self._collect_partial_contexts(future_to_datasource, started_at)
+        else:
+            context_list = []
             for future in as_completed(future_to_datasource):
                 try:
                     result = future.result()
@@ -143,6 +197,16 @@ class Llm(ABC):
                 except Exception as e:
                     logging.error(f"Exception during context retrieval: {e}")
         logging.info(f"retrieve_context took: {time.time() - retrieve_context_time}")
+
+        # Pinecone only returns a preview of each chunk, fetch the full text of the final
+        # (reranked) context documents of all datasources in one go
+        try:
+            hydrate_context_documents(
+                context_document for context in context_list for context_document in context.context
+            )
+        except Exception as e:
+            logging.error(f"Failed to load full context texts, using previews: {e}")
+
         # Ask the LLM for an answer to the question
         ask_llm_time = time.time()
         answer = self._ask_llm(
@@ -152,6 +216,82 @@ class Llm(ABC):
         logging.info(f"ASK LLM took: {end_time - ask_llm_time}")
         return answer
 
+    def _collect_partial_contexts(
+        self,
+        future_to_datasource: dict[Future, ContextRetriever],
+        started_at: dict[ContextRetriever, float],
+    ) -> list[LorelaiContextRetrievalResponse]:
+        """Collect retrieval results until every datasource finished or ran out of budget.
+
+        The budget of a datasource (retrieval_timeout) starts when its retrieval starts running,
+        not while it waits for a worker. On top of that the question as a whole gets
+        LORELAI_RETRIEVAL_TOTAL_TIMEOUT from now, which bounds the wait for retrievals queued
+        behind a saturated pool and for datasources without a retrieval_timeout. Datasources that
+        time out are cancelled if still queued, abandoned otherwise, and get an empty response
+        with timed_out set, so the LLM and the caller know the answer is based on partial context.
+
+        Args:
+            future_to_datasource: Mapping of submitted retrieval futures to their datasource
+            started_at: Monotonic start time of each retrieval, set once it runs
+
+        Returns
+        -------
+            The context responses, including the annotated timed out datasources.
+        """
+        total_timeout = current_app.config.get("LORELAI_RETRIEVAL_TOTAL_TIMEOUT")
+        question_deadline = time.monotonic() + total_timeout if total_timeout else None
+
+        def deadline(future: Future) -> float | None:
+            datasource = future_to_datasource[future]
+            deadlines = [question_deadline] if question_deadline is not None else []
+            # a queued retrieval still has its own budget ahead of it
+            if datasource.retrieval_timeout and datasource in started_at:
+                deadlines.append(started_at[datasource] + datasource.retrieval_timeout)
+            elif datasource.retrieval_timeout:
+                deadlines.append(time.monotonic() + datasource.retrieval_timeout)
+            return min(deadlines, default=None)
+
+        pending = set(future_to_datasource)
+        context_list = []
+        self.timed_out_datasources = []
+
+        while pending:
+            active_deadlines = [deadline(f) for f in pending if deadline(f) is not None]
+            timeout = (
+                max(0.0, min(active_deadlines) - time.monotonic()) if active_deadlines else None
+            )
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                    if result:
+                        context_list.append(result)
+                except Exception as e:
+                    logging.error(f"Exception during context retrieval: {e}")
+
+            now = time.monotonic()
+            expired = {f for f in pending if deadline(f) is not None and deadline(f) <= now}
+            for future in expired:
+                datasource = future_to_datasource[future]
+                # a retrieval still waiting for a worker is cancelled, a running one abandoned
+                if not future.cancel():
+                    abandon_retrieval(future)
+                logging.warning(
+                    f"Context retrieval from {datasource.datasource_name} exceeded its budget of "
+                    f"{datasource.retrieval_timeout}s or the question's budget of "
+                    f"{total_timeout}s, continuing without it"
+                )
+                self.timed_out_datasources.append(datasource.datasource_name)
+                context_list.append(
+                    LorelaiContextRetrievalResponse(
+                        datasource_name=datasource.datasource_name, context=[], timed_out=True
+                    )
+                )
+            pending -= expired
+
+        return context_list
+
     @abstractmethod
     def _ask_llm(
         self,
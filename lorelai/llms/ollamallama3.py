@@ -55,6 +55,12 @@ relevant sources used to answer the question.""",
         # concatenate all the context from the sources
         context_doc_text = ""
         for context_retrieval_response in context_list:
+            if context_retrieval_response.timed_out:
+                context_doc_text += (
+                    f"Datasource: {context_retrieval_response.datasource_name} \n"
+                    + "Note: this datasource timed out, its context is missing.\n\n"
+                )
+                continue
             for document in context_retrieval_response.context:
                 context_doc_text += (
                     f"Datasource: {context_retrieval_response.datasource_name} \n"
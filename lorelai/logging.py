@@ -3,15 +3,27 @@
 This module provides consistent logging configuration across all Lorelai components,
 including the Flask application and RQ workers.
 
+It also provides capture_logs, which captures the log records of a block of code (e.g. the
+processing of one indexing run item) in a bounded buffer.
+
 Usage:
     from lorelai.logging import configure_logging
     configure_logging()
 """
 
 import logging
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 import colorlog
 import os
 
+# Number of log lines kept by capture_logs, older lines are dropped
+DEFAULT_CAPTURE_LINES = 500
+CAPTURE_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
 
 def get_log_level() -> int:
     """Get the log level from environment variable.
@@ -94,3 +106,81 @@ def configure_logging(level=None):
 
     # Log the level we're using
     root_logger.debug("Logging configured with level: %s", logging.getLevelName(level))
+
+
+class RingBufferHandler(logging.Handler):
+    """Logging handler keeping the last records in a fixed size buffer.
+
+    Records are only formatted when the buffer is read, so the cost per log line is a deque
+    append. Records with exception info are formatted right away, so the buffer doesn't keep
+    tracebacks (and the frames they reference) alive.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of records to keep
+    level : int
+        The minimum level of the records to keep
+    thread_id : int | None
+        Only keep the records logged by this thread, None keeps the records of all threads
+    """
+
+    def __init__(self, capacity: int, level: int = logging.INFO, thread_id: int | None = None):
+        super().__init__(level)
+        self.records: deque[logging.LogRecord | str] = deque(maxlen=capacity)
+        self.thread_id = thread_id
+        self.dropped = 0
+        self.setFormatter(logging.Formatter(CAPTURE_FORMAT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Add a record to the buffer."""
+        if self.thread_id is not None and record.thread != self.thread_id:
+            return
+        if len(self.records) == self.records.maxlen:
+            self.dropped += 1
+        self.records.append(self.format(record) if record.exc_info else record)
+
+    def getvalue(self) -> str:
+        """Return the buffered log lines, noting how many older lines were dropped."""
+        lines = [
+            record if isinstance(record, str) else self.format(record) for record in self.records
+        ]
+        if self.dropped:
+            lines.insert(0, f"... {self.dropped} earlier log lines dropped")
+        return "\n".join(lines)
+
+
+@contextmanager
+def capture_logs(
+    capacity: int = DEFAULT_CAPTURE_LINES,
+    level: int = logging.INFO,
+    all_threads: bool = False,
+) -> Iterator[RingBufferHandler]:
+    """Capture the log records of a block of code in a ring buffer.
+
+    The handler is attached to the root logger for the duration of the block only, the level of
+    the root logger is left as is.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of log lines to keep
+    level : int
+        The minimum level of the records to capture
+    all_threads : bool
+        Capture the records of all threads instead of only the current thread
+
+    Yields
+    ------
+    RingBufferHandler
+        The handler, read the captured lines with getvalue()
+    """
+    handler = RingBufferHandler(
+        capacity, level, thread_id=None if all_threads else threading.get_ident()
+    )
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    try:
+        yield handler
+    finally:
+        root_logger.removeHandler(handler)
@@ -6,6 +6,16 @@ import os
 from flask import current_app
 from pinecone import ServerlessSpec, FetchResponse
 
+from app.helpers.acl_groups import (
+    MAX_FILTER_ACL_GROUPS,
+    acl_group_vector_prefix,
+    get_user_acl_groups,
+    remove_acl_group_member,
+)
+from app.helpers.chunk_texts import delete_chunk_texts
+from app.helpers.datasources import DATASOURCE_GOOGLE_DRIVE
+from app.helpers.sheet_tabs import delete_sheet_tab_hashes
+
 
 class PineconeHelper:
     """Pinecone helper class."""
@@ -243,13 +253,71 @@ class PineconeHelper:
         logging.debug(f"Total vectors processed: {len(result)}")
         return result
 
+    @staticmethod
+    def get_acl_filter(user_email: str, acl_group_ids: list[str]) -> dict:
+        """Return the metadata filter selecting the vectors a user has access to.
+
+        Vectors are matched on their ACL group. Vectors written before ACL groups existed carry
+        a list of users instead, those are matched on the user's email. A user in more than
+        MAX_FILTER_ACL_GROUPS groups raises a ValueError rather than sending a filter Pinecone
+        rejects or truncating the user's access silently.
+
+        Arguments:
+        ---------
+            user_email (str): The email of the user.
+            acl_group_ids (list[str]): The ids of the ACL groups the user is a member of.
+
+        Returns
+        -------
+            dict: The Pinecone metadata filter.
+
+        """
+        legacy_filter = {"users": {"$eq": user_email}}
+        if len(acl_group_ids) > MAX_FILTER_ACL_GROUPS:
+            raise ValueError(
+                f"{user_email} is a member of more than {MAX_FILTER_ACL_GROUPS} ACL groups, too "
+                "many to filter on"
+            )
+        if not acl_group_ids:
+            return legacy_filter
+        return {"$or": [{"acl_group": {"$in": acl_group_ids}}, legacy_filter]}
+
+    @staticmethod
+    def delete_acl_group_vectors(index: pinecone.Index, acl_group_ids: list[int]) -> int:
+        """Delete all vectors belonging to the given ACL groups.
+
+        Vectors of an ACL group share an id prefix, so they can be listed without a query.
+
+        Arguments:
+        ---------
+            index (pinecone.Index): The index to delete the vectors from.
+            acl_group_ids (list[int]): The ids of the ACL groups.
+
+        Returns
+        -------
+            int: The number of vectors deleted.
+
+        """
+        count_deleted = 0
+        for acl_group_id in acl_group_ids:
+            for vector_ids in index.list(prefix=acl_group_vector_prefix(acl_group_id)):
+                if vector_ids:
+                    index.delete(ids=vector_ids)
+                    delete_chunk_texts(vector_ids)
+                    count_deleted += len(vector_ids)
+        return count_deleted
+
     def delete_user_datasource_vectors(
         self, user_id: int, datasource_name: str, user_email: str, org_name: str
     ) -> None:
         """Delete or update vectors for a specific user and datasource from Pinecone.
 
-        If the user is the only one in the users list, the vector is deleted.
-        If there are other users, the user is removed from the users list.
+        The user is removed from all ACL groups of the datasource, which is a database operation
+        only. Vectors of groups without members left are deleted.
+
+        Vectors without an ACL group (indexed before ACL groups existed) are handled per vector:
+        if the user is the only one in the users list, the vector is deleted. If there are other
+        users, the user is removed from the users list.
 
         Args:
             user_id (int): The ID of the user whose vectors should be deleted/updated
@@ -267,7 +335,19 @@ class PineconeHelper:
                 version="v1",
             )
 
-            # First, find all vectors where this user's email is in the users list
+            # Drop the user's ACL group memberships, only empty groups need vector deletes
+            acl_groups = get_user_acl_groups(
+                user_email=user_email, org_name=org_name, datasource_name=datasource_name
+            )
+            empty_group_ids = remove_acl_group_member(
+                [group.id for group in acl_groups], user_email
+            )
+            deleted_group_vectors = self.delete_acl_group_vectors(index, empty_group_ids)
+            if datasource_name == DATASOURCE_GOOGLE_DRIVE:
+                # the user's spreadsheets are embedded again when Drive is reconnected
+                delete_sheet_tab_hashes(user_id)
+
+            # Then handle legacy vectors where this user's email is in the users list
             vector_query = index.query(
                 vector=[0.0] * int(current_app.config["PINECONE_DIMENSION"]),
                 filter={"users": {"$in": [user_email]}},
@@ -291,12 +371,15 @@ class PineconeHelper:
             # Delete vectors where this was the only user
             if vectors_to_delete:
                 index.delete(ids=vectors_to_delete)
+                delete_chunk_texts(vectors_to_delete)
 
             logging.info(
                 f"Successfully processed vectors for user {user_email} (ID: {user_id}) and "
                 f"datasource {datasource_name} in org {org_name}. "
-                f"Deleted {len(vectors_to_delete)} vectors and updated users list in "
-                f"{updated_vectors} vectors."
+                f"Left {len(acl_groups)} ACL groups, deleted {len(empty_group_ids)} empty groups "
+                f"with {deleted_group_vectors} vectors. "
+                f"Deleted {len(vectors_to_delete)} legacy vectors and updated users list in "
+                f"{updated_vectors} legacy vectors."
             )
 
         except Exception as e:
@@ -1,20 +1,22 @@
 """Contains the Processor class that processes and indexes them in Pinecone."""
 
 from flask import current_app
+import hashlib
 import itertools
 import logging
 import os
 import uuid
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 
 import numpy as np
 
 import pinecone
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
 
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from lorelai.utils import (
     get_embedding_dimension,
@@ -22,10 +24,94 @@ from lorelai.utils import (
     batch_embed_langchain_documents,
 )
 from lorelai.pinecone import PineconeHelper
+from lorelai.processors import chunk_documents
 
+from app.helpers.acl_groups import (
+    acl_group_vector_id,
+    add_acl_group_members,
+    get_user_acl_groups,
+    remove_acl_group_member,
+)
+from app.helpers.chunk_texts import delete_chunk_texts, offload_vector_texts
+from app.models import db
+from app.models.indexing import IndexingRun
 from app.schemas import IndexingRunSchema
 
 
+def chunk_key(source: str, text: str) -> str:
+    """Return the stable key of a chunk, derived from its source and content.
+
+    Vector ids are based on this key, so re-indexing an unchanged chunk overwrites its vector
+    instead of adding a duplicate.
+    """
+    return f"{source}#{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+class PipelineStats(BaseModel):
+    """Counters of the stages of the store_docs_in_pinecone pipeline."""
+
+    documents: int = 0
+    chunks: int = 0
+    embedded: int = 0
+    already_exist: int = 0
+    replaced_legacy: int = 0
+    upserted: int = 0
+    removed_access: int = 0
+    deleted: int = 0
+
+
+class ChunkRecord:
+    """A chunk that is to be stored in Pinecone, without its embedding.
+
+    The embedding is row ``row`` of the embeddings matrix of the EmbeddedChunks holding the record.
+    """
+
+    __slots__ = ("id", "source", "row", "metadata")
+
+    def __init__(self, id: str, source: str, row: int, metadata: dict):
+        self.id = id
+        self.source = source
+        self.row = row
+        self.metadata = metadata
+
+
+class EmbeddedChunks:
+    """Chunk records with their embeddings as one contiguous float32 matrix.
+
+    Selecting a subset of the records (e.g. after deduplication) shares the matrix, the
+    embeddings are only converted to lists of floats when building the upsert payload.
+    """
+
+    __slots__ = ("records", "embeddings")
+
+    def __init__(self, records: list[ChunkRecord], embeddings: np.ndarray):
+        self.records = records
+        self.embeddings = embeddings
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self.records)
+
+    def __iter__(self):
+        """Iterate over the records."""
+        return iter(self.records)
+
+    def values(self, record: ChunkRecord) -> list[float]:
+        """Return the embedding of a record as a list, as expected by the Pinecone client."""
+        return self.embeddings[record.row].tolist()
+
+    def select(self, records: list[ChunkRecord]) -> "EmbeddedChunks":
+        """Return the given subset of the records, sharing the embeddings matrix."""
+        return EmbeddedChunks(records, self.embeddings)
+
+    def to_pinecone_vectors(self, records: Iterable[ChunkRecord]) -> list[dict]:
+        """Build the Pinecone upsert payload for the given records."""
+        return [
+            {"id": record.id, "values": self.values(record), "metadata": record.metadata}
+            for record in records
+        ]
+
+
 class Processor:
     """Used to process the langchain documents and index them in Pinecone."""
 
@@ -40,90 +126,115 @@ class Processor:
 
     def pinecone_filter_deduplicate_documents_list(
         self,
-        formatted_documents: Iterable[Document],
+        formatted_documents: EmbeddedChunks,
         pc_index: pinecone.Index,
         indexing_run: IndexingRunSchema,
-    ) -> list:
+    ) -> tuple[EmbeddedChunks, int, int]:
         """Process the vectors and removes vector which exist in database.
 
-        Also tag doc metadata with new user
+        Access to vectors is granted through their ACL group (see app.helpers.acl_groups), so an
+        existing vector with an ACL group doesn't need any update. An existing vector from
+        before ACL groups (with a users list in its metadata) is replaced by the new vector, its
+        users become members of the new vector's ACL group. When the sharing of a document
+        changed, its vectors in other ACL groups are deleted and the new vectors are inserted.
 
         :param documents: the documents to process
         :param pc_index: pinecone index object
 
         :return:1. (list of documents deduplicated and filtered , ready to be inserted in pinecone)
-                2. (number of documents tagged with current user)
-                3. (number of document already exist and tagged by current user)
+                2. (number of legacy documents replaced by an ACL group document)
+                3. (number of document already exist)
         """
-        # Create a new list from the iterable to avoid modifying it while iterating
-        documents = list(formatted_documents)
         logging.info(
-            f"Checking {len(documents)} docs for dupes in Pinecone for: {indexing_run.user.email}"
+            f"Checking {len(formatted_documents)} docs for dupes in Pinecone for: \
+{indexing_run.user.email}"
         )
-        tagged_existing_doc_with_user = 0
-        already_exist_and_tagged = 0
-        # Check if docs exist in pinecone.
-        # Create a list to store documents to remove to avoid modifying list during iteration
-        docs_to_remove = []
-        for doc in documents:
-            # doc["metadata"]["users"]=["newuser.com"]
+        replaced_legacy_docs = 0
+        already_exist = 0
+        legacy_vector_ids = []
+        moved_sources = set()
+        moved_vector_ids = []
+        # Check if docs exist in pinecone, keep the ones which don't
+        documents = []
+        for doc in formatted_documents:
             result = pc_index.query(
-                vector=doc["values"],
+                vector=formatted_documents.values(doc),
                 top_k=1,
                 include_metadata=True,
-                filter={"source": doc["metadata"]["source"]},
+                filter={"source": doc.source},
             )
             # Check if we got matches from query result
             if len(result["matches"]) > 0:
+                match = result["matches"][0]
+                acl_group = doc.metadata.get("acl_group")
+                match_acl_group = match["metadata"].get("acl_group")
+                if acl_group and match_acl_group and match_acl_group != acl_group:
+                    # the sharing changed, the document moves to the ACL group of its new sharing
+                    if doc.source not in moved_sources:
+                        moved_sources.add(doc.source)
+                        moved_vector_ids.extend(
+                            self._other_acl_group_vector_ids(
+                                pc_index, formatted_documents.values(doc), doc.source, acl_group
+                            )
+                        )
                 # Check if the vector is already in the database
-                if (
-                    result["matches"][0]["score"] >= 0.99
-                    and result["matches"][0]["metadata"]["source"] == doc["metadata"]["source"]
-                ):
-                    # Check if doc already tag for this users
-                    if indexing_run.user.email in result["matches"][0]["metadata"]["users"]:
+                elif match["score"] >= 0.99 and match["metadata"]["source"] == doc.source:
+                    if match["metadata"].get("acl_group") or "acl_group" not in doc.metadata:
                         logging.debug(
-                            f"Document {doc['metadata']['title']} already exists in Pinecone and \
-tagged by {indexing_run.user.email}, removing from list"
+                            f"Document {doc.metadata['title']} already exists in Pinecone, \
+removing from list"
                         )
-                        # Mark document for removal
-                        docs_to_remove.append(doc)
-                        already_exist_and_tagged += 1
-
-                    # if doc is not tagged for user, then we update the meta data
-                    # to include this user and we remove the doc.
-                    else:
-                        users_list = result["matches"][0]["metadata"]["users"] + [
-                            indexing_run.user.email
-                        ]
-                        logging.info(f"Tagging {doc['metadata']['title']} with {users_list}")
-                        pc_index.update(
-                            id=result["matches"][0]["id"],
-                            set_metadata={"users": users_list},
-                        )
-                        docs_to_remove.append(doc)
-                        tagged_existing_doc_with_user += 1
+                        already_exist += 1
+                        continue
 
-        logging.debug(f"Number of docs to remove because they already exist: {len(docs_to_remove)}")
-        # Remove documents after iteration is complete
-        for doc in docs_to_remove:
-            documents.remove(doc)
+                    # legacy vector, move its users to the ACL group and replace the vector
+                    add_acl_group_members(
+                        int(doc.metadata["acl_group"]), match["metadata"].get("users", [])
+                    )
+                    legacy_vector_ids.append(match["id"])
+                    replaced_legacy_docs += 1
+            documents.append(doc)
+
+        if legacy_vector_ids:
+            logging.info(f"Replacing {len(legacy_vector_ids)} legacy vectors by ACL group vectors")
+            pc_index.delete(ids=legacy_vector_ids)
+        if moved_vector_ids:
+            logging.info(
+                f"Deleting {len(moved_vector_ids)} vectors of {len(moved_sources)} documents "
+                "shared differently since they were indexed"
+            )
+            pc_index.delete(ids=moved_vector_ids)
+            delete_chunk_texts(moved_vector_ids)
 
+        logging.debug(f"Number of docs removed because they already exist: {already_exist}")
         logging.info("Completed Deduplication")
-        return documents, tagged_existing_doc_with_user, already_exist_and_tagged
+        return formatted_documents.select(documents), replaced_legacy_docs, already_exist
+
+    def _other_acl_group_vector_ids(
+        self, pc_index: pinecone.Index, vector: list[float], source: str, acl_group: str
+    ) -> list[str]:
+        """Get the ids of the vectors of a document in ACL groups other than acl_group."""
+        result = pc_index.query(
+            vector=vector,
+            top_k=10000,
+            include_metadata=False,
+            include_values=False,
+            filter={"source": source, "acl_group": {"$exists": True, "$ne": acl_group}},
+        )
+        return [match["id"] for match in result["matches"]]
 
     def pinecone_format_vectors(
         self,
         documents: Iterable[Document],
         embeddings_model: Embeddings,
         indexing_run: IndexingRunSchema,
-    ) -> list:
+    ) -> EmbeddedChunks:
         """Process the documents and format them for pinecone insert.
 
         :param docs: the documents to process
         :param embeddings_model: embeddings_model object
 
-        :return: list of documents ready to be inserted in pinecone
+        :return: the chunk records ready to be inserted in pinecone, with their embeddings
         """
         logging.info(
             f"Formatting {len(documents)} chunked docs to Pinecone format for user: \
@@ -144,50 +255,89 @@ tagged by {indexing_run.user.email}, removing from list"
             raise ValueError(f"Failed to generate embeddings: {str(e)}") from e
 
         # prepare pinecone vectors
-        formatted_documents = []
-        logging.info(
-            f" Number documents {len(documents)} == Number embeds {len(embeds)} \
-                == {len(embeds) == len(documents)}"
-        )
         if len(documents) != len(embeds):
             raise ValueError("Embeds length and document length mismatch")
 
-        for i in range(len(documents)):
-            temp_dict = {
-                "id": str(uuid.uuid4()),
-                "values": embeds[i],
-                "metadata": documents[i].metadata,
-            }
-
-            temp_dict["metadata"]["text"] = text_docs[i]
-            formatted_documents.append(temp_dict)
-        if len(formatted_documents) != len(documents):
-            logging.error("Formatted Doc not equal documents")
-            raise ValueError
-        logging.info(f"Formatted {len(formatted_documents)} documents for pinecone index")
-        return formatted_documents
+        records = []
+        for i, doc in enumerate(documents):
+            acl_group = doc.metadata.get("acl_group")
+            doc.metadata["text"] = text_docs[i]
+            key = chunk_key(doc.metadata["source"], text_docs[i])
+            records.append(
+                ChunkRecord(
+                    id=acl_group_vector_id(acl_group, key)
+                    if acl_group
+                    else str(uuid.uuid5(uuid.NAMESPACE_URL, key)),
+                    source=doc.metadata["source"],
+                    row=i,
+                    metadata=doc.metadata,
+                )
+            )
+        logging.info(f"Formatted {len(records)} documents for pinecone index")
+        return EmbeddedChunks(records, embeds)
 
     def remove_nolonger_accessed_documents(
         self,
-        formatted_documents: list[dict[str, any]],
+        accessible_sources: set[str],
+        accessible_acl_groups: set[int],
         pc_index: pinecone.Index,
         embedding_dimension: int,
         indexing_run: IndexingRunSchema,
     ):
         """Delete document which user no longer has access to from Pinecone.
 
+        The user is removed from the ACL groups of documents it no longer has access to, only
+        the vectors of groups left without members are deleted. Legacy vectors (with a users
+        list in their metadata) are updated or deleted one by one.
+
         Arguments
         ---------
-            :param formatted_documents: document user currently have access to
+            :param accessible_sources: sources of the documents the user currently has access to
+            :param accessible_acl_groups: ACL groups of those documents
             :param pc_index: pinecone index object
             :param embedding_dimension: embedding model dimension
 
         Returns
         -------
-            :return: None
+            :return: number of documents the user lost access to, number of vectors deleted
 
         """
         logging.info("Removing docs which user doesn't have access to.")
+        user_acl_groups = get_user_acl_groups(
+            user_email=indexing_run.user.email,
+            org_name=indexing_run.organisation.name,
+            datasource_name=indexing_run.datasource.datasource_name,
+        )
+        # the spreadsheet tab hashes include the ACL group, a spreadsheet is embedded again when
+        # the user regains access after its group was deleted
+        lost_acl_groups = [
+            group.id for group in user_acl_groups if group.id not in accessible_acl_groups
+        ]
+        empty_acl_groups = remove_acl_group_member(lost_acl_groups, indexing_run.user.email)
+        group_count_deleted = self.pinecone_helper.delete_acl_group_vectors(
+            pc_index, empty_acl_groups
+        )
+        logging.info(
+            f"{indexing_run.user.email} lost access to {len(lost_acl_groups)} ACL groups, deleted \
+{group_count_deleted} vectors of {len(empty_acl_groups)} ACL groups without members"
+        )
+
+        count_updated, count_deleted = self._remove_nolonger_accessed_legacy_documents(
+            accessible_sources, pc_index, embedding_dimension, indexing_run
+        )
+        return (
+            count_updated + len(lost_acl_groups) - len(empty_acl_groups),
+            count_deleted + group_count_deleted,
+        )
+
+    def _remove_nolonger_accessed_legacy_documents(
+        self,
+        accessible_sources: set[str],
+        pc_index: pinecone.Index,
+        embedding_dimension: int,
+        indexing_run: IndexingRunSchema,
+    ):
+        """Remove the user from legacy vectors, i.e. vectors with a users list in the metadata."""
         count_updated = 0
         count_deleted = 0
         input_vector = np.random.rand(embedding_dimension).tolist()
@@ -221,16 +371,14 @@ indexing run: {indexing_run.id}"
         )
         # Compare current doc list accessible by user to the doc in the db.
         # only keep which is not accessible by user
-        logging.info(f"FORMATTED DOC SIZE {len(formatted_documents)}")
-        for doc in formatted_documents:
-            if doc["metadata"]["source"] in db_vector_dict:
+        logging.info(f"ACCESSIBLE SOURCES {len(accessible_sources)}")
+        for source in accessible_sources:
+            if source in db_vector_dict:
                 logging.debug(
-                    f"{doc['metadata']['source']} already in pinecone index for user: \
+                    f"{source} already in pinecone index for user: \
 {indexing_run.user.email} indexing run: {indexing_run.id}"
                 )
-                logging.debug(f"Size before {len(db_vector_dict)}")
-                db_vector_dict.pop(doc["metadata"]["source"])
-                logging.debug(f"Size after {len(db_vector_dict)}")
+                db_vector_dict.pop(source)
         delete_vector_ids_list = []
         delete_vector_title_list = []
         for key in db_vector_dict:
@@ -261,6 +409,7 @@ indexing run: {indexing_run.id}"
                     as no users have access to these documents"
             )
             pc_index.delete(ids=delete_vector_ids_list)
+            delete_chunk_texts(delete_vector_ids_list)
             count_deleted = len(delete_vector_ids_list)
         else:
             count_deleted = 0
@@ -278,6 +427,12 @@ run: {indexing_run.id}"
     ) -> int:
         """Process the documents and index them in Pinecone.
 
+        The documents are streamed through the stages chunk -> embed -> dedup -> upsert one batch
+        of EMBEDDINGS_BATCH_SIZE chunks at a time. Every stage is a generator pulling from the
+        previous one, so a stage only produces the next batch once the following stages are done
+        with the current one (backpressure). Peak memory depends on the batch size, not on the
+        number of documents, and vectors become searchable as soon as their batch is upserted.
+
         Arguments
         ---------
             :param docs: the langchain documents to process
@@ -300,17 +455,14 @@ run: {indexing_run.id}"
             logging.warning("No documents to store in Pinecone")
             return 0
 
-        logging.info(f"Storing {len(docs)} documents for user: {indexing_run.user.email}")
+        logging.info(f"Storing documents for user: {indexing_run.user.email}")
 
         chunk_size = current_app.config["EMBEDDINGS_CHUNK_SIZE"]
+        batch_size = current_app.config["EMBEDDINGS_BATCH_SIZE"]
         embedding_model_name = current_app.config["EMBEDDINGS_MODEL"]
         logging.debug(f"Using chunk size: {chunk_size} and embedding model: {embedding_model_name}")
 
-        splitter = RecursiveCharacterTextSplitter(chunk_size=int(chunk_size))
-
-        # Iterate over documents and split each document's text into chunks
-        document_chunks = splitter.split_documents(docs)
-        logging.info(f"Converted {len(docs)} docs into {len(document_chunks)} Chunks")
+        chunk_overlap = current_app.config["EMBEDDINGS_CHUNK_OVERLAP"]
 
         embedding_model = OpenAIEmbeddings(model=embedding_model_name)
         embedding_dimension = get_embedding_dimension(embedding_model_name)
@@ -328,48 +480,101 @@ run: {indexing_run.id}"
         )
 
         logging.info(
-            f"Indexing {len(document_chunks)} documents in Pinecone index {index_name} \
-using embedding_model:{embedding_model_name}"
+            f"Indexing documents in Pinecone index {index_name} using embedding_model:\
+{embedding_model_name}"
         )
 
-        # Format the document for insertion
-        formatted_document_chunks = self.pinecone_format_vectors(
-            document_chunks, embedding_model, indexing_run
-        )
-        filtered_document_chunks, tagged_existing_doc_with_user, already_exist_and_tagged = (
-            self.pinecone_filter_deduplicate_documents_list(
-                formatted_document_chunks, pc_index, indexing_run
-            )
-        )
+        stats = PipelineStats()
+        # what the user has access to, needed to remove access to everything else at the end
+        accessible_sources: set[str] = set()
+        accessible_acl_groups: set[int] = set()
+
+        def chunk_stage() -> Iterator[Document]:
+            """Split the documents into chunks, one document at a time.
+
+            Documents chunked by lorelai.processors already are passed through as is. Placeholders
+            for unchanged content yield no chunks, but the user still has access to their source.
+            """
+            for doc in docs:
+                stats.documents += 1
+                accessible_sources.add(doc.metadata["source"])
+                if doc.metadata.get("acl_group"):
+                    accessible_acl_groups.add(int(doc.metadata["acl_group"]))
+                for document_chunk in chunk_documents([doc], chunk_size, chunk_overlap):
+                    stats.chunks += 1
+                    yield document_chunk
+
+        def embed_stage() -> Iterator[EmbeddedChunks]:
+            """Embed the chunks, one batch at a time."""
+            for chunk_batch in chunks(chunk_stage(), batch_size):
+                embedded_chunks = self.pinecone_format_vectors(
+                    list(chunk_batch), embedding_model, indexing_run
+                )
+                stats.embedded += len(embedded_chunks)
+                yield embedded_chunks
+
+        def dedup_stage() -> Iterator[EmbeddedChunks]:
+            """Filter out the chunks which already exist in Pinecone."""
+            for embedded_chunks in embed_stage():
+                filtered_chunks, replaced_legacy_docs, already_exist = (
+                    self.pinecone_filter_deduplicate_documents_list(
+                        embedded_chunks, pc_index, indexing_run
+                    )
+                )
+                stats.replaced_legacy += replaced_legacy_docs
+                stats.already_exist += already_exist
+                yield filtered_chunks
+
+        # upsert stage, drives the pipeline
+        for filtered_chunks in dedup_stage():
+            for chunk in chunks(filtered_chunks, 50):
+                # the embeddings only become lists of floats here, one upsert batch at a time
+                vectors = filtered_chunks.to_pinecone_vectors(chunk)
+                offload_vector_texts(vectors)
+                response = pc_index.upsert(vectors=vectors)
+                logging.debug(f"Upsert response: {response}")
+                stats.upserted += len(vectors)
+            self.report_progress(indexing_run, stats)
+
+        if stats.documents == 0:
+            logging.warning("No documents to store in Pinecone")
+            return 0
 
         count_removed_access, count_deleted = self.remove_nolonger_accessed_documents(
-            formatted_document_chunks, pc_index, embedding_dimension, indexing_run
+            accessible_sources, accessible_acl_groups, pc_index, embedding_dimension, indexing_run
         )
+        stats.removed_access = count_removed_access
+        stats.deleted = count_deleted
+        self.report_progress(indexing_run, stats)
 
-        # inserting the documents
-        if filtered_document_chunks:
-            logging.info(
-                f"Inserting {len(filtered_document_chunks)} documents in Pinecone {index_name} for \
-user: {indexing_run.user.email} indexing run: {indexing_run.id}"
-            )
-            for chunk in chunks(filtered_document_chunks, 50):
-                response = pc_index.upsert(vectors=chunk)
-                logging.debug(f"Upsert response: {response}")
-
-        logging.info(f"Total Number of langchain documents {len(docs)}")
-        logging.info(f"Total Number of document chunks, ie after chunking {len(document_chunks)}")
-        logging.info(
-            f"{already_exist_and_tagged} documents already exist / tagged in index {index_name}"
-        )
+        logging.info(f"Total Number of langchain documents {stats.documents}")
+        logging.info(f"Total Number of document chunks, ie after chunking {stats.chunks}")
+        logging.info(f"{stats.already_exist} documents already exist in index {index_name}")
         logging.info(
-            f"Added user tag to {tagged_existing_doc_with_user} documents which already exist \
-in index {index_name} for user: {indexing_run.user.email} indexing run: {indexing_run.id}"
+            f"Replaced {stats.replaced_legacy} legacy documents by ACL group documents in index \
+{index_name} for user: {indexing_run.user.email} indexing run: {indexing_run.id}"
         )
-        logging.info(f"removed user tag to {count_removed_access} documents in index {index_name}")
+        logging.info(f"Removed access to {count_removed_access} documents in index {index_name}")
         logging.info(f"Deleted {count_deleted} documents in Pinecone index {index_name}")
         logging.info(
-            f"Added {len(filtered_document_chunks)} new document chunks in index {index_name} for \
+            f"Added {stats.upserted} new document chunks in index {index_name} for \
 user: {indexing_run.user.email} indexing run: {indexing_run.id}"
         )
 
-        return len(filtered_document_chunks)
+        return stats.upserted
+
+    def report_progress(self, indexing_run: IndexingRunSchema, stats: PipelineStats) -> None:
+        """Store the pipeline counters in the progress of the run, visible while it runs.
+
+        :param indexing_run: the indexing run to update
+        :param stats: the pipeline counters
+        """
+        try:
+            indexing_run_model = IndexingRun.query.get(indexing_run.id)
+            if indexing_run_model:
+                indexing_run_model.status = "in_progress"
+                indexing_run_model.progress = stats.model_dump()
+                db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logging.warning(f"Failed to report progress for indexing run {indexing_run.id}: {e}")
@@ -14,24 +14,49 @@ Example:
     >>> print(result.extracted_text)
 
 Currently supported document types:
-- PDF files (using PyPDF2)
+- PDF files (PyPDF2, pypdfium2 or pdfminer, OCR for scanned pages)
+- Plain text based files (text, markdown, JSON, ...)
+- Spreadsheets (CSV, TSV), chunked by rows with the header repeated
+- Images of documents (OCR)
+- Archives (zip, tar, gzip), members are processed by their own processor
 """
 
 from .base_processor import BaseProcessor, ProcessorResult, ProcessorStatus
+from .archive_processor import ArchiveMember, ArchiveProcessor
+from .ocr import ImageOCRProcessor, OCRMetrics
 from .pdf_processor import PDFProcessor
+from .spreadsheet_processor import SpreadsheetProcessor
+from .text_processor import TextProcessor
+from .chunker import PRE_CHUNKED, UNCHANGED_CONTENT, chunk_documents, get_text_splitter
 from .config import ProcessorConfig
-from .registry import registry, ProcessorRegistry
+from .normalizer import normalize_for_vector, normalize_text
+from .registry import BatchStats, registry, ProcessorRegistry
 
 # Expose the process_file function at package level for convenience
 process_file = registry.process_file
+process_many = registry.process_many
 
 __all__ = [
     "BaseProcessor",
     "ProcessorResult",
     "ProcessorStatus",
     "PDFProcessor",
+    "ImageOCRProcessor",
+    "ArchiveProcessor",
+    "ArchiveMember",
+    "OCRMetrics",
+    "TextProcessor",
+    "SpreadsheetProcessor",
     "ProcessorConfig",
+    "PRE_CHUNKED",
+    "UNCHANGED_CONTENT",
+    "chunk_documents",
+    "get_text_splitter",
+    "normalize_for_vector",
+    "normalize_text",
+    "BatchStats",
     "ProcessorRegistry",
     "registry",
     "process_file",
+    "process_many",
 ]
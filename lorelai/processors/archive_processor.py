@@ -0,0 +1,394 @@
+"""Archive processor implementation for zip, tar and gzip files.
+
+The archive is read from a (seekable) file object, e.g. a SpooledTemporaryFile the download was
+streamed to, and its members are read one at a time, never extracting the whole archive. Each
+member is dispatched to the processor registered for its file type, in a bounded process pool, and
+the results are returned in archive order.
+
+Limits on the number of members, the size of a member and the total uncompressed size protect
+against archive bombs, see the archive_* settings in config.py.
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+- Archive settings: /docs/processors.md#archive-settings
+
+Example:
+    >>> from lorelai.processors import ArchiveProcessor, ProcessorConfig
+    >>> with open("reports.zip", "rb") as f:
+    ...     for member in ArchiveProcessor().process_members(f, "reports.zip", ProcessorConfig()):
+    ...         print(member.name, member.status)
+"""
+
+import gzip
+import os
+import tarfile
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import IO, final
+
+from langchain.docstore.document import Document
+from pydantic import BaseModel
+
+from .base_processor import BaseProcessor, ProcessorResult, ProcessorStatus
+from .config import ProcessorConfig
+
+ARCHIVE_MEMBER_PROCESSED = "completed"
+ARCHIVE_MEMBER_FAILED = "failed"
+ARCHIVE_MEMBER_SKIPPED = "skipped"
+
+
+class ArchiveMember(BaseModel):
+    """The outcome of processing a member of an archive."""
+
+    name: str
+    size: int
+    status: str
+    message: str | None = None
+    result: ProcessorResult | None = None
+
+
+def iter_archive_entries(
+    fileobj: IO[bytes], archive_name: str
+) -> Iterator[tuple[str, int, Callable[[int], bytes]]]:
+    """Iterate the files in an archive lazily.
+
+    Parameters
+    ----------
+    fileobj : IO[bytes]
+        The archive, a seekable binary file object
+    archive_name : str
+        The file name of the archive, used to name the member of a plain gzip file
+
+    Yields
+    ------
+    tuple[str, int, Callable[[int], bytes]]
+        The member name, its size (-1 if unknown) and a function reading at most n bytes of it
+
+    Raises
+    ------
+    ValueError
+        If the archive format is not supported
+    """
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+
+                def read_zip_member(limit: int, info: zipfile.ZipInfo = info) -> bytes:
+                    with archive.open(info) as member:
+                        return member.read(limit)
+
+                yield info.filename, info.file_size, read_zip_member
+        return
+
+    fileobj.seek(0)
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode="r:*")
+    except tarfile.TarError:
+        archive = None
+    if archive is not None:
+        with archive:
+            # iterating the archive reads the member headers one by one
+            for info in archive:
+                if not info.isfile():
+                    continue
+
+                def read_tar_member(limit: int, info: tarfile.TarInfo = info) -> bytes:
+                    with archive.extractfile(info) as member:
+                        return member.read(limit)
+
+                yield info.name, info.size, read_tar_member
+        return
+
+    fileobj.seek(0)
+    if fileobj.read(2) == b"\x1f\x8b":
+        fileobj.seek(0)
+        name = os.path.basename(archive_name)
+        name = name[:-3] if name.lower().endswith(".gz") else name
+
+        def read_gzip_member(limit: int) -> bytes:
+            fileobj.seek(0)
+            with gzip.GzipFile(fileobj=fileobj) as member:
+                return member.read(limit)
+
+        yield name, -1, read_gzip_member
+        return
+
+    raise ValueError(f"Unsupported archive format: {archive_name}")
+
+
+def process_member(
+    processor_class: type[BaseProcessor], data: bytes, config: ProcessorConfig
+) -> ProcessorResult:
+    """Process the content of an archive member (runs in the archive worker processes)."""
+    return processor_class().process(file_bytes=data, config=config)
+
+
+class ArchiveProcessor(BaseProcessor):
+    """Processor for archives (zip, tar, gzip), dispatching members to their processors."""
+
+    def __init__(self) -> None:
+        """Initialize the archive processor."""
+        super().__init__()
+
+    @classmethod
+    @final
+    def supported_extensions(cls) -> list[str]:
+        """Return the supported file extensions.
+
+        Returns
+        -------
+        list[str]
+            List of archive file extensions
+        """
+        return [".zip", ".tar", ".tgz", ".gz", ".bz2", ".xz"]
+
+    @classmethod
+    @final
+    def supported_mimetypes(cls) -> list[str]:
+        """Return the supported MIME types.
+
+        Returns
+        -------
+        list[str]
+            List of archive MIME types
+        """
+        return [
+            "application/zip",
+            "application/x-zip-compressed",
+            "application/x-tar",
+            "application/x-gtar",
+            "application/gzip",
+            "application/x-gzip",
+            "application/x-bzip2",
+            "application/x-xz",
+        ]
+
+    def process_members(
+        self,
+        fileobj: IO[bytes],
+        archive_name: str,
+        config: ProcessorConfig,
+        extraction_log: list[str] | None = None,
+    ) -> Iterator[ArchiveMember]:
+        """Process the members of an archive in parallel.
+
+        Members are read one at a time and dispatched to their processor in a process pool. At
+        most two members per worker are in flight, which bounds the memory footprint. Members
+        run with a single PDF, OCR and archive worker, the parallelism is across members. Nested
+        archives are processed up to archive_max_depth levels deep.
+
+        Parameters
+        ----------
+        fileobj : IO[bytes]
+            The archive, a seekable binary file object
+        archive_name : str
+            The file name of the archive
+        config : ProcessorConfig
+            Configuration for processing, also used for the members
+        extraction_log : list[str] | None
+            Log to append extraction messages to
+
+        Yields
+        ------
+        ArchiveMember
+            The outcome of each member, in archive order
+
+        Raises
+        ------
+        ValueError
+            If the archive format is not supported
+        """
+        from .registry import registry
+
+        extraction_log = extraction_log if extraction_log is not None else []
+        custom_settings = config.get("custom_settings", {})
+        max_members = custom_settings.get("archive_max_members", 1000)
+        max_member_size = custom_settings.get("archive_max_member_size", 50 * 1024 * 1024)
+        max_total_size = custom_settings.get("archive_max_total_size", 1024 * 1024 * 1024)
+        max_depth = custom_settings.get("archive_max_depth", 2)
+        workers = custom_settings.get("archive_workers") or os.cpu_count() or 1
+        member_config = config.model_copy(
+            update={
+                "custom_settings": {
+                    **custom_settings,
+                    "pdf_workers": 1,
+                    "ocr_workers": 1,
+                    "archive_workers": 1,
+                    "archive_max_depth": max_depth - 1,
+                }
+            }
+        )
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        pending: deque[tuple[str, int, Future | ArchiveMember]] = deque()
+        member_count = 0
+        total_size = 0
+
+        def resolve(name: str, size: int, outcome: Future | ArchiveMember) -> ArchiveMember:
+            if isinstance(outcome, ArchiveMember):
+                return outcome
+            try:
+                result = outcome.result()
+            except Exception as e:
+                return ArchiveMember(
+                    name=name, size=size, status=ARCHIVE_MEMBER_FAILED, message=str(e)
+                )
+            if result.status == ProcessorStatus.ERROR:
+                return ArchiveMember(
+                    name=name,
+                    size=size,
+                    status=ARCHIVE_MEMBER_FAILED,
+                    message=result.message,
+                    result=result,
+                )
+            return ArchiveMember(
+                name=name,
+                size=size,
+                status=ARCHIVE_MEMBER_PROCESSED,
+                message=result.message,
+                result=result,
+            )
+
+        try:
+            for name, size, read in iter_archive_entries(fileobj, archive_name):
+                member_count += 1
+                if member_count > max_members:
+                    extraction_log.append(
+                        f"Archive has more than {max_members} members, skipping the rest"
+                    )
+                    break
+
+                processor_class = registry.get_processor_for_file(file_path=name)
+                if processor_class is None or (
+                    issubclass(processor_class, ArchiveProcessor) and max_depth <= 1
+                ):
+                    pending.append(
+                        (
+                            name,
+                            size,
+                            ArchiveMember(
+                                name=name,
+                                size=size,
+                                status=ARCHIVE_MEMBER_SKIPPED,
+                                message="Unsupported file type"
+                                if processor_class is None
+                                else "Archive nested too deep",
+                            ),
+                        )
+                    )
+                elif size > max_member_size or total_size + max(size, 0) > max_total_size:
+                    pending.append(
+                        (
+                            name,
+                            size,
+                            ArchiveMember(
+                                name=name,
+                                size=size,
+                                status=ARCHIVE_MEMBER_SKIPPED,
+                                message=f"Member of {size} bytes exceeds the size limits",
+                            ),
+                        )
+                    )
+                else:
+                    # the size in the archive headers can't be trusted, read at most the limit
+                    data = read(max_member_size + 1)
+                    total_size += len(data)
+                    if len(data) > max_member_size or total_size > max_total_size:
+                        pending.append(
+                            (
+                                name,
+                                len(data),
+                                ArchiveMember(
+                                    name=name,
+                                    size=len(data),
+                                    status=ARCHIVE_MEMBER_SKIPPED,
+                                    message="Member exceeds the size limits",
+                                ),
+                            )
+                        )
+                    elif executor:
+                        pending.append(
+                            (
+                                name,
+                                len(data),
+                                executor.submit(
+                                    process_member, processor_class, data, member_config
+                                ),
+                            )
+                        )
+                    else:
+                        future = Future()
+                        try:
+                            future.set_result(process_member(processor_class, data, member_config))
+                        except Exception as e:
+                            future.set_exception(e)
+                        pending.append((name, len(data), future))
+
+                # wait for the oldest member if too many are in flight
+                while len(pending) > 2 * workers:
+                    yield resolve(*pending.popleft())
+
+            while pending:
+                yield resolve(*pending.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+    @final
+    def extract_text(
+        self,
+        input_data: str | bytes,
+        config: ProcessorConfig,
+        extraction_log: list[str],
+    ) -> tuple[list[Document], list[str]]:
+        """Extract text from the members of an archive.
+
+        Parameters
+        ----------
+        input_data : str | bytes
+            Either a file path or raw bytes of the archive
+        config : ProcessorConfig
+            Configuration for processing
+        extraction_log : list[str]
+            Log to append extraction messages to
+
+        Returns
+        -------
+        tuple[list[Document], list[str]]
+            A tuple containing:
+            - List of extracted documents (the chunks of all members)
+            - List of error messages (empty if no errors)
+        """
+        documents = []
+        errors = []
+        stats = {ARCHIVE_MEMBER_PROCESSED: 0, ARCHIVE_MEMBER_FAILED: 0, ARCHIVE_MEMBER_SKIPPED: 0}
+        try:
+            if isinstance(input_data, str):
+                fileobj = open(input_data, "rb")
+                archive_name = input_data
+            else:
+                fileobj = BytesIO(input_data)
+                archive_name = "archive"
+            with fileobj:
+                for member in self.process_members(fileobj, archive_name, config, extraction_log):
+                    stats[member.status] += 1
+                    extraction_log.append(f"Archive member {member.name}: {member.status}")
+                    if member.status == ARCHIVE_MEMBER_FAILED:
+                        errors.append(f"Error processing {member.name}: {member.message}")
+                    if member.result:
+                        for doc in member.result.documents:
+                            doc.metadata["archive_member"] = member.name
+                            documents.append(doc)
+        except Exception as e:
+            return documents, [*errors, f"Error reading archive: {str(e)}"]
+
+        self.stage_stats["archive"] = stats
+        return documents, errors
@@ -15,22 +15,21 @@ Example:
 """
 
 from abc import ABC, abstractmethod
-import unicodedata
 import hashlib
 from datetime import datetime
-import re
 import logging
 import psutil
 import os
 from enum import Enum
 from pydantic import BaseModel
 from langchain.docstore.document import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from typing import Final, TypeAlias, Any, final
 import time
 import functools
 
+from .chunker import PRE_CHUNKED, get_text_splitter, is_pre_chunked
 from .config import ProcessorConfig
+from .normalizer import count_garbage_characters, normalize_text
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -109,6 +108,8 @@ class BaseProcessor(ABC):
     def __init__(self) -> None:
         """Initialize the processor."""
         self._initialized = False
+        # Statistics of processor specific stages (e.g. OCR), added to the processing_stats
+        self.stage_stats: dict[str, Any] = {}
         self._supported_extensions = self.supported_extensions()
         self._supported_mimetypes = self.supported_mimetypes()
         self._initialized = True
@@ -203,27 +204,9 @@ class BaseProcessor(ABC):
         str
             Cleaned and normalized text
         """
-        if not text:
-            return text
-
-        # Normalize Unicode characters
-        text = unicodedata.normalize("NFKC", text)
-
-        # Remove control characters except newlines and tabs
-        text = "".join(
-            char
-            for char in text
-            if char == "\n" or char == "\t" or not unicodedata.category(char).startswith("C")
-        )
-
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
-        text = re.sub(r"\n\s*\n", "\n\n", text)
-
-        # Remove leading/trailing whitespace
-        text = text.strip()
-
-        return text
+        # NFKC normalization, control character removal and whitespace normalization, see
+        # normalizer.py
+        return normalize_text(text)
 
     @final
     @log_time
@@ -270,7 +253,7 @@ class BaseProcessor(ABC):
                 doc.page_content = text[:max_length]
 
             # Check for garbage content
-            garbage_chars = len(re.findall(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]", text))
+            garbage_chars = count_garbage_characters(text)
             if garbage_chars / len(text) > self.GARBAGE_RATIO_THRESHOLD:
                 errors.append("Content contains too many invalid characters")
                 continue
@@ -419,6 +402,7 @@ class BaseProcessor(ABC):
         extraction_log = []
         processing_stats = {}
         config = config or ProcessorConfig()
+        self.stage_stats = {}
         log_memory("Process Start")
 
         try:
@@ -526,6 +510,8 @@ class BaseProcessor(ABC):
             logger.info("Total processing time: %.2f seconds", processing_time)
             extraction_log.append(f"Total processing time: {processing_time:.2f} seconds")
 
+            processing_stats.update(self.stage_stats)
+
             # Add memory stats
             mem_usage = get_memory_usage()
             processing_stats["memory_usage_mb"] = mem_usage
@@ -650,7 +636,7 @@ class BaseProcessor(ABC):
         config: ProcessorConfig,
         extraction_log: list[str],
     ) -> list[Document]:
-        """Split documents into chunks using Langchain's text splitter.
+        """Split documents into chunks using the shared text splitter (see chunker.py).
 
         Uses RecursiveCharacterTextSplitter which is the most advanced splitter
         that tries to keep semantic units (like sentences) together.
@@ -666,15 +652,9 @@ class BaseProcessor(ABC):
             max_chunks,
         )
 
-        # Create text splitter
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=overlap,
-            length_function=len,
-            is_separator_regex=False,
-            separators=["\n\n", "\n", " ", ""],  # Optimize splitting by using common separators
-            keep_separator=False,  # Don't keep separators to reduce chunk size
-        )
+        # Get the shared text splitter, the chunks are marked as pre-chunked so the indexing
+        # pipeline doesn't split them again
+        text_splitter = get_text_splitter(chunk_size, overlap)
 
         chunked_docs = []
         for doc_idx, doc in enumerate(documents, 1):
@@ -685,6 +665,11 @@ class BaseProcessor(ABC):
                 len(doc.page_content),
             )
 
+            # Documents chunked already (e.g. archive members) are kept as is
+            if is_pre_chunked(doc):
+                chunked_docs.append(doc)
+                continue
+
             # Split the document
             try:
                 chunks = text_splitter.split_text(doc.page_content)
@@ -711,6 +696,7 @@ class BaseProcessor(ABC):
                                 "chunk": i,
                                 "total_chunks": len(chunks),
                                 "original_doc_idx": doc_idx,
+                                PRE_CHUNKED: True,
                             },
                         )
                         chunked_docs.append(new_doc)
@@ -0,0 +1,100 @@
+"""Shared text chunker for document processors and the Pinecone indexing pipeline.
+
+Documents are chunked exactly once. Processors chunk their output in BaseProcessor.chunk_text and
+mark the chunks as pre-chunked, the indexing pipeline (lorelai.processor.Processor) only splits
+documents which are not marked, using the same splitter settings.
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+
+Example:
+    >>> from lorelai.processors.chunker import chunk_documents
+    >>> chunks = list(chunk_documents(documents, chunk_size=4000, overlap=200))
+"""
+
+import functools
+from collections.abc import Iterable, Iterator
+
+from langchain.docstore.document import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+# Metadata key marking a document as a chunk, which must not be split again
+PRE_CHUNKED = "pre_chunked"
+# Metadata key marking a document as a placeholder for content which is indexed already and
+# didn't change (e.g. an unchanged spreadsheet tab), it has no text and yields no chunks
+UNCHANGED_CONTENT = "unchanged_content"
+
+
+@functools.lru_cache(maxsize=16)
+def get_text_splitter(chunk_size: int, overlap: int) -> RecursiveCharacterTextSplitter:
+    """Return the (cached) text splitter for the given settings.
+
+    Uses RecursiveCharacterTextSplitter which tries to keep semantic units (like sentences)
+    together.
+
+    Parameters
+    ----------
+    chunk_size : int
+        Maximum number of characters per chunk
+    overlap : int
+        Number of characters to overlap between chunks
+
+    Returns
+    -------
+    RecursiveCharacterTextSplitter
+        The text splitter
+    """
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=overlap,
+        length_function=len,
+        is_separator_regex=False,
+        separators=["\n\n", "\n", " ", ""],  # Optimize splitting by using common separators
+        keep_separator=False,  # Don't keep separators to reduce chunk size
+    )
+
+
+def is_pre_chunked(document: Document) -> bool:
+    """Return whether the document is a chunk already."""
+    return bool(document.metadata.get(PRE_CHUNKED))
+
+
+def is_unchanged(document: Document) -> bool:
+    """Return whether the document is a placeholder for unchanged, indexed content."""
+    return bool(document.metadata.get(UNCHANGED_CONTENT))
+
+
+def chunk_documents(
+    documents: Iterable[Document], chunk_size: int, overlap: int
+) -> Iterator[Document]:
+    """Split documents into chunks, passing through documents which are pre-chunked.
+
+    Placeholders for unchanged content (see is_unchanged) don't yield any chunks.
+
+    Parameters
+    ----------
+    documents : Iterable[Document]
+        The documents to chunk
+    chunk_size : int
+        Maximum number of characters per chunk
+    overlap : int
+        Number of characters to overlap between chunks
+
+    Yields
+    ------
+    Document
+        The chunks, marked as pre-chunked
+    """
+    text_splitter = get_text_splitter(chunk_size, overlap)
+    for document in documents:
+        if is_unchanged(document):
+            continue
+        if is_pre_chunked(document):
+            yield document
+            continue
+
+        for chunk_text in text_splitter.split_text(document.page_content):
+            yield Document(
+                page_content=chunk_text, metadata={**document.metadata, PRE_CHUNKED: True}
+            )
@@ -158,3 +158,102 @@ ProcessorConfig.register_field(
     None,
     "Last page to process. If None, process all pages.",
 )
+ProcessorConfig.register_field(
+    "pdf_backend",
+    str,
+    "pypdf2",
+    "PDF text extraction backend: pypdf2, pypdfium2, pdfminer or auto (fastest backend which "
+    "extracts text from the first pages)",
+)
+ProcessorConfig.register_field(
+    "pdf_workers",
+    int | None,
+    None,
+    "Number of processes extracting pages in parallel. If None, use the number of CPUs.",
+)
+ProcessorConfig.register_field(
+    "ocr_enabled",
+    bool,
+    True,
+    "Extract the text of PDF pages without a text layer (scans) with OCR",
+)
+ProcessorConfig.register_field(
+    "ocr_language",
+    str,
+    "eng",
+    "Tesseract language(s) for OCR, e.g. eng or eng+nld",
+)
+ProcessorConfig.register_field(
+    "ocr_dpi",
+    int,
+    300,
+    "Resolution pages are rasterized at for OCR",
+)
+ProcessorConfig.register_field(
+    "ocr_workers",
+    int | None,
+    None,
+    "Number of OCR processes (at most 4). If None, use the number of CPUs.",
+)
+ProcessorConfig.register_field(
+    "ocr_cache_dir",
+    str | None,
+    None,
+    "Directory of the OCR page cache. If None, use a directory in the temp directory. "
+    "An empty string disables the cache.",
+)
+ProcessorConfig.register_field(
+    "ocr_cache_max_size",
+    int | None,
+    1024 * 1024 * 1024,
+    "Maximum size of the OCR page cache in bytes, the least recently used pages are removed "
+    "first. If None, the size is not limited.",
+)
+ProcessorConfig.register_field(
+    "ocr_cache_max_age",
+    int | None,
+    30 * 24 * 3600,
+    "Number of seconds an unused page stays in the OCR page cache. If None, pages don't expire.",
+)
+ProcessorConfig.register_field(
+    "archive_workers",
+    int | None,
+    None,
+    "Number of processes processing archive members in parallel. If None, use the number of CPUs.",
+)
+ProcessorConfig.register_field(
+    "archive_max_members",
+    int,
+    1000,
+    "Maximum number of archive members to process, the rest is skipped",
+)
+ProcessorConfig.register_field(
+    "archive_max_member_size",
+    int,
+    50 * 1024 * 1024,
+    "Maximum uncompressed size of an archive member in bytes, larger members are skipped",
+)
+ProcessorConfig.register_field(
+    "archive_max_total_size",
+    int,
+    1024 * 1024 * 1024,
+    "Maximum total uncompressed size of the processed archive members in bytes",
+)
+ProcessorConfig.register_field(
+    "archive_max_depth",
+    int,
+    2,
+    "Maximum nesting depth of archives, 1 skips archives inside archives",
+)
+ProcessorConfig.register_field(
+    "spreadsheet_rows_per_chunk",
+    int,
+    50,
+    "Maximum number of spreadsheet rows per chunk, each chunk repeats the header row",
+)
+ProcessorConfig.register_field(
+    "pdf_pages_per_task",
+    int,
+    25,
+    "Number of pages extracted per process pool task. Smaller PDFs are extracted in process.",
+)
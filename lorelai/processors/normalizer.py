@@ -0,0 +1,104 @@
+"""Text normalization for document processors and the indexing pipeline.
+
+BaseProcessor.clean_text and lorelai.utils.clean_text_for_vector used to walk the text many times:
+a per character generator calling unicodedata.category and several regex passes, a lot of them
+matching (and replacing) every single space. This module keeps the work in C:
+
+- control characters are removed with str.translate and a table which classifies each code point
+  once and caches the result
+- whitespace is collapsed with str.split and str.join, which use the same whitespace class as the
+  regex whitespace class
+- the remaining regex passes only match what actually changes, and are skipped when they can't
+
+The output is identical to the previous implementations, tools/benchmarks/normalizer_benchmark.py
+checks this while comparing their performance.
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+
+Example:
+    >>> from lorelai.processors.normalizer import normalize_text, normalize_for_vector
+    >>> normalize_text(" Hello   world ")
+    'Hello world'
+    >>> normalize_for_vector("<p>Hello</p>   world!!!")
+    'Hello world!'
+"""
+
+import re
+import unicodedata
+from collections.abc import Callable
+
+_TAG_PATTERN = re.compile(r"<[^<]+?>")
+# All but the last character of a run of punctuation, removing it collapses the run
+_PUNCTUATION_RUN_PATTERN = re.compile(r"[!?.]+(?=[!?.])")
+# Characters counted as garbage by BaseProcessor.validate_content
+_GARBAGE_PATTERN = re.compile(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]")
+
+
+class TranslationTable(dict):
+    """A str.translate table which classifies code points lazily.
+
+    Classifying every Unicode code point up front is slow and memory hungry, so the table maps a
+    code point on first lookup and caches the result. str.translate only sees dict hits after
+    that, which keeps the per character cost in C.
+
+    Parameters
+    ----------
+    classify : Callable[[str], str | None]
+        Returns the replacement of a character, None to delete it. Returning the character itself
+        leaves it unchanged.
+    """
+
+    def __init__(self, classify: Callable[[str], str | None]) -> None:
+        super().__init__()
+        self.classify = classify
+
+    def __missing__(self, codepoint: int) -> int | str | None:
+        """Classify and cache a code point."""
+        char = chr(codepoint)
+        replacement = self.classify(char)
+        value = codepoint if replacement == char else replacement
+        self[codepoint] = value
+        return value
+
+
+def _classify_control_char(char: str) -> str | None:
+    """Drop control (Unicode category C) characters, except newlines and tabs."""
+    if char != "\n" and char != "\t" and unicodedata.category(char).startswith("C"):
+        return None
+    return char
+
+
+CONTROL_TABLE = TranslationTable(_classify_control_char)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize extracted text, see BaseProcessor.clean_text.
+
+    Applies NFKC normalization, removes control characters, collapses all whitespace (including
+    newlines and tabs) into single spaces and strips the result.
+    """
+    if not text:
+        return text
+    # control characters which are whitespace too (e.g. carriage returns) are removed before
+    # splitting, so they don't separate words
+    text = unicodedata.normalize("NFKC", text).translate(CONTROL_TABLE)
+    return " ".join(text.split())
+
+
+def normalize_for_vector(text: str) -> str:
+    """Normalize text before embedding it, see lorelai.utils.clean_text_for_vector.
+
+    Removes HTML tags, collapses all whitespace into single spaces, strips the result and
+    collapses repeated punctuation (e.g. "?!" or "...") into its last character.
+    """
+    if "<" in text:
+        text = _TAG_PATTERN.sub("", text)
+    text = " ".join(text.split())
+    return _PUNCTUATION_RUN_PATTERN.sub("", text)
+
+
+def count_garbage_characters(text: str) -> int:
+    """Count the garbage characters in the text without building a list of matches."""
+    return sum(1 for _ in _GARBAGE_PATTERN.finditer(text))
@@ -0,0 +1,452 @@
+"""OCR stage for pages and images without a text layer, using a local Tesseract.
+
+Scanned PDFs have pages without any text layer. The PDF processor hands those pages (and only
+those) to the OCREngine, which rasterizes each page and runs Tesseract on it in a bounded process
+pool. The OCR result of every page is cached on disk, keyed by a hash of the rendered page, so
+re-indexing a document doesn't OCR its pages again. The cache is pruned to ocr_cache_max_size
+and ocr_cache_max_age, least recently used pages first.
+
+The engine is also used by the ImageOCRProcessor for plain image files. Throughput metrics are
+returned per run and aggregated by the ProcessorRegistry (registry.ocr_metrics).
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+- OCR settings: /docs/processors.md#ocr-settings
+
+Example:
+    >>> from lorelai.processors import process_file, ProcessorConfig
+    >>> config = ProcessorConfig(custom_settings={"ocr_language": "eng+nld"})
+    >>> result = process_file(file_path="scan.pdf", config=config)
+    >>> print(result.processing_stats["ocr"])
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import final
+
+from langchain.docstore.document import Document
+from pydantic import BaseModel
+
+from .base_processor import BaseProcessor
+from .config import ProcessorConfig
+
+DEFAULT_OCR_CACHE_DIR = os.path.join(tempfile.gettempdir(), "lorelai-ocr-cache")
+DEFAULT_OCR_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+DEFAULT_OCR_CACHE_MAX_AGE = 30 * 24 * 3600
+# Upper bound of the OCR process pool, Tesseract is memory hungry at high DPI
+MAX_OCR_WORKERS = 4
+# Minimum number of seconds between two prunings of a cache directory by a process
+OCR_CACHE_PRUNE_INTERVAL = 600
+# Last pruning per cache directory in this process
+_last_prune: dict[str, float] = {}
+_prune_lock = threading.Lock()
+
+
+class OCRMetrics(BaseModel):
+    """Throughput metrics of the OCR stage."""
+
+    pages: int = 0
+    cache_hits: int = 0
+    failed: int = 0
+    characters: int = 0
+    seconds: float = 0.0
+
+    @property
+    def pages_per_second(self) -> float:
+        """Pages processed per second (wall clock), cache hits included."""
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "OCRMetrics") -> None:
+        """Add the metrics of another run to these metrics."""
+        self.pages += other.pages
+        self.cache_hits += other.cache_hits
+        self.failed += other.failed
+        self.characters += other.characters
+        self.seconds += other.seconds
+
+    def summary(self) -> str:
+        """Return a one line summary of the metrics."""
+        return (
+            f"OCR: {self.pages} pages ({self.cache_hits} cached, {self.failed} failed), "
+            f"{self.characters} characters in {self.seconds:.2f}s "
+            f"({self.pages_per_second:.2f} pages/s)"
+        )
+
+
+class OCRPageCache:
+    """On disk cache of OCR results, keyed by the hash of the rendered page.
+
+    Parameters
+    ----------
+    cache_dir : str | None
+        The directory of the cache, None disables caching
+    max_size : int | None
+        The maximum total size of the cached pages in bytes, None for no limit
+    max_age : int | None
+        The maximum number of seconds a page stays cached since it was last used, None for no
+        limit
+    """
+
+    def __init__(
+        self, cache_dir: str | None, max_size: int | None = None, max_age: int | None = None
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.max_age = max_age
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> str | None:
+        """Get the cached text of a page, None if not cached."""
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        try:
+            # the modification time is the last use, pruning removes the least recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        """Cache the text of a page, failures are logged and ignored."""
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temporary file first so concurrent readers never see partial results
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logging.warning(f"Failed to cache OCR result {key}: {e}")
+
+    def prune(self) -> int:
+        """Delete the pages unused for max_age and the least recently used beyond max_size.
+
+        Returns
+        -------
+        int
+            The number of deleted pages
+        """
+        if not self.cache_dir or (self.max_size is None and self.max_age is None):
+            return 0
+        entries = []
+        for directory, _, file_names in os.walk(self.cache_dir):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        total_size = sum(size for _, size, _ in entries)
+        deleted = 0
+        for mtime, size, path in sorted(entries):
+            too_old = self.max_age is not None and now - mtime > self.max_age
+            too_big = self.max_size is not None and total_size > self.max_size
+            if not too_old and not too_big:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            deleted += 1
+        if deleted:
+            logging.info(f"Pruned {deleted} pages from the OCR cache {self.cache_dir}")
+        return deleted
+
+    def prune_if_due(self) -> None:
+        """Prune the cache unless this process pruned it in the last OCR_CACHE_PRUNE_INTERVAL."""
+        if not self.cache_dir:
+            return
+        now = time.monotonic()
+        with _prune_lock:
+            last_prune = _last_prune.get(self.cache_dir)
+            if last_prune is not None and now - last_prune < OCR_CACHE_PRUNE_INTERVAL:
+                return
+            _last_prune[self.cache_dir] = now
+        try:
+            self.prune()
+        except OSError as e:
+            logging.warning(f"Failed to prune the OCR cache {self.cache_dir}: {e}")
+
+
+@functools.cache
+def ocr_available() -> bool:
+    """Return whether pytesseract and the tesseract binary are installed."""
+    try:
+        import pytesseract
+
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        logging.warning(f"OCR is not available: {e}")
+        return False
+    return True
+
+
+def page_key(image, language: str) -> str:
+    """Return the cache key of a rendered page (or image) for an OCR language."""
+    digest = hashlib.sha256(f"{language}:{image.mode}:{image.size}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def render_pdf_page(pdf_document, page_index: int, dpi: int):
+    """Rasterize a page of a pypdfium2 document into a PIL image."""
+    page = pdf_document[page_index]
+    try:
+        return page.render(scale=dpi / 72).to_pil()
+    finally:
+        page.close()
+
+
+def ocr_image(image, language: str, cache: OCRPageCache) -> tuple[str, bool]:
+    """OCR an image, using the cache.
+
+    Returns
+    -------
+    tuple[str, bool]
+        The text and whether it came from the cache
+    """
+    import pytesseract
+
+    key = page_key(image, language)
+    text = cache.get(key)
+    if text is not None:
+        return text, True
+    text = pytesseract.image_to_string(image, lang=language)
+    cache.set(key, text)
+    return text, False
+
+
+# State of the OCR worker processes, set by init_ocr_worker
+_worker_state: dict = {}
+
+
+def init_ocr_worker(
+    pdf_bytes: bytes | None, language: str, dpi: int, cache_dir: str | None
+) -> None:
+    """Open the PDF once in an OCR worker process (ProcessPoolExecutor initializer)."""
+    import pypdfium2
+
+    _worker_state.update(
+        pdf_document=pypdfium2.PdfDocument(pdf_bytes) if pdf_bytes else None,
+        language=language,
+        dpi=dpi,
+        cache=OCRPageCache(cache_dir),
+    )
+
+
+def ocr_pdf_page(page_index: int) -> tuple[int, str, bool, str | None]:
+    """Rasterize and OCR a page of the worker's PDF.
+
+    Returns
+    -------
+    tuple[int, str, bool, str | None]
+        The page index, the text, whether it came from the cache and the error (None on success)
+    """
+    try:
+        image = render_pdf_page(_worker_state["pdf_document"], page_index, _worker_state["dpi"])
+        text, cached = ocr_image(image, _worker_state["language"], _worker_state["cache"])
+    except Exception as e:
+        return page_index, "", False, str(e)
+    return page_index, text, cached, None
+
+
+class OCREngine:
+    """Rasterize pages and OCR them with Tesseract in a bounded process pool.
+
+    Parameters
+    ----------
+    config : ProcessorConfig
+        The processor configuration, the ocr_* settings are used
+    """
+
+    def __init__(self, config: ProcessorConfig) -> None:
+        custom_settings = config.get("custom_settings", {})
+        self.language = custom_settings.get("ocr_language", "eng")
+        self.dpi = custom_settings.get("ocr_dpi", 300)
+        cache_dir = custom_settings.get("ocr_cache_dir")
+        # None means the default directory, an empty string disables the cache
+        self.cache_dir = DEFAULT_OCR_CACHE_DIR if cache_dir is None else cache_dir or None
+        self.cache = OCRPageCache(
+            self.cache_dir,
+            max_size=custom_settings.get("ocr_cache_max_size", DEFAULT_OCR_CACHE_MAX_SIZE),
+            max_age=custom_settings.get("ocr_cache_max_age", DEFAULT_OCR_CACHE_MAX_AGE),
+        )
+        self.workers = min(
+            custom_settings.get("ocr_workers") or os.cpu_count() or 1, MAX_OCR_WORKERS
+        )
+
+    def ocr_pdf_pages(
+        self, pdf_bytes: bytes, page_indices: list[int]
+    ) -> tuple[dict[int, str], list[str], OCRMetrics]:
+        """OCR pages of a PDF.
+
+        Parameters
+        ----------
+        pdf_bytes : bytes
+            The raw bytes of the PDF
+        page_indices : list[int]
+            The 0-based indices of the pages to OCR
+
+        Returns
+        -------
+        tuple[dict[int, str], list[str], OCRMetrics]
+            The text per page index (pages without text are left out), the errors and the metrics
+        """
+        metrics = OCRMetrics()
+        texts = {}
+        errors = []
+        start = time.perf_counter()
+        self.cache.prune_if_due()
+        initargs = (pdf_bytes, self.language, self.dpi, self.cache_dir)
+
+        if self.workers > 1 and len(page_indices) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(page_indices)),
+                initializer=init_ocr_worker,
+                initargs=initargs,
+            ) as executor:
+                results = list(executor.map(ocr_pdf_page, page_indices))
+        else:
+            init_ocr_worker(*initargs)
+            try:
+                results = [ocr_pdf_page(page_index) for page_index in page_indices]
+            finally:
+                _worker_state.pop("pdf_document").close()
+
+        for page_index, text, cached, error in results:
+            metrics.pages += 1
+            metrics.cache_hits += cached
+            if error:
+                metrics.failed += 1
+                errors.append(f"OCR of page {page_index + 1} failed: {error}")
+                continue
+            text = text.strip()
+            if text:
+                texts[page_index] = text
+                metrics.characters += len(text)
+
+        metrics.seconds = time.perf_counter() - start
+        return texts, errors, metrics
+
+    def ocr_image_bytes(self, image_bytes: bytes) -> tuple[str, OCRMetrics]:
+        """OCR an image file, in process.
+
+        Returns
+        -------
+        tuple[str, OCRMetrics]
+            The text and the metrics
+        """
+        from PIL import Image
+
+        start = time.perf_counter()
+        self.cache.prune_if_due()
+        with Image.open(BytesIO(image_bytes)) as image:
+            text, cached = ocr_image(image, self.language, self.cache)
+        text = text.strip()
+        metrics = OCRMetrics(
+            pages=1,
+            cache_hits=int(cached),
+            characters=len(text),
+            seconds=time.perf_counter() - start,
+        )
+        return text, metrics
+
+
+class ImageOCRProcessor(BaseProcessor):
+    """Processor for images of documents (scans, photos, screenshots), using OCR."""
+
+    def __init__(self) -> None:
+        """Initialize the image OCR processor."""
+        super().__init__()
+
+    @classmethod
+    @final
+    def supported_extensions(cls) -> list[str]:
+        """Return the supported file extensions.
+
+        Returns
+        -------
+        list[str]
+            List of image file extensions
+        """
+        return [".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif", ".webp"]
+
+    @classmethod
+    @final
+    def supported_mimetypes(cls) -> list[str]:
+        """Return the supported MIME types.
+
+        Returns
+        -------
+        list[str]
+            List of image MIME types
+        """
+        return ["image/png", "image/jpeg", "image/tiff", "image/bmp", "image/gif", "image/webp"]
+
+    @final
+    def extract_text(
+        self,
+        input_data: str | bytes,
+        config: ProcessorConfig,
+        extraction_log: list[str],
+    ) -> tuple[list[Document], list[str]]:
+        """Extract text from an image using OCR.
+
+        Parameters
+        ----------
+        input_data : str | bytes
+            Either a file path or raw bytes of the image
+        config : ProcessorConfig
+            Configuration for processing
+        extraction_log : list[str]
+            Log to append extraction messages to
+
+        Returns
+        -------
+        tuple[list[Document], list[str]]
+            A tuple containing:
+            - List of extracted documents (a single document)
+            - List of error messages (empty if no errors)
+        """
+        if not ocr_available():
+            return [], ["OCR is not available, install tesseract and pytesseract"]
+
+        try:
+            if isinstance(input_data, str):
+                with open(input_data, "rb") as f:
+                    input_data = f.read()
+            text, metrics = OCREngine(config).ocr_image_bytes(input_data)
+        except Exception as e:
+            return [], [f"Error running OCR: {str(e)}"]
+
+        self.stage_stats["ocr"] = metrics.model_dump()
+        extraction_log.append(metrics.summary())
+
+        text = self.clean_text(text)
+        if not text:
+            return [], ["No text could be extracted"]
+
+        return [Document(page_content=text, metadata={"source_type": "image", "ocr": True})], []
@@ -0,0 +1,290 @@
+"""PDF text extraction backends for the PDF processor.
+
+Each backend wraps a PDF library behind the same small interface, so the PDFProcessor can select
+the library per ProcessorConfig ("pdf_backend") and fan out page ranges across processes.
+
+Available backends:
+    pypdf2: PyPDF2, pure python, always installed
+    pypdfium2: PDFium bindings, by far the fastest for most documents
+    pdfminer: pdfminer.six, slow but good at complex layouts
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+- PDF-specific settings: /docs/processors.md#pdf-specific-settings
+
+Example:
+    >>> from lorelai.processors.pdf_backends import get_pdf_backend
+    >>> backend = get_pdf_backend("pypdfium2")(pdf_bytes)
+    >>> texts = backend.extract_pages([0, 1, 2])
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from io import BytesIO
+from typing import ClassVar
+
+import PyPDF2
+
+# Backend tried when pdf_backend is set to "auto" and no backend produces text
+DEFAULT_PDF_BACKEND = "pypdf2"
+AUTO_PDF_BACKEND = "auto"
+# Number of pages extracted by each backend when selecting the fastest one
+BENCHMARK_SAMPLE_PAGES = 3
+
+
+class PDFBackend(ABC):
+    """Base class for PDF text extraction backends.
+
+    Parameters
+    ----------
+    pdf_bytes : bytes
+        The raw bytes of the PDF
+
+    Raises
+    ------
+    ValueError
+        If the library of the backend is not installed
+    """
+
+    name: ClassVar[str]
+
+    def __init__(self, pdf_bytes: bytes) -> None:
+        self.pdf_bytes = pdf_bytes
+
+    @abstractmethod
+    def page_count(self) -> int:
+        """Return the number of pages of the PDF."""
+
+    @abstractmethod
+    def extract_pages(self, page_indices: Sequence[int]) -> list[str]:
+        """Extract the text of pages.
+
+        Parameters
+        ----------
+        page_indices : Sequence[int]
+            The 0-based indices of the pages, in ascending order
+
+        Returns
+        -------
+        list[str]
+            The text of each page, in the order of page_indices
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources of the backend."""
+
+
+class PyPDF2Backend(PDFBackend):
+    """Extract text with PyPDF2."""
+
+    name = "pypdf2"
+
+    def __init__(self, pdf_bytes: bytes) -> None:
+        super().__init__(pdf_bytes)
+        self.reader = PyPDF2.PdfReader(BytesIO(pdf_bytes))
+
+    def page_count(self) -> int:
+        """Return the number of pages of the PDF."""
+        return len(self.reader.pages)
+
+    def extract_pages(self, page_indices: Sequence[int]) -> list[str]:
+        """Extract the text of pages."""
+        return [self.reader.pages[index].extract_text() or "" for index in page_indices]
+
+
+class PdfiumBackend(PDFBackend):
+    """Extract text with pypdfium2."""
+
+    name = "pypdfium2"
+
+    def __init__(self, pdf_bytes: bytes) -> None:
+        super().__init__(pdf_bytes)
+        try:
+            import pypdfium2
+        except ImportError as e:
+            raise ValueError("PDF backend pypdfium2 is not installed") from e
+        self.document = pypdfium2.PdfDocument(pdf_bytes)
+
+    def page_count(self) -> int:
+        """Return the number of pages of the PDF."""
+        return len(self.document)
+
+    def extract_pages(self, page_indices: Sequence[int]) -> list[str]:
+        """Extract the text of pages."""
+        texts = []
+        for index in page_indices:
+            page = self.document[index]
+            text_page = page.get_textpage()
+            try:
+                texts.append(text_page.get_text_range() or "")
+            finally:
+                text_page.close()
+                page.close()
+        return texts
+
+    def close(self) -> None:
+        """Release the resources of the backend."""
+        self.document.close()
+
+
+class PdfminerBackend(PDFBackend):
+    """Extract text with pdfminer.six."""
+
+    name = "pdfminer"
+
+    def __init__(self, pdf_bytes: bytes) -> None:
+        super().__init__(pdf_bytes)
+        try:
+            from pdfminer import high_level
+            from pdfminer.layout import LTTextContainer
+            from pdfminer.pdfpage import PDFPage
+        except ImportError as e:
+            raise ValueError("PDF backend pdfminer is not installed") from e
+        self._high_level = high_level
+        self._text_container = LTTextContainer
+        self._page_count = sum(1 for _ in PDFPage.get_pages(BytesIO(pdf_bytes)))
+
+    def page_count(self) -> int:
+        """Return the number of pages of the PDF."""
+        return self._page_count
+
+    def extract_pages(self, page_indices: Sequence[int]) -> list[str]:
+        """Extract the text of pages, parsing the PDF once for all pages."""
+        texts = []
+        for layout in self._high_level.extract_pages(
+            BytesIO(self.pdf_bytes), page_numbers=set(page_indices)
+        ):
+            texts.append(
+                "".join(
+                    element.get_text()
+                    for element in layout
+                    if isinstance(element, self._text_container)
+                )
+            )
+        return texts
+
+
+PDF_BACKENDS: dict[str, type[PDFBackend]] = {
+    backend.name: backend for backend in (PyPDF2Backend, PdfiumBackend, PdfminerBackend)
+}
+
+
+def get_pdf_backend(name: str) -> type[PDFBackend]:
+    """Get a PDF backend by name.
+
+    Raises
+    ------
+    ValueError
+        If there is no backend with that name
+    """
+    try:
+        return PDF_BACKENDS[name]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown PDF backend {name}, choose from {', '.join(PDF_BACKENDS)} "
+            f"or {AUTO_PDF_BACKEND}"
+        ) from e
+
+
+def benchmark_pdf_backends(
+    pdf_bytes: bytes, sample_pages: int = BENCHMARK_SAMPLE_PAGES
+) -> dict[str, tuple[float, int] | str]:
+    """Time the text extraction of the first pages of a PDF with every backend.
+
+    Parameters
+    ----------
+    pdf_bytes : bytes
+        The raw bytes of the PDF
+    sample_pages : int
+        The number of pages to extract
+
+    Returns
+    -------
+    dict[str, tuple[float, int] | str]
+        Per backend either the seconds taken and the number of characters extracted, or the
+        error message if the backend failed
+    """
+    results = {}
+    for name, backend_class in PDF_BACKENDS.items():
+        start = time.perf_counter()
+        try:
+            backend = backend_class(pdf_bytes)
+            try:
+                texts = backend.extract_pages(range(min(sample_pages, backend.page_count())))
+            finally:
+                backend.close()
+        except Exception as e:
+            results[name] = str(e)
+            continue
+        results[name] = (time.perf_counter() - start, sum(len(text.strip()) for text in texts))
+    return results
+
+
+def select_pdf_backend(pdf_bytes: bytes, sample_pages: int = BENCHMARK_SAMPLE_PAGES) -> str:
+    """Select the fastest backend which extracts text from the first pages of a PDF.
+
+    Returns
+    -------
+    str
+        The name of the backend, DEFAULT_PDF_BACKEND if no backend extracts any text
+    """
+    results = benchmark_pdf_backends(pdf_bytes, sample_pages)
+    logging.debug(f"PDF backend benchmark: {results}")
+    timings = [
+        (result[0], name)
+        for name, result in results.items()
+        if isinstance(result, tuple) and result[1] > 0
+    ]
+    return min(timings)[1] if timings else DEFAULT_PDF_BACKEND
+
+
+# State of the worker processes of the PDF processor, set by init_page_worker
+_worker_backend: PDFBackend | None = None
+
+
+def init_page_worker(backend_name: str, pdf_bytes: bytes) -> None:
+    """Open the PDF once in a worker process (ProcessPoolExecutor initializer)."""
+    global _worker_backend
+    _worker_backend = get_pdf_backend(backend_name)(pdf_bytes)
+
+
+def extract_page_range(
+    start_index: int, end_index: int, backend: PDFBackend | None = None
+) -> list[tuple[int, str, str | None]]:
+    """Extract the text of a range of pages.
+
+    Parameters
+    ----------
+    start_index : int
+        The 0-based index of the first page
+    end_index : int
+        The 0-based index after the last page
+    backend : PDFBackend | None
+        The backend to use, defaults to the backend of the worker process
+
+    Returns
+    -------
+    list[tuple[int, str, str | None]]
+        The page index, text and error (None on success) of each page. If the range fails as a
+        whole, each page is extracted on its own so only the broken pages are lost.
+    """
+    backend = backend or _worker_backend
+    page_indices = range(start_index, end_index)
+    try:
+        return [
+            (index, text, None)
+            for index, text in zip(page_indices, backend.extract_pages(page_indices), strict=True)
+        ]
+    except Exception as e:
+        logging.debug(f"Extracting pages {start_index + 1}-{end_index} failed, retrying: {e}")
+
+    results = []
+    for index in page_indices:
+        try:
+            results.append((index, backend.extract_pages([index])[0], None))
+        except Exception as e:
+            results.append((index, "", str(e)))
+    return results
@@ -1,7 +1,9 @@
-"""PDF processor implementation using PyPDF2.
+"""PDF processor implementation.
 
 This module provides a processor for extracting text from PDF files.
-It uses PyPDF2 for PDF parsing and text extraction.
+The PDF library (PyPDF2, pypdfium2 or pdfminer) is selected with the "pdf_backend" setting, see
+pdf_backends.py. Large PDFs are extracted in page ranges across a process pool. Pages without a
+text layer (scans) are extracted with OCR, see ocr.py.
 
 For usage instructions and documentation, see:
 - Quick start: README.md in this directory
@@ -13,24 +15,35 @@ Example:
     >>> config = ProcessorConfig(
     ...     custom_settings={
     ...         "start_page": 1,
-    ...         "end_page": 5
+    ...         "end_page": 5,
+    ...         "pdf_backend": "pypdfium2",
     ...     }
     ... )
     >>> result = process_file(file_path="document.pdf", config=config)
 """
 
-from io import BytesIO
-import PyPDF2
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import final
 
 from langchain.docstore.document import Document
 
 from .base_processor import BaseProcessor
 from .config import ProcessorConfig
+from .ocr import OCREngine, ocr_available
+from .pdf_backends import (
+    AUTO_PDF_BACKEND,
+    DEFAULT_PDF_BACKEND,
+    PDFBackend,
+    extract_page_range,
+    get_pdf_backend,
+    init_page_worker,
+    select_pdf_backend,
+)
 
 
 class PDFProcessor(BaseProcessor):
-    """Processor for PDF files using PyPDF2."""
+    """Processor for PDF files."""
 
     def __init__(self) -> None:
         """Initialize the PDF processor."""
@@ -85,29 +98,36 @@ class PDFProcessor(BaseProcessor):
             - List of extracted documents (one per page)
             - List of error messages (empty if no errors)
         """
-        # Load the PDF using PyPDF2
+        # Load the PDF using the configured backend
+        custom_settings = config.get("custom_settings", {})
         try:
             if isinstance(input_data, str):
                 with open(input_data, "rb") as f:
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    extraction_log.append(f"Loaded PDF from file: {input_data}")
+                    pdf_bytes = f.read()
+                extraction_log.append(f"Loaded PDF from file: {input_data}")
             else:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(input_data))
+                pdf_bytes = input_data
                 extraction_log.append("Loaded PDF from bytes input")
 
-            num_pages = len(pdf_reader.pages)
-            extraction_log.append(f"PDF has {num_pages} pages")
+            backend_name = custom_settings.get("pdf_backend", DEFAULT_PDF_BACKEND)
+            if backend_name == AUTO_PDF_BACKEND:
+                backend_name = select_pdf_backend(pdf_bytes)
+                extraction_log.append(f"Selected fastest PDF backend: {backend_name}")
+            backend = get_pdf_backend(backend_name)(pdf_bytes)
+
+            num_pages = backend.page_count()
+            extraction_log.append(f"PDF has {num_pages} pages, extracting with {backend_name}")
 
         except Exception as e:
             return [], [f"Error loading PDF: {str(e)}"]
 
         # Get page range from config
-        custom_settings = config.get("custom_settings", {})
         start_page = custom_settings.get("start_page", 1)
         end_page = custom_settings.get("end_page")
 
         # Validate and adjust page range
         if end_page and end_page < start_page:
+            backend.close()
             return [], [
                 f"Invalid page range: end page ({end_page}) is before start page ({start_page})"
             ]
@@ -115,40 +135,34 @@ class PDFProcessor(BaseProcessor):
         start_idx = start_page - 1  # Convert to 0-based index
         end_idx = min(end_page or num_pages, num_pages)
 
+        try:
+            page_results = self.extract_pages(
+                backend, backend_name, pdf_bytes, start_idx, end_idx, config, extraction_log
+            )
+        finally:
+            backend.close()
+
         documents = []
         errors = []
+        empty_pages = []
 
-        # Extract text from each page
-        total_pages = end_idx - start_idx
-        for i in range(start_idx, end_idx):
-            try:
-                # Track progress
-                self.track_progress(
-                    current=i - start_idx + 1,
-                    total=total_pages,
-                    stage="Extracting text",
-                    extraction_log=extraction_log,
-                )
-
-                # Extract text
-                page = pdf_reader.pages[i]
-                text = page.extract_text() or ""
-
-                # Clean the extracted text
-                text = self.clean_text(text)
-
-                # Only consider it an error if we couldn't get any text
-                if not text.strip():
-                    error_msg = f"No text could be extracted from page {i + 1}"
-                    extraction_log.append(error_msg)
-                    errors.append(error_msg)
-                    # Return what we have so far
-                    return documents, errors
+        # Page results are in page order, a failed or empty page doesn't stop the extraction
+        for i, text, error in page_results:
+            if error:
+                error_msg = f"Error processing page {i + 1}: {error}"
+                extraction_log.append(error_msg)
+                errors.append(error_msg)
+                continue
 
-                extraction_log.append(f"Extracted text from page {i + 1}")
+            # Clean the extracted text
+            text = self.clean_text(text)
+            if not text:
+                empty_pages.append(i + 1)
+                continue
 
-                # Create document with metadata
-                doc = Document(
+            # Create document with metadata
+            documents.append(
+                Document(
                     page_content=text,
                     metadata={
                         "page": i + 1,
@@ -156,13 +170,176 @@ class PDFProcessor(BaseProcessor):
                         "total_pages": num_pages,
                     },
                 )
-                documents.append(doc)
+            )
 
-            except Exception as e:
-                error_msg = f"Error processing page {i + 1}: {str(e)}"
-                extraction_log.append(error_msg)
-                errors.append(error_msg)
-                # Return what we have so far
-                return documents, errors
+        extraction_log.append(f"Extracted text from {len(documents)} pages")
+
+        # Pages without a text layer (scans) go through OCR
+        if empty_pages and custom_settings.get("ocr_enabled", True):
+            ocr_documents, ocr_errors, empty_pages = self.ocr_pages(
+                pdf_bytes, empty_pages, num_pages, config, extraction_log
+            )
+            errors.extend(ocr_errors)
+            if ocr_documents:
+                documents = sorted(documents + ocr_documents, key=lambda doc: doc.metadata["page"])
+
+        if empty_pages:
+            extraction_log.append(
+                f"No text could be extracted from {len(empty_pages)} pages: "
+                f"{', '.join(str(page) for page in empty_pages)}"
+            )
 
         return documents, errors
+
+    def ocr_pages(
+        self,
+        pdf_bytes: bytes,
+        page_numbers: list[int],
+        num_pages: int,
+        config: ProcessorConfig,
+        extraction_log: list[str],
+    ) -> tuple[list[Document], list[str], list[int]]:
+        """Extract the text of pages without a text layer using OCR.
+
+        Parameters
+        ----------
+        pdf_bytes : bytes
+            The raw bytes of the PDF
+        page_numbers : list[int]
+            The 1-based numbers of the pages without text
+        num_pages : int
+            The number of pages of the PDF
+        config : ProcessorConfig
+            Configuration for processing
+        extraction_log : list[str]
+            Log to append extraction messages to
+
+        Returns
+        -------
+        tuple[list[Document], list[str], list[int]]
+            A tuple containing:
+            - List of documents of the pages OCR extracted text from
+            - List of error messages
+            - List of page numbers which still have no text
+        """
+        if not ocr_available():
+            extraction_log.append("OCR is not available, skipping pages without text")
+            return [], [], page_numbers
+
+        extraction_log.append(f"Running OCR on {len(page_numbers)} pages without text")
+        try:
+            texts, errors, metrics = OCREngine(config).ocr_pdf_pages(
+                pdf_bytes, [page - 1 for page in page_numbers]
+            )
+        except Exception as e:
+            error_msg = f"OCR failed: {str(e)}"
+            extraction_log.append(error_msg)
+            return [], [error_msg], page_numbers
+
+        self.stage_stats["ocr"] = metrics.model_dump()
+        extraction_log.append(metrics.summary())
+        extraction_log.extend(errors)
+
+        documents = []
+        for page_index, text in texts.items():
+            text = self.clean_text(text)
+            if text:
+                documents.append(
+                    Document(
+                        page_content=text,
+                        metadata={
+                            "page": page_index + 1,
+                            "source_type": "pdf",
+                            "total_pages": num_pages,
+                            "ocr": True,
+                        },
+                    )
+                )
+        ocr_pages = {doc.metadata["page"] for doc in documents}
+        return documents, errors, [page for page in page_numbers if page not in ocr_pages]
+
+    def extract_pages(
+        self,
+        backend: PDFBackend,
+        backend_name: str,
+        pdf_bytes: bytes,
+        start_idx: int,
+        end_idx: int,
+        config: ProcessorConfig,
+        extraction_log: list[str],
+    ) -> list[tuple[int, str, str | None]]:
+        """Extract the raw text of a range of pages, fanning out across processes if large.
+
+        The range is split into tasks of pdf_pages_per_task pages. With more than one task and
+        more than one worker, the tasks run in a process pool in which every process opens the
+        PDF once. Otherwise (or if the pool fails) the pages are extracted in this process.
+
+        Parameters
+        ----------
+        backend : PDFBackend
+            The backend used in this process
+        backend_name : str
+            The name of the backend, used by the worker processes
+        pdf_bytes : bytes
+            The raw bytes of the PDF
+        start_idx : int
+            The 0-based index of the first page
+        end_idx : int
+            The 0-based index after the last page
+        config : ProcessorConfig
+            Configuration for processing
+        extraction_log : list[str]
+            Log to append extraction messages to
+
+        Returns
+        -------
+        list[tuple[int, str, str | None]]
+            The page index, text and error (None on success) of each page, in page order
+        """
+        pages_per_task = max(1, config.get("custom_settings", {}).get("pdf_pages_per_task", 25))
+        workers = config.get("custom_settings", {}).get("pdf_workers") or os.cpu_count() or 1
+        tasks = [
+            (task_start, min(task_start + pages_per_task, end_idx))
+            for task_start in range(start_idx, end_idx, pages_per_task)
+        ]
+        total_pages = end_idx - start_idx
+        page_results = []
+
+        if len(tasks) > 1 and workers > 1:
+            workers = min(workers, len(tasks))
+            extraction_log.append(
+                f"Extracting {total_pages} pages in {len(tasks)} tasks using {workers} processes"
+            )
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=init_page_worker,
+                    initargs=(backend_name, pdf_bytes),
+                ) as executor:
+                    # map returns the results in task order, i.e. page order
+                    for task_results in executor.map(
+                        extract_page_range,
+                        [task_start for task_start, _ in tasks],
+                        [task_end for _, task_end in tasks],
+                    ):
+                        page_results.extend(task_results)
+                        self.track_progress(
+                            current=len(page_results),
+                            total=total_pages,
+                            stage="Extracting text",
+                            extraction_log=extraction_log,
+                        )
+                return page_results
+            except Exception as e:
+                extraction_log.append(f"Parallel extraction failed, extracting in process: {e}")
+                page_results = []
+
+        for task_start, task_end in tasks:
+            page_results.extend(extract_page_range(task_start, task_end, backend))
+            self.track_progress(
+                current=len(page_results),
+                total=total_pages,
+                stage="Extracting text",
+                extraction_log=extraction_log,
+            )
+        return page_results
@@ -13,16 +13,102 @@ Example:
     >>> # Process a file (automatically selects appropriate processor)
     >>> result = registry.process_file(file_path="document.pdf")
     >>>
+    >>> # Process a batch of files on a process pool
+    >>> for result in registry.process_many([("a.pdf", None), (pdf_bytes, "application/pdf")]):
+    ...     print(result.processing_stats["batch_index"], result.status)
+    >>>
     >>> # Register a custom processor
     >>> registry.register_processor(MyCustomProcessor)
 """
 
+import logging
 import os
 import mimetypes
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 from pydantic import BaseModel
 
-from .base_processor import BaseProcessor, ProcessorResult
+from .archive_processor import ArchiveProcessor
+from .base_processor import BaseProcessor, ProcessorResult, ProcessorStatus
+from .config import ProcessorConfig
+from .ocr import ImageOCRProcessor, OCRMetrics
 from .pdf_processor import PDFProcessor
+from .spreadsheet_processor import SpreadsheetProcessor
+from .text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# Input of process_many: a file path or the raw bytes of a file, and its MIME type (if known)
+BatchInput = tuple[str | bytes, str | None]
+BATCH_EXECUTORS = ("thread", "process")
+
+# Processor instances of the batch workers, per thread, reused across the files of a batch
+_batch_processors = threading.local()
+
+
+def process_batch_input(
+    processor_class: type[BaseProcessor], input_data: str | bytes, config: BaseModel | None
+) -> ProcessorResult:
+    """Process a file of a batch, reusing the worker's processor instance.
+
+    Runs in the batch worker threads or processes, see ProcessorRegistry.process_many.
+    """
+    processors = _batch_processors.__dict__.setdefault("processors", {})
+    processor = processors.get(processor_class)
+    if processor is None:
+        processor = processors[processor_class] = processor_class()
+    if isinstance(input_data, str):
+        return processor.process(file_path=input_data, config=config)
+    return processor.process(file_bytes=input_data, config=config)
+
+
+class BatchStats(BaseModel):
+    """Aggregated processing statistics of a batch of files."""
+
+    files: int = 0
+    succeeded: int = 0
+    partial: int = 0
+    failed: int = 0
+    chunks: int = 0
+    characters: int = 0
+    # Sum of the processing time of the files, exceeds the wall clock time when parallel
+    processing_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    peak_memory_usage_mb: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """Files processed per second (wall clock)."""
+        return self.files / self.wall_seconds if self.wall_seconds else 0.0
+
+    def add(self, result: ProcessorResult) -> None:
+        """Add the result of a file to the statistics."""
+        self.files += 1
+        if result.status == ProcessorStatus.OK:
+            self.succeeded += 1
+        elif result.status == ProcessorStatus.PARTIAL:
+            self.partial += 1
+        else:
+            self.failed += 1
+        stats = result.processing_stats
+        self.chunks += stats.get("final_document_count", 0)
+        self.characters += len(result.extracted_text or "")
+        self.processing_seconds += stats.get("processing_time_seconds", 0.0)
+        self.peak_memory_usage_mb = max(
+            self.peak_memory_usage_mb, stats.get("memory_usage_mb", 0.0)
+        )
+
+    def summary(self) -> str:
+        """Return a one line summary of the statistics."""
+        return (
+            f"Batch: {self.files} files ({self.succeeded} ok, {self.partial} partial, "
+            f"{self.failed} failed), {self.chunks} chunks in {self.wall_seconds:.2f}s "
+            f"({self.files_per_second:.2f} files/s, {self.processing_seconds:.2f}s processing), "
+            f"peak memory {self.peak_memory_usage_mb:.2f} MB"
+        )
 
 
 class ProcessorRegistry:
@@ -37,9 +123,15 @@ class ProcessorRegistry:
         """Initialize the registry with available processors."""
         self._processors: dict[str, type[BaseProcessor]] = {}
         self._mime_processors: dict[str, type[BaseProcessor]] = {}
+        # Throughput of the OCR stage over all files processed through this registry
+        self.ocr_metrics = OCRMetrics()
 
         # Register built-in processors
         self.register_processor(PDFProcessor)
+        self.register_processor(TextProcessor)
+        self.register_processor(SpreadsheetProcessor)
+        self.register_processor(ImageOCRProcessor)
+        self.register_processor(ArchiveProcessor)
 
     def register_processor(self, processor_class: type[BaseProcessor]) -> None:
         """Register a new processor.
@@ -143,11 +235,138 @@ class ProcessorRegistry:
 
         # Create processor instance and process the file
         processor = processor_class()
-        return processor.process(
+        result = processor.process(
             file_path=file_path,
             file_bytes=file_bytes,
             config=config,
         )
+        self._record_stage_stats(result)
+        return result
+
+    def process_many(
+        self,
+        inputs: Iterable[BatchInput],
+        *,
+        config: BaseModel | None = None,
+        executor: str = "thread",
+        max_workers: int | None = None,
+        stats: BatchStats | None = None,
+    ) -> Iterator[ProcessorResult]:
+        """Process a batch of files on a thread or process pool.
+
+        Each worker reuses one processor instance per processor class. At most two files per
+        worker are in flight, so the inputs are consumed lazily. Files which can't be processed
+        (unsupported type, unexpected errors) yield a result with the ERROR status, they don't
+        stop the batch.
+
+        Parameters
+        ----------
+        inputs : Iterable[BatchInput]
+            The files to process, as (file path or raw bytes, MIME type or None) tuples
+        config : Optional[BaseModel], optional
+            Configuration for the processors, by default None
+        executor : str, optional
+            "thread" or "process", by default "thread". Use processes for CPU bound batches
+            (e.g. PDFs). Either way the files run with a single PDF, OCR and archive worker.
+        max_workers : Optional[int], optional
+            Number of workers, by default the number of CPUs
+        stats : Optional[BatchStats], optional
+            Statistics to aggregate the results in, by default None
+
+        Yields
+        ------
+        ProcessorResult
+            The result of each file as it completes, processing_stats["batch_index"] is the
+            index of the file in inputs
+
+        Raises
+        ------
+        ValueError
+            If the executor is not supported
+        """
+        if executor not in BATCH_EXECUTORS:
+            raise ValueError(f"Unknown executor {executor}, choose from {BATCH_EXECUTORS}")
+
+        stats = stats if stats is not None else BatchStats()
+        workers = max_workers or os.cpu_count() or 1
+        # the files are the unit of parallelism, don't start pools within the pool: that would
+        # oversubscribe the CPUs and, on threads, fork process pools from a multi-threaded process
+        config = config or ProcessorConfig()
+        config = config.model_copy(
+            update={
+                "custom_settings": {
+                    **config.get("custom_settings", {}),
+                    "pdf_workers": 1,
+                    "ocr_workers": 1,
+                    "archive_workers": 1,
+                }
+            }
+        )
+        if executor == "process":
+            pool: Executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="processor")
+
+        start = time.perf_counter()
+        pending = {}
+
+        def completed(future) -> ProcessorResult:
+            index = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.exception(f"Error processing file {index} of the batch: {e}")
+                result = ProcessorResult(status=ProcessorStatus.ERROR, message=str(e))
+            return self._record_batch_result(result, index, stats, start)
+
+        try:
+            for index, (input_data, mime_type) in enumerate(inputs):
+                processor_class = self.get_processor_for_file(
+                    file_path=input_data if isinstance(input_data, str) else None,
+                    mime_type=mime_type,
+                )
+                if processor_class is None:
+                    result = ProcessorResult(
+                        status=ProcessorStatus.ERROR,
+                        message=(
+                            f"No processor found for {input_data}"
+                            if isinstance(input_data, str)
+                            else f"No processor found for the MIME type {mime_type}"
+                        ),
+                    )
+                    yield self._record_batch_result(result, index, stats, start)
+                    continue
+
+                future = pool.submit(process_batch_input, processor_class, input_data, config)
+                pending[future] = index
+                while len(pending) >= 2 * workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        yield completed(finished)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for finished in done:
+                    yield completed(finished)
+        finally:
+            pool.shutdown(cancel_futures=True)
+            logger.info(stats.summary())
+
+    def _record_batch_result(
+        self, result: ProcessorResult, index: int, stats: BatchStats, start: float
+    ) -> ProcessorResult:
+        """Tag the result of a batch file with its index and aggregate its statistics."""
+        result.processing_stats["batch_index"] = index
+        self._record_stage_stats(result)
+        stats.add(result)
+        stats.wall_seconds = time.perf_counter() - start
+        return result
+
+    def _record_stage_stats(self, result: ProcessorResult) -> None:
+        """Aggregate the statistics of the processor stages (e.g. OCR) of a result."""
+        if "ocr" in result.processing_stats:
+            self.ocr_metrics.add(OCRMetrics(**result.processing_stats["ocr"]))
+            logger.info(f"Total {self.ocr_metrics.summary()}")
 
 
 # Create a global registry instance
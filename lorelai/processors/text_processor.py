@@ -0,0 +1,126 @@
+"""Text processor implementation for plain text based formats.
+
+This module provides a processor for plain text and markdown content, e.g. the text exports of
+Google Docs and Slides or text files downloaded from Google Drive. Spreadsheets (CSV) are handled
+by the SpreadsheetProcessor.
+
+For usage instructions and documentation, see:
+- Quick start: README.md in this directory
+- Detailed guide: /docs/processors.md
+
+Example:
+    >>> from lorelai.processors import process_file
+    >>> result = process_file(file_path="notes.md")
+"""
+
+from typing import final
+
+from langchain.docstore.document import Document
+
+from .base_processor import BaseProcessor
+from .config import ProcessorConfig
+
+
+class TextProcessor(BaseProcessor):
+    """Processor for plain text based files (text, markdown, JSON, ...)."""
+
+    # Encodings to try in order, latin-1 never fails so it is the last resort
+    ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+
+    def __init__(self) -> None:
+        """Initialize the text processor."""
+        super().__init__()
+
+    @classmethod
+    @final
+    def supported_extensions(cls) -> list[str]:
+        """Return the supported file extensions.
+
+        Returns
+        -------
+        list[str]
+            List of plain text based file extensions
+        """
+        return [".txt", ".md", ".markdown", ".json", ".xml", ".html", ".htm"]
+
+    @classmethod
+    @final
+    def supported_mimetypes(cls) -> list[str]:
+        """Return the supported MIME types.
+
+        Returns
+        -------
+        list[str]
+            List of plain text based MIME types
+        """
+        return [
+            "text/plain",
+            "text/markdown",
+            "text/x-markdown",
+            "text/html",
+            "text/xml",
+            "application/json",
+            "application/xml",
+        ]
+
+    def decode(self, input_data: str | bytes) -> tuple[str, str]:
+        """Decode the input into text.
+
+        Parameters
+        ----------
+        input_data : str | bytes
+            Either a file path or raw bytes of the text
+
+        Returns
+        -------
+        tuple[str, str]
+            The decoded text and the encoding that was used
+        """
+        if isinstance(input_data, str):
+            with open(input_data, "rb") as f:
+                input_data = f.read()
+
+        for encoding in self.ENCODINGS:
+            try:
+                return input_data.decode(encoding), encoding
+            except UnicodeDecodeError:
+                continue
+        # unreachable as latin-1 decodes any byte sequence, kept for safety
+        return input_data.decode("utf-8", errors="replace"), "utf-8"
+
+    @final
+    def extract_text(
+        self,
+        input_data: str | bytes,
+        config: ProcessorConfig,
+        extraction_log: list[str],
+    ) -> tuple[list[Document], list[str]]:
+        """Extract text from a plain text based file.
+
+        Parameters
+        ----------
+        input_data : str | bytes
+            Either a file path or raw bytes of the text
+        config : ProcessorConfig
+            Configuration for processing
+        extraction_log : list[str]
+            Log to append extraction messages to
+
+        Returns
+        -------
+        tuple[list[Document], list[str]]
+            A tuple containing:
+            - List of extracted documents (a single document)
+            - List of error messages (empty if no errors)
+        """
+        try:
+            text, encoding = self.decode(input_data)
+        except Exception as e:
+            return [], [f"Error decoding text: {str(e)}"]
+        extraction_log.append(f"Decoded {len(text)} characters using {encoding}")
+
+        text = self.clean_text(text)
+        if not text:
+            return [], ["No text could be extracted"]
+
+        return [Document(page_content=text, metadata={"source_type": "text"})], []
@@ -2,13 +2,15 @@
 
 import logging
 import sys
-import re
 
 from flask import current_app
 
 import jwt
 import datetime
-from itertools import chain
+
+import numpy as np
+
+from lorelai.processors.normalizer import normalize_for_vector
 
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
@@ -204,21 +206,17 @@ def clean_text_for_vector(text):
     -------
         str: The cleaned version of the input text.
     """
-    # Remove HTML tags
-    text = re.sub("<[^<]+?>", "", text)
-    # Remove control characters (newline, tab, carriage return)
-    text = re.sub(r"[\n\t\r]+", " ", text)
-    # Remove extra whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-    # Remove repeated punctuation
-    text = re.sub(r"([!?.]){2,}", r"\1", text)
-    return text
-
-
-def batch_embed_langchain_documents(embeddings_model, text_docs, batch_size=100):
+    # Remove HTML tags, extra whitespace and repeated punctuation, see lorelai.processors.normalizer
+    return normalize_for_vector(text)
+
+
+def batch_embed_langchain_documents(embeddings_model, text_docs, batch_size=100) -> np.ndarray:
     """
     Embed documents in batches to avoid memory issues with large lists.
 
+    The embeddings of each batch are copied into a single float32 matrix, so the (boxed) float
+    lists returned by the model only live for one batch.
+
     Args:
         embeddings_model: Model that provides the embed_documents method.
         text_docs (list of str): List of text documents to embed.
@@ -226,15 +224,20 @@ def batch_embed_langchain_documents(embeddings_model, text_docs, batch_size=100)
 
     Returns
     -------
-        list: List of embedding vectors in the original order.
+        np.ndarray: float32 matrix of shape (len(text_docs), dimension), rows in the original
+            order.
     """
-    # Split text_docs into batches
-    batches = [text_docs[i : i + batch_size] for i in range(0, len(text_docs), batch_size)]
-
-    # Embed each batch and collect results
-    embeds = [embeddings_model.embed_documents(batch) for batch in batches]
-
-    # Flatten the list of lists into a single list, preserving order
-    embeds_flat = list(chain.from_iterable(embeds))
-
-    return embeds_flat
+    embeds = None
+    for start in range(0, len(text_docs), batch_size):
+        batch = text_docs[start : start + batch_size]
+        batch_embeds = embeddings_model.embed_documents(batch)
+        if len(batch_embeds) != len(batch):
+            raise ValueError("Embeds length and document length mismatch")
+        if embeds is None:
+            dimension = len(batch_embeds[0]) if batch_embeds else 0
+            embeds = np.empty((len(text_docs), dimension), dtype=np.float32)
+        embeds[start : start + len(batch_embeds)] = batch_embeds
+
+    if embeds is None:
+        return np.empty((0, 0), dtype=np.float32)
+    return embeds
@@ -0,0 +1,55 @@
+"""Add ACL groups for vector permissions.
+
+Also merges the two heads 00013 and 00014.
+
+Revision ID: 00015
+Revises: 00013, 00014
+Create Date: 2025-02-20 10:12:41.318204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00015"
+down_revision = ("00013", "00014")
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    op.create_table(
+        "acl_groups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("org_id", sa.Integer(), nullable=False),
+        sa.Column("datasource_id", sa.Integer(), nullable=False),
+        sa.Column("acl_key", sa.String(length=512), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["org_id"], ["organisation.id"]),
+        sa.ForeignKeyConstraint(["datasource_id"], ["datasource.datasource_id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "org_id", "datasource_id", "acl_key", name="uq_acl_groups_org_datasource_key"
+        ),
+    )
+    op.create_table(
+        "acl_group_members",
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("user_email", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["group_id"], ["acl_groups.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("group_id", "user_email"),
+    )
+    op.create_index(
+        "ix_acl_group_members_user_email", "acl_group_members", ["user_email"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    op.drop_index("ix_acl_group_members_user_email", table_name="acl_group_members")
+    op.drop_table("acl_group_members")
+    op.drop_table("acl_groups")
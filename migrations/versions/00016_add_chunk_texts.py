@@ -0,0 +1,33 @@
+"""Add chunk text store.
+
+Revision ID: 00016
+Revises: 00015
+Create Date: 2025-02-24 14:03:17.520916
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00016"
+down_revision = "00015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    op.create_table(
+        "chunk_texts",
+        sa.Column("vector_id", sa.String(length=255), nullable=False),
+        sa.Column("text_compressed", sa.LargeBinary(length=16777215), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("vector_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    op.drop_table("chunk_texts")
@@ -0,0 +1,41 @@
+"""Add the export hashes of indexed Google Sheets tabs.
+
+Revision ID: 00017
+Revises: 00016
+Create Date: 2026-10-18 21:45:02.114387
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00017"
+down_revision = "00016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    op.create_table(
+        "google_drive_sheet_tabs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("google_drive_id", sa.String(length=255), nullable=False),
+        sa.Column("sheet_id", sa.Integer(), nullable=False),
+        sa.Column("sheet_name", sa.String(length=255), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("indexed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["user.user_id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "google_drive_id", "sheet_id", name="uq_google_drive_sheet_tabs_user_sheet"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    op.drop_table("google_drive_sheet_tabs")
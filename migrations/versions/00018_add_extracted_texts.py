@@ -0,0 +1,133 @@
+"""Add the content addressed extracted text store.
+
+Moves the extracted text of the indexing run items into extracted_texts, zstd compressed and
+keyed by the sha256 of the text, and replaces item_extractedtext by a reference.
+
+Revision ID: 00018
+Revises: 00017
+Create Date: 2026-10-18 22:20:41.601238
+
+"""
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+import zstandard
+
+
+# revision identifiers, used by Alembic.
+revision = "00018"
+down_revision = "00017"
+branch_labels = None
+depends_on = None
+
+# Number of items moved per batch, the texts of a batch are held in memory
+BATCH_SIZE = 200
+
+items_table = sa.table(
+    "indexing_run_items",
+    sa.column("id", sa.Integer()),
+    sa.column("item_extractedtext", mysql.LONGTEXT()),
+    sa.column("item_extractedtext_sha256", sa.String(length=64)),
+)
+texts_table = sa.table(
+    "extracted_texts",
+    sa.column("sha256", sa.String(length=64)),
+    sa.column("text_compressed", mysql.LONGBLOB()),
+    sa.column("text_length", sa.Integer()),
+    sa.column("created_at", sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    op.create_table(
+        "extracted_texts",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("text_compressed", mysql.LONGBLOB(), nullable=False),
+        sa.Column("text_length", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.add_column(
+        "indexing_run_items",
+        sa.Column("item_extractedtext_sha256", sa.String(length=64), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_indexing_run_items_extracted_text",
+        "indexing_run_items",
+        "extracted_texts",
+        ["item_extractedtext_sha256"],
+        ["sha256"],
+    )
+
+    # backfill the store in batches, identical texts are stored once
+    connection = op.get_bind()
+    compressor = zstandard.ZstdCompressor(level=3)
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(items_table.c.id, items_table.c.item_extractedtext)
+            .where(items_table.c.id > last_id, items_table.c.item_extractedtext.is_not(None))
+            .order_by(items_table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for item_id, text in rows:
+            sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            connection.execute(
+                mysql.insert(texts_table)
+                .prefix_with("IGNORE")
+                .values(
+                    sha256=sha256,
+                    text_compressed=compressor.compress(text.encode("utf-8")),
+                    text_length=len(text),
+                    created_at=sa.func.now(),
+                )
+            )
+            connection.execute(
+                items_table.update()
+                .where(items_table.c.id == item_id)
+                .values(item_extractedtext_sha256=sha256)
+            )
+        last_id = rows[-1][0]
+
+    op.drop_column("indexing_run_items", "item_extractedtext")
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    op.add_column(
+        "indexing_run_items", sa.Column("item_extractedtext", mysql.LONGTEXT(), nullable=True)
+    )
+
+    # restore the text of each item from the store
+    connection = op.get_bind()
+    decompressor = zstandard.ZstdDecompressor()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(items_table.c.id, texts_table.c.text_compressed)
+            .join(texts_table, texts_table.c.sha256 == items_table.c.item_extractedtext_sha256)
+            .where(items_table.c.id > last_id)
+            .order_by(items_table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for item_id, text_compressed in rows:
+            connection.execute(
+                items_table.update()
+                .where(items_table.c.id == item_id)
+                .values(item_extractedtext=decompressor.decompress(text_compressed).decode("utf-8"))
+            )
+        last_id = rows[-1][0]
+
+    op.drop_constraint(
+        "fk_indexing_run_items_extracted_text", "indexing_run_items", type_="foreignkey"
+    )
+    op.drop_column("indexing_run_items", "item_extractedtext_sha256")
+    op.drop_table("extracted_texts")
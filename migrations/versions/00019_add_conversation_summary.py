@@ -0,0 +1,31 @@
+"""Add the rolling history summary of chat conversations.
+
+Revision ID: 00019
+Revises: 00018
+Create Date: 2026-10-18 23:05:12.480193
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00019"
+down_revision = "00018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    with op.batch_alter_table("chat_conversations", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("history_summary", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("summarized_until", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    with op.batch_alter_table("chat_conversations", schema=None) as batch_op:
+        batch_op.drop_column("summarized_until")
+        batch_op.drop_column("history_summary")
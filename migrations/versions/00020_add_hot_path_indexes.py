@@ -0,0 +1,63 @@
+"""Add composite indexes for the hot query paths.
+
+Covers the messages of a conversation by time, the bot replies per conversation by time (message
+quota reconciliation), the item counts per status of an indexing run, the notification list of a
+user and the Google Drive item lookups by Google Drive ID. See
+tools/benchmarks/mysql_index_benchmark.py for the query plans before and after.
+
+Revision ID: 00020
+Revises: 00019
+Create Date: 2026-10-18 23:31:47.902614
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "00020"
+down_revision = "00019"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_chat_messages_conversation_created", "chat_messages", ["conversation_id", "created_at"]),
+    (
+        "ix_chat_messages_conversation_sender_created",
+        "chat_messages",
+        ["conversation_id", "sender", "created_at"],
+    ),
+    (
+        "ix_indexing_run_items_run_status",
+        "indexing_run_items",
+        ["indexing_run_id", "item_status"],
+    ),
+    (
+        "ix_notifications_user_read_dismissed_created",
+        "notifications",
+        ["user_id", "read", "dismissed", "created_at"],
+    ),
+    ("ix_google_drive_items_google_drive_id", "google_drive_items", ["google_drive_id"]),
+]
+
+# MySQL drops the implicit index of a foreign key once another index starts with its column, the
+# composite indexes can only be dropped after the foreign keys got an index of their own again
+FOREIGN_KEY_INDEXES = [
+    ("ix_chat_messages_conversation_id", "chat_messages", ["conversation_id"]),
+    ("ix_indexing_run_items_indexing_run_id", "indexing_run_items", ["indexing_run_id"]),
+    ("ix_notifications_user_id", "notifications", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    for name, table, columns in FOREIGN_KEY_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,63 @@
+"""Add the last activity and message count of chat conversations.
+
+Backfills both from chat_messages and indexes the sidebar query, the most recent conversations of
+a user.
+
+Revision ID: 00021
+Revises: 00020
+Create Date: 2026-10-18 23:52:08.317740
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00021"
+down_revision = "00020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    with op.batch_alter_table("chat_conversations", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("last_message_at", sa.TIMESTAMP(), nullable=True))
+        batch_op.add_column(
+            sa.Column("message_count", sa.Integer(), nullable=False, server_default="0")
+        )
+
+    op.execute(
+        """
+        UPDATE chat_conversations
+        JOIN (
+            SELECT conversation_id, MAX(created_at) AS last_message_at, COUNT(*) AS message_count
+            FROM chat_messages
+            GROUP BY conversation_id
+        ) AS activity ON activity.conversation_id = chat_conversations.conversation_id
+        SET chat_conversations.last_message_at = activity.last_message_at,
+            chat_conversations.message_count = activity.message_count
+        """
+    )
+
+    op.create_index(
+        "ix_chat_conversations_user_deleted_last_message",
+        "chat_conversations",
+        ["user_id", "marked_deleted", "last_message_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    # the index replaced the implicit index of the user_id foreign key, which MySQL dropped
+    op.create_index(
+        "ix_chat_conversations_user_id", "chat_conversations", ["user_id"], unique=False
+    )
+    op.drop_index(
+        "ix_chat_conversations_user_deleted_last_message", table_name="chat_conversations"
+    )
+    with op.batch_alter_table("chat_conversations", schema=None) as batch_op:
+        batch_op.drop_column("message_count")
+        batch_op.drop_column("last_message_at")
@@ -0,0 +1,37 @@
+"""Add indexes for the paginated indexing runs list.
+
+The admin list pages through the runs by creation time (the primary key breaks ties, InnoDB
+appends it to every secondary index), optionally filtered by status. The user, organisation and
+datasource filters use the indexes of their foreign keys.
+
+Revision ID: 00022
+Revises: 00021
+Create Date: 2026-10-18 23:58:12.417305
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "00022"
+down_revision = "00021"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_indexing_runs_created_at", "indexing_runs", ["created_at"]),
+    ("ix_indexing_runs_status_created_at", "indexing_runs", ["status", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
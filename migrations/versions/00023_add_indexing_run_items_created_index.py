@@ -0,0 +1,45 @@
+"""Index the items of an indexing run by creation time.
+
+The items list pages through the items of a run ordered by created_at (the primary key breaks
+ties, InnoDB appends it to every secondary index), so each page is a range scan of this index.
+created_at becomes NOT NULL, the keyset pagination compares it, rows without it get their
+updated_at (or the time of the migration).
+
+Revision ID: 00023
+Revises: 00022
+Create Date: 2026-10-19 09:12:41.806215
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00023"
+down_revision = "00022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    op.execute(
+        "UPDATE indexing_run_items SET created_at = COALESCE(updated_at, UTC_TIMESTAMP()) "
+        "WHERE created_at IS NULL"
+    )
+    with op.batch_alter_table("indexing_run_items", schema=None) as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+    op.create_index(
+        "ix_indexing_run_items_run_created",
+        "indexing_run_items",
+        ["indexing_run_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    op.drop_index("ix_indexing_run_items_run_created", table_name="indexing_run_items")
+    with op.batch_alter_table("indexing_run_items", schema=None) as batch_op:
+        batch_op.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
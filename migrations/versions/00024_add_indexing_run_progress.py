@@ -0,0 +1,32 @@
+"""Add the pipeline progress of indexing runs.
+
+The counters of the indexing pipeline were reported in the error column of the run, they get a
+JSON column of their own.
+
+Revision ID: 00024
+Revises: 00023
+Create Date: 2026-10-18 09:40:17.264903
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "00024"
+down_revision = "00023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade the database schema."""
+    with op.batch_alter_table("indexing_runs", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("progress", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade the database schema."""
+    with op.batch_alter_table("indexing_runs", schema=None) as batch_op:
+        batch_op.drop_column("progress")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the document chunking of the indexing pipeline.
+
+Compares chunking processor output twice (the processor splits, then the indexing pipeline splits
+the chunks again) with chunking it once through lorelai.processors.chunk_documents.
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "../.."))
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from lorelai.processors import PRE_CHUNKED, chunk_documents, get_text_splitter
+
+
+def generate_text(size: int) -> str:
+    """Generate pseudo random text of about size characters, with sentences and paragraphs."""
+    rng = random.Random(42)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(500)]
+    paragraphs = []
+    length = 0
+    while length < size:
+        sentences = [
+            " ".join(rng.choices(words, k=rng.randint(5, 25))).capitalize() + "."
+            for _ in range(rng.randint(2, 8))
+        ]
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def processor_chunks(text: str, chunk_size: int, overlap: int) -> list[Document]:
+    """Chunk the text like BaseProcessor.chunk_text does."""
+    return [
+        Document(page_content=chunk, metadata={"source": "benchmark", PRE_CHUNKED: True})
+        for chunk in get_text_splitter(chunk_size, overlap).split_text(text)
+    ]
+
+
+def double_split(text: str, chunk_size: int, overlap: int) -> list[Document]:
+    """Chunk in the processor, then split the chunks again in the pipeline (old behaviour)."""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size)
+    return splitter.split_documents(processor_chunks(text, chunk_size, overlap))
+
+
+def single_split(text: str, chunk_size: int, overlap: int) -> list[Document]:
+    """Chunk in the processor, the pipeline passes the pre-chunked documents through."""
+    return list(chunk_documents(processor_chunks(text, chunk_size, overlap), chunk_size, overlap))
+
+
+def benchmark(function, text: str, chunk_size: int, overlap: int, repeat: int) -> tuple:
+    """Return the best run time in seconds and the number of chunks."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        documents = function(text, chunk_size, overlap)
+        best = min(best, time.perf_counter() - start)
+    return best, len(documents)
+
+
+def main() -> None:
+    """Implement the main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the document chunking")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunk_size", type=int, default=4000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'method':>8} {'best (ms)':>10} {'chunks':>7}")
+    for size in args.sizes:
+        text = generate_text(size)
+        for name, function in (("double", double_split), ("single", single_split)):
+            seconds, chunk_count = benchmark(
+                function, text, args.chunk_size, args.overlap, args.repeat
+            )
+            print(f"{size:>10} {name:>8} {seconds * 1000:>10.2f} {chunk_count:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the hot MySQL queries before and after the composite indexes of migration 00020.
+
+Creates the tables of the hot queries in a scratch database (dropping them first), seeds them with
+generated data, then reports the EXPLAIN plan and the latency of every hot query, first without
+and then with the composite indexes. Never point it at a database with data you want to keep.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import string
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "../.."))
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, make_url
+
+import app.models  # noqa: F401 (registers the tables)
+from app.database import db
+
+TABLES = [
+    "chat_conversations",
+    "chat_messages",
+    "indexing_runs",
+    "indexing_run_items",
+    "notifications",
+    "google_drive_items",
+]
+# The indexes of migration 00020, as defined on the models
+HOT_INDEXES = [
+    "ix_chat_messages_conversation_created",
+    "ix_chat_messages_conversation_sender_created",
+    "ix_indexing_run_items_run_status",
+    "ix_notifications_user_read_dismissed_created",
+    "ix_google_drive_items_google_drive_id",
+]
+INSERT_BATCH_SIZE = 5000
+
+
+def hot_queries(args: argparse.Namespace, rng: random.Random) -> dict:
+    """Return the hot queries, each with a function returning random parameters."""
+    return {
+        "conversation messages": (
+            "SELECT message_id, sender, message_content, created_at FROM chat_messages "
+            "WHERE conversation_id = :conversation_id ORDER BY created_at",
+            lambda: {"conversation_id": conversation_id(rng, args)},
+        ),
+        "quota bot replies": (
+            "SELECT COUNT(chat_messages.message_id) FROM chat_messages "
+            "JOIN chat_conversations "
+            "ON chat_conversations.conversation_id = chat_messages.conversation_id "
+            "WHERE chat_conversations.user_id = :user_id AND chat_messages.sender = 'bot' "
+            "AND chat_messages.created_at >= :since",
+            lambda: {
+                "user_id": rng.randint(1, args.users),
+                "since": datetime.utcnow() - timedelta(days=1),
+            },
+        ),
+        "run failed items": (
+            "SELECT COUNT(*) FROM indexing_run_items "
+            "WHERE indexing_run_id = :run_id AND item_status = 'failed'",
+            lambda: {"run_id": rng.randint(1, args.runs)},
+        ),
+        "notifications": (
+            "SELECT * FROM notifications WHERE user_id = :user_id "
+            "AND `read` = 0 AND dismissed = 0 ORDER BY created_at DESC LIMIT 20",
+            lambda: {"user_id": rng.randint(1, args.users)},
+        ),
+        "drive item": (
+            "SELECT * FROM google_drive_items WHERE google_drive_id = :google_drive_id LIMIT 1",
+            lambda: {"google_drive_id": f"drive-{rng.randrange(args.drive_items)}"},
+        ),
+    }
+
+
+def conversation_id(rng: random.Random, args: argparse.Namespace) -> str:
+    """Return the ID of a random seeded conversation."""
+    return f"conversation-{rng.randint(1, args.users)}-{rng.randrange(args.conversations)}"
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    """Return random text of a length."""
+    return "".join(rng.choices(string.ascii_lowercase + " ", k=length))
+
+
+def insert_rows(connection: Connection, table_name: str, rows) -> int:
+    """Insert generated rows in batches, returning the number of rows."""
+    table = db.metadata.tables[table_name]
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            connection.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        connection.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def seed(connection: Connection, args: argparse.Namespace) -> None:
+    """Seed the tables with generated data, the timestamps spread over the last 30 days."""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+
+    def past() -> datetime:
+        return now - timedelta(seconds=rng.randint(0, 30 * 24 * 3600))
+
+    def conversations():
+        for user_id in range(1, args.users + 1):
+            for index in range(args.conversations):
+                yield {
+                    "conversation_id": f"conversation-{user_id}-{index}",
+                    "user_id": user_id,
+                    "created_at": past(),
+                    "conversation_name": random_text(rng, 20),
+                    "marked_deleted": False,
+                }
+
+    def messages():
+        for user_id in range(1, args.users + 1):
+            for index in range(args.conversations):
+                for number in range(args.messages):
+                    yield {
+                        "conversation_id": f"conversation-{user_id}-{index}",
+                        "sender": "user" if number % 2 == 0 else "bot",
+                        "message_content": random_text(rng, 200),
+                        "created_at": past(),
+                        "marked_deleted": False,
+                    }
+
+    def runs():
+        for run_id in range(1, args.runs + 1):
+            yield {
+                "id": run_id,
+                "rq_job_id": f"job-{run_id}",
+                "created_at": past(),
+                "status": "completed",
+                "user_id": rng.randint(1, args.users),
+                "organisation_id": 1,
+                "datasource_id": 1,
+            }
+
+    def items():
+        for run_id in range(1, args.runs + 1):
+            for index in range(args.items):
+                yield {
+                    "indexing_run_id": run_id,
+                    "item_id": f"item-{run_id}-{index}",
+                    "item_type": "document",
+                    "item_name": random_text(rng, 30),
+                    "item_url": "https://example.com",
+                    "item_status": rng.choices(["completed", "failed", "skipped"], [90, 5, 5])[0],
+                    "created_at": past(),
+                }
+
+    def notifications():
+        for user_id in range(1, args.users + 1):
+            for _ in range(args.notifications):
+                yield {
+                    "user_id": user_id,
+                    "type": "info",
+                    "title": random_text(rng, 30),
+                    "message": random_text(rng, 100),
+                    "read": rng.random() < 0.7,
+                    "dismissed": rng.random() < 0.3,
+                    "created_at": past(),
+                }
+
+    def drive_items():
+        for index in range(args.drive_items):
+            yield {
+                "user_id": rng.randint(1, args.users),
+                "google_drive_id": f"drive-{index}",
+                "item_name": random_text(rng, 30),
+                "item_type": "document",
+                "mime_type": "application/vnd.google-apps.document",
+                "item_url": "https://example.com",
+                "icon_url": "https://example.com/icon.png",
+                "created_at": past(),
+            }
+
+    for table_name, rows in (
+        ("chat_conversations", conversations()),
+        ("chat_messages", messages()),
+        ("indexing_runs", runs()),
+        ("indexing_run_items", items()),
+        ("notifications", notifications()),
+        ("google_drive_items", drive_items()),
+    ):
+        start = time.perf_counter()
+        count = insert_rows(connection, table_name, rows)
+        print(f"Seeded {count} rows into {table_name} in {time.perf_counter() - start:.1f}s")
+
+
+def create_tables(connection: Connection) -> None:
+    """(Re)create the tables without the hot indexes, the foreign keys aren't checked."""
+    connection.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+    for table_name in reversed(TABLES):
+        connection.execute(text(f"DROP TABLE IF EXISTS `{table_name}`"))
+    for table_name in TABLES:
+        table = db.metadata.tables[table_name]
+        hot_indexes = {index for index in table.indexes if index.name in HOT_INDEXES}
+        table.indexes.difference_update(hot_indexes)
+        try:
+            table.create(connection)
+        finally:
+            table.indexes.update(hot_indexes)
+
+
+def create_hot_indexes(connection: Connection) -> None:
+    """Create the indexes of migration 00020 and update the table statistics."""
+    for table_name in TABLES:
+        for index in db.metadata.tables[table_name].indexes:
+            if index.name in HOT_INDEXES:
+                index.create(connection)
+    connection.execute(text(f"ANALYZE TABLE {', '.join(TABLES)}"))
+
+
+def report(connection: Connection, queries: dict, repeat: int) -> dict:
+    """Print the query plan of each query and return the median and p95 latency (ms)."""
+    latencies = {}
+    for name, (sql, parameters) in queries.items():
+        for plan in connection.execute(text(f"EXPLAIN {sql}"), parameters()).mappings():
+            print(
+                f"  {name:<22} table={plan['table']} type={plan['type']} key={plan['key']} "
+                f"rows={plan['rows']} extra={plan['Extra']}"
+            )
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            connection.execute(text(sql), parameters()).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        latencies[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return latencies
+
+
+def main() -> None:
+    """Implement the main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the hot MySQL queries and indexes")
+    parser.add_argument(
+        "--url",
+        default="mysql+mysqlconnector://root@127.0.0.1:3306/lorelai_benchmark",
+        help="SQLAlchemy URL of a scratch database, its benchmark tables are dropped",
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--conversations", type=int, default=20, help="Conversations per user")
+    parser.add_argument("--messages", type=int, default=40, help="Messages per conversation")
+    parser.add_argument("--runs", type=int, default=20, help="Indexing runs")
+    parser.add_argument("--items", type=int, default=5000, help="Items per indexing run")
+    parser.add_argument("--notifications", type=int, default=200, help="Notifications per user")
+    parser.add_argument("--drive_items", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=50, help="Executions per query")
+    args = parser.parse_args()
+
+    url = make_url(args.url)
+    with create_engine(url.set(database=None)).connect() as connection:
+        connection.execute(text(f"CREATE DATABASE IF NOT EXISTS `{url.database}`"))
+
+    engine = create_engine(url)
+    queries = hot_queries(args, random.Random(7))
+    with engine.begin() as connection:
+        create_tables(connection)
+        seed(connection, args)
+        connection.execute(text(f"ANALYZE TABLE {', '.join(TABLES)}"))
+
+    with engine.connect() as connection:
+        print("Without the composite indexes:")
+        before = report(connection, queries, args.repeat)
+    with engine.begin() as connection:
+        create_hot_indexes(connection)
+    with engine.connect() as connection:
+        print("With the composite indexes:")
+        after = report(connection, queries, args.repeat)
+
+    print(f"{'query':<22} {'before p50/p95 (ms)':>20} {'after p50/p95 (ms)':>20}")
+    for name in queries:
+        print(
+            f"{name:<22} {before[name][0]:>10.2f}/{before[name][1]:<9.2f}"
+            f" {after[name][0]:>10.2f}/{after[name][1]:<9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the text normalization of the document processors and the indexing pipeline.
+
+Compares lorelai.processors.normalizer with the previous implementations of
+BaseProcessor.clean_text, BaseProcessor.validate_content (garbage characters) and
+lorelai.utils.clean_text_for_vector, and checks that both produce the same output.
+"""
+
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+import unicodedata
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "../.."))
+from lorelai.processors.normalizer import (
+    count_garbage_characters,
+    normalize_for_vector,
+    normalize_text,
+)
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "10MB": 10 * 1024 * 1024}
+
+
+def legacy_clean_text(text: str) -> str:
+    """Implement BaseProcessor.clean_text as it was before the normalizer."""
+    if not text:
+        return text
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(
+        char
+        for char in text
+        if char == "\n" or char == "\t" or not unicodedata.category(char).startswith("C")
+    )
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\n\s*\n", "\n\n", text)
+    return text.strip()
+
+
+def legacy_count_garbage_characters(text: str) -> int:
+    """Implement the garbage count of BaseProcessor.validate_content before the normalizer."""
+    return len(re.findall(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]", text))
+
+
+def legacy_clean_text_for_vector(text: str) -> str:
+    """Implement lorelai.utils.clean_text_for_vector as it was before the normalizer."""
+    text = re.sub("<[^<]+?>", "", text)
+    text = re.sub(r"[\n\t\r]+", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return re.sub(r"([!?.]){2,}", r"\1", text)
+
+
+def generate_text(size: int) -> str:
+    """Generate text of size characters resembling PDF and Slack extracts.
+
+    Mostly words and sentences, with newlines, tabs, non breaking spaces, some accented and
+    ligature characters, a few control characters, HTML tags and repeated punctuation.
+    """
+    rng = random.Random(42)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(500)]
+    words += ["café", "naïve", "ﬁnance", "<b>bold</b>", "\x0c", "​", "\xa0"]
+    separators = [" "] * 20 + ["\n", "\t", "  ", ". ", "!! ", "...\n\n", "\r\n"]
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(words) + rng.choice(separators)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def benchmark(function, text: str, repeat: int) -> float:
+    """Return the best run time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """Implement the main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the text normalization")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("clean_text", legacy_clean_text, normalize_text),
+        ("garbage_count", legacy_count_garbage_characters, count_garbage_characters),
+        ("clean_text_for_vector", legacy_clean_text_for_vector, normalize_for_vector),
+    ]
+    print(f"{'case':<22} {'size':>6} {'legacy (ms)':>12} {'new (ms)':>10} {'speedup':>8}")
+    for size_name in args.sizes:
+        text = generate_text(SIZES[size_name])
+        for name, legacy, new in cases:
+            if legacy(text) != new(text):
+                sys.exit(f"{name}: output differs from the legacy implementation")
+            legacy_ms = benchmark(legacy, text, args.repeat)
+            new_ms = benchmark(new, text, args.repeat)
+            print(
+                f"{name:<22} {size_name:>6} {legacy_ms:>12.3f} {new_ms:>10.3f} "
+                f"{legacy_ms / new_ms:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the PDF text extraction backends on a set of PDF files.
+
+For every file, each backend in lorelai.processors.pdf_backends extracts the first pages (all pages
+by default). The fastest backend which extracts text is reported, which is what the PDF processor
+selects with the pdf_backend setting "auto".
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(os.path.dirname(__file__), "../.."))
+from lorelai.processors.pdf_backends import DEFAULT_PDF_BACKEND, benchmark_pdf_backends
+
+
+def main() -> None:
+    """Implement the main function."""
+    parser = argparse.ArgumentParser(description="Benchmark the PDF text extraction backends")
+    parser.add_argument("files", nargs="+", help="PDF files to extract")
+    parser.add_argument(
+        "--pages", type=int, default=sys.maxsize, help="Number of pages to extract per file"
+    )
+    args = parser.parse_args()
+
+    print(f"{'file':<40} {'backend':<10} {'time (ms)':>10} {'chars':>10}")
+    for file_path in args.files:
+        with open(file_path, "rb") as f:
+            pdf_bytes = f.read()
+
+        file_name = os.path.basename(file_path)
+        results = benchmark_pdf_backends(pdf_bytes, sample_pages=args.pages)
+        fastest = None
+        for name, result in results.items():
+            if isinstance(result, str):
+                print(f"{file_name:<40} {name:<10} failed: {result}")
+                continue
+            seconds, chars = result
+            print(f"{file_name:<40} {name:<10} {seconds * 1000:>10.1f} {chars:>10}")
+            if chars > 0 and (fastest is None or seconds < results[fastest][0]):
+                fastest = name
+        print(f"{file_name:<40} fastest: {fastest or DEFAULT_PDF_BACKEND}")
+
+
+if __name__ == "__main__":
+    main()